@@ -0,0 +1,78 @@
+"""
+TokenCache contention benchmark
+
+Warms a TokenCache with a word list, then hammers get_token_id and
+get_word_from_token from 1, 2, 4, ... threads and reports lookups per second
+for each thread count.  Run it as ``python bench_token_cache.py``; on a
+free-threaded (no-GIL) Python the warm read path scales with the thread count
+because readers take no lock.
+"""
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from typing import List
+
+from token_cache import TokenCache
+
+
+def run_threads(cache: TokenCache, words: List[str], token_ids: List[int],
+                n_threads: int, lookups_per_thread: int) -> float:
+    """Lookups per second with ``n_threads`` threads reading concurrently."""
+    barrier = threading.Barrier(n_threads)
+    spans = []
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        word_sample = [rng.choice(words) for _ in range(lookups_per_thread // 2)]
+        id_sample = [rng.choice(token_ids) for _ in range(lookups_per_thread // 2)]
+        barrier.wait()
+        start_time = time.perf_counter()
+        for word, token_id in zip(word_sample, id_sample):
+            cache.get_token_id(word)
+            cache.get_word_from_token(token_id)
+        spans.append((start_time, time.perf_counter()))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+    return n_threads * (lookups_per_thread // 2) * 2 / elapsed
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Measure TokenCache read throughput under contention")
+    parser.add_argument("--encoding", default="o200k_base")
+    parser.add_argument("--cache-dir", default="cache")
+    parser.add_argument("--words", type=int, default=5000, help="distinct words to warm and query")
+    parser.add_argument("--lookups", type=int, default=200000, help="lookups per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    cache = TokenCache(cache_dir=args.cache_dir, encoding_name=args.encoding)
+
+    # Warm with real vocabulary words so every lookup is a cache hit
+    words = [cache.encoder.decode([token_id]).strip().lower()
+             for token_id in range(min(args.words, cache.encoder.n_vocab))]
+    words = [word for word in dict.fromkeys(words) if word]
+    cache.preload_word_list(words)
+    token_ids = [token_id for token_id in map(cache.get_token_id, words) if token_id is not None]
+    for token_id in token_ids:
+        cache.get_word_from_token(token_id)
+    cache._save_caches()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"TokenCache read benchmark ({args.encoding}, {len(words)} words, GIL {'on' if gil else 'off'})")
+    baseline = None
+    for n_threads in args.threads:
+        rate = run_threads(cache, words, token_ids or [0], n_threads, args.lookups)
+        baseline = baseline or rate
+        print(f"  {n_threads:>3} threads: {rate:>12,.0f} lookups/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Bounded Cache Module
+Thread-safe, size-limited caches with hit/miss/eviction accounting
+
+Two eviction policies are available:
+
+* ``lru`` – classic least-recently-used.
+* ``arc`` – Adaptive Replacement Cache, which balances recency against
+  frequency so one sweep over rarely used keys (e.g. a visualization scan)
+  does not flush the words players keep guessing.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class BoundedCache:
+    """Base class: counters, locking and the public mapping-like API."""
+
+    policy = "base"
+
+    def __init__(self, maxsize: int = 10000):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (counting a hit) or ``default`` (a miss)."""
+        with self._lock:
+            value = self._get(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or refresh an entry, evicting as the policy dictates."""
+        with self._lock:
+            self._put(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._contains(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size()
+
+    def resize(self, maxsize: int):
+        """Change the capacity at runtime, evicting down to it if it shrank."""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        with self._lock:
+            self.maxsize = maxsize
+            self._shrink()
+
+    def items(self):
+        """Snapshot list of the resident (key, value) pairs."""
+        with self._lock:
+            return list(self._items())
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'policy': self.policy,
+                'entries': self._size(),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    # Policy hooks (called with the lock held)
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _put(self, key, value):
+        raise NotImplementedError
+
+    def _contains(self, key) -> bool:
+        raise NotImplementedError
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+    def _shrink(self):
+        raise NotImplementedError
+
+    def _items(self):
+        raise NotImplementedError
+
+
+class LRUCache(BoundedCache):
+    """Least-recently-used eviction on top of an OrderedDict."""
+
+    policy = "lru"
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(maxsize)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def _get(self, key):
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            self._data.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._shrink()
+
+    def _shrink(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _items(self):
+        return self._data.items()
+
+    def _contains(self, key) -> bool:
+        return key in self._data
+
+    def _size(self) -> int:
+        return len(self._data)
+
+    def _clear(self):
+        self._data.clear()
+
+
+class ARCCache(BoundedCache):
+    """Adaptive Replacement Cache (Megiddo & Modha).
+
+    ``t1`` holds keys seen once recently, ``t2`` keys seen at least twice;
+    ``b1``/``b2`` remember keys recently evicted from each (without values)
+    and steer the target size ``p`` of ``t1``.
+    """
+
+    policy = "arc"
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__(maxsize)
+        self._p = 0.0
+        self._t1: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._t2: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._b1: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._b2: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def _get(self, key):
+        if key in self._t1:
+            value = self._t1.pop(key)
+            self._t2[key] = value
+            return value
+        if key in self._t2:
+            self._t2.move_to_end(key)
+            return self._t2[key]
+        return _MISSING
+
+    def _replace(self, key):
+        """Evict one resident entry into the matching ghost list (if full)."""
+        if len(self._t1) + len(self._t2) < self.maxsize:
+            return
+        if self._t1 and (len(self._t1) > self._p or (key in self._b2 and len(self._t1) == int(self._p))
+                         or not self._t2):
+            old_key, _ = self._t1.popitem(last=False)
+            self._b1[old_key] = None
+        else:
+            old_key, _ = self._t2.popitem(last=False)
+            self._b2[old_key] = None
+        self.evictions += 1
+
+    def _put(self, key, value):
+        capacity = self.maxsize
+
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = value
+            return
+        if key in self._t2:
+            self._t2[key] = value
+            self._t2.move_to_end(key)
+            return
+
+        if key in self._b1:
+            self._p = min(capacity, self._p + max(len(self._b2) / len(self._b1), 1))
+            self._replace(key)
+            del self._b1[key]
+            self._t2[key] = value
+            return
+        if key in self._b2:
+            self._p = max(0.0, self._p - max(len(self._b1) / len(self._b2), 1))
+            self._replace(key)
+            del self._b2[key]
+            self._t2[key] = value
+            return
+
+        t1_side = len(self._t1) + len(self._b1)
+        total = t1_side + len(self._t2) + len(self._b2)
+        if t1_side >= capacity:
+            if len(self._t1) < capacity:
+                self._b1.popitem(last=False)
+                self._replace(key)
+            else:
+                self._t1.popitem(last=False)
+                self.evictions += 1
+        elif total >= capacity:
+            if total >= 2 * capacity:
+                self._b2.popitem(last=False)
+            self._replace(key)
+        self._t1[key] = value
+
+    def _contains(self, key) -> bool:
+        return key in self._t1 or key in self._t2
+
+    def _size(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+    def _shrink(self):
+        self._p = min(self._p, float(self.maxsize))
+        while len(self._t1) + len(self._t2) > self.maxsize:
+            if self._t1 and (len(self._t1) > self._p or not self._t2):
+                old_key, _ = self._t1.popitem(last=False)
+                self._b1[old_key] = None
+            else:
+                old_key, _ = self._t2.popitem(last=False)
+                self._b2[old_key] = None
+            self.evictions += 1
+        # Keep ARC's directory bounds: |T1| + |B1| <= c and everything <= 2c
+        while self._b1 and len(self._t1) + len(self._b1) > self.maxsize:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * self.maxsize:
+            self._b2.popitem(last=False)
+
+    def _items(self):
+        return list(self._t1.items()) + list(self._t2.items())
+
+    def _clear(self):
+        self._p = 0.0
+        self._t1.clear()
+        self._t2.clear()
+        self._b1.clear()
+        self._b2.clear()
+
+
+CACHE_POLICIES = {
+    'lru': LRUCache,
+    'arc': ARCCache
+}
+
+
+def make_cache(policy: str = "lru", maxsize: Optional[int] = None) -> BoundedCache:
+    """Create a cache for the named eviction policy."""
+    try:
+        cache_class = CACHE_POLICIES[policy.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown cache policy '{policy}' (choose from {', '.join(CACHE_POLICIES)})")
+    return cache_class(maxsize) if maxsize is not None else cache_class()
@@ -0,0 +1,140 @@
+"""
+Cache Registry Module
+One place to inspect, resize and clear every cache in the process
+
+Caches register under a unique name with callables for their statistics and
+(optionally) for clearing, resizing and measuring their memory.  Bounded
+caches register in one call via ``register_cache``; read-only structures such
+as the decode table or word index register how long they took to load and
+how much memory they hold.  ``get_cache_registry().report()`` then gives one
+table of entries, approximate bytes, hit/miss/eviction rates and load times.
+"""
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from bounded_cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+SIZE_SAMPLE = 64  # entries measured per container when estimating bytes
+
+
+def approx_bytes(obj: Any, sample: int = SIZE_SAMPLE) -> int:
+    """Rough deep size of an object, extrapolated from a sample of its items."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        items = list(islice(obj.items(), sample))
+        if items:
+            per_item = sum(approx_bytes(key, sample) + approx_bytes(value, sample) for key, value in items) / len(items)
+            size += int(per_item * len(obj))
+        return size
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(islice(obj, sample))
+        if items:
+            size += int(sum(approx_bytes(item, sample) for item in items) / len(items) * len(obj))
+        return size
+    return size
+
+
+@dataclass
+class RegisteredCache:
+    """How the registry reaches one cache."""
+    name: str
+    stats: Callable[[], Dict[str, Any]]
+    clear: Optional[Callable[[], None]] = None
+    resize: Optional[Callable[[int], None]] = None
+    measure: Optional[Callable[[], int]] = None
+    load_time: Optional[float] = None
+
+    def report(self) -> Dict[str, Any]:
+        report = dict(self.stats())
+        report['approx_bytes'] = self.measure() if self.measure is not None else None
+        report['load_time'] = self.load_time
+        report['resizable'] = self.resize is not None
+        report['clearable'] = self.clear is not None
+        return report
+
+
+class CacheRegistry:
+    """Named caches of this process."""
+
+    def __init__(self):
+        self._caches: Dict[str, RegisteredCache] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, stats: Callable[[], Dict[str, Any]],
+                 clear: Optional[Callable[[], None]] = None,
+                 resize: Optional[Callable[[int], None]] = None,
+                 measure: Optional[Callable[[], int]] = None,
+                 load_time: Optional[float] = None) -> RegisteredCache:
+        """Add (or replace) a cache under ``name``."""
+        entry = RegisteredCache(name, stats, clear, resize, measure, load_time)
+        with self._lock:
+            self._caches[name] = entry
+        return entry
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._caches.pop(name, None)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._caches)
+
+    def _get(self, name: str) -> RegisteredCache:
+        with self._lock:
+            entry = self._caches.get(name)
+        if entry is None:
+            raise KeyError(f"No cache named '{name}'")
+        return entry
+
+    def report(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Statistics, approximate bytes and load time per cache."""
+        report = {}
+        for name in names if names is not None else self.names():
+            try:
+                report[name] = self._get(name).report()
+            except Exception as e:  # a broken cache must not hide the others
+                logger.warning("Could not report cache %s: %s", name, e)
+                report[name] = {'error': str(e)}
+        return report
+
+    def total_bytes(self) -> int:
+        return sum(entry.get('approx_bytes') or 0 for entry in self.report().values())
+
+    def resize(self, name: str, maxsize: int):
+        """Change a bounded cache's capacity (ValueError if it is not resizable)."""
+        entry = self._get(name)
+        if entry.resize is None:
+            raise ValueError(f"Cache '{name}' is not resizable")
+        entry.resize(maxsize)
+        logger.info("Resized cache %s to %d entries", name, maxsize)
+
+    def clear(self, name: Optional[str] = None):
+        """Clear one cache, or every clearable cache."""
+        entries = [self._get(name)] if name is not None else [self._get(n) for n in self.names()]
+        for entry in entries:
+            if entry.clear is not None:
+                entry.clear()
+        logger.info("Cleared %s", f"cache {name}" if name else "all caches")
+
+
+_registry = CacheRegistry()
+
+
+def get_cache_registry() -> CacheRegistry:
+    """The process-wide registry."""
+    return _registry
+
+
+def register_cache(name: str, cache: BoundedCache, load_time: Optional[float] = None) -> BoundedCache:
+    """Register a BoundedCache (stats, clear, resize and size all come from it)."""
+    _registry.register(name, cache.stats, cache.clear, cache.resize,
+                       lambda: approx_bytes(dict(cache.items())), load_time)
+    return cache
@@ -0,0 +1,248 @@
+"""
+Cache Store Module
+Incremental, crash-safe on-disk key/value store for Token Quest caches
+
+Entries live in a single SQLite file (WAL journal) as (namespace, key, JSON
+value) rows.  Writers insert only new or changed entries inside a
+transaction, so a save costs time proportional to what changed and an
+interrupted save never leaves a half-written file behind.  Readers look
+single keys up on demand instead of parsing the whole cache at start-up.
+
+WAL lets many processes read while one writes, so the same file doubles as a
+host-wide tier shared by every web worker (see ``get_shared_tier``).
+"""
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from cache_registry import get_cache_registry
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+class SQLiteCacheStore:
+    """Namespaced JSON key/value rows in one SQLite file."""
+
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: Any, default: Any = MISSING) -> Any:
+        """Value for one key, or ``default`` if it was never stored."""
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, str(key))
+        ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def get_many(self, namespace: str, keys: Iterable[Any]) -> Dict[str, Any]:
+        """{key: value} for the keys that are stored (keys come back as strings)."""
+        keys = [str(key) for key in keys]
+        found: Dict[str, Any] = {}
+        conn = self._connection()
+        for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({placeholders})",
+                [namespace, *chunk]
+            )
+            for key, value in rows:
+                found[key] = json.loads(value)
+        return found
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[Any, Any]]) -> int:
+        """Insert or replace entries in one transaction; returns the row count."""
+        rows = [(namespace, str(key), json.dumps(value)) for key, value in items]
+        if rows:
+            with self._connection() as conn:
+                conn.executemany("INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        """Stream every (key, value) of a namespace."""
+        rows = self._connection().execute("SELECT key, value FROM entries WHERE namespace = ?", (namespace,))
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        """Stream every key of a namespace (values are not read)."""
+        for (key,) in self._connection().execute("SELECT key FROM entries WHERE namespace = ?", (namespace,)):
+            yield key
+
+    def count(self, namespace: str) -> int:
+        row = self._connection().execute("SELECT COUNT(*) FROM entries WHERE namespace = ?", (namespace,)).fetchone()
+        return row[0]
+
+    def clear(self, namespaces: List[str] = None):
+        """Delete every entry (or only those of the given namespaces)."""
+        with self._connection() as conn:
+            if namespaces is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.executemany("DELETE FROM entries WHERE namespace = ?", [(ns,) for ns in namespaces])
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class SharedCacheTier:
+    """Host-wide cache shared by worker processes through one SQLite file.
+
+    Reads go straight to the store.  Writes are buffered and flushed in one
+    transaction once ``flush_size`` entries are waiting or ``flush_interval``
+    seconds have passed, so a miss costs one row insert amortized rather than
+    one transaction.  Losing unflushed entries only means recomputing them.
+    """
+
+    def __init__(self, store: SQLiteCacheStore, flush_size: int = 256, flush_interval: float = 2.0):
+        self.store = store
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self._buffer: Dict[str, Dict[str, Any]] = {}
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Any, default: Any = MISSING) -> Any:
+        """Value from this process's write buffer or the shared store."""
+        with self._lock:
+            value = self._buffer.get(namespace, {}).get(str(key), MISSING)
+        if value is MISSING:
+            try:
+                value = self.store.get(namespace, key)
+            except sqlite3.Error as e:
+                logger.warning("Shared cache read failed: %s", e)
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def get_many(self, namespace: str, keys: Iterable[Any]) -> Dict[str, Any]:
+        """{key: value} for the keys any worker has stored (keys as strings)."""
+        keys = [str(key) for key in keys]
+        with self._lock:
+            buffered = self._buffer.get(namespace, {})
+            found = {key: buffered[key] for key in keys if key in buffered}
+        try:
+            found.update(self.store.get_many(namespace, [key for key in keys if key not in found]))
+        except sqlite3.Error as e:
+            logger.warning("Shared cache read failed: %s", e)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, namespace: str, key: Any, value: Any):
+        """Queue an entry for the shared store."""
+        self.put_many(namespace, [(key, value)])
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[Any, Any]]):
+        with self._lock:
+            entries = self._buffer.setdefault(namespace, {})
+            for key, value in items:
+                entries[str(key)] = value
+            self._buffered = sum(len(batch) for batch in self._buffer.values())
+            due = (self._buffered >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries in one transaction per namespace."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+        try:
+            for namespace, entries in buffer.items():
+                self.store.put_many(namespace, entries.items())
+        except sqlite3.Error as e:
+            logger.warning("Shared cache flush failed (%d namespaces dropped): %s", len(buffer), e)
+
+    def clear(self, namespaces: List[str] = None):
+        """Drop buffered and stored entries (all, or only the given namespaces)."""
+        with self._lock:
+            if namespaces is None:
+                self._buffer = {}
+            else:
+                for namespace in namespaces:
+                    self._buffer.pop(namespace, None)
+        self.store.clear(namespaces)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': str(self.store.path),
+                'hits': self.hits,
+                'misses': self.misses,
+                'buffered_writes': self._buffered,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Process-wide shared tiers keyed by file path
+_shared_tiers: Dict[Path, Optional[SharedCacheTier]] = {}
+_shared_tiers_lock = threading.Lock()
+
+
+def get_shared_tier(cache_dir: Union[str, Path] = "cache") -> Optional[SharedCacheTier]:
+    """The host-wide tier for a cache directory, or None if disabled in GameConfig."""
+    from config import get_game_config
+    game_config = get_game_config()
+    if not game_config.shared_cache_enabled:
+        return None
+
+    path = Path(cache_dir) / "shared_cache.sqlite3"
+    if path in _shared_tiers:
+        return _shared_tiers[path]
+    with _shared_tiers_lock:
+        if path not in _shared_tiers:
+            try:
+                tier = SharedCacheTier(SQLiteCacheStore(path), game_config.shared_cache_flush_size,
+                                       game_config.shared_cache_flush_interval)
+                atexit.register(tier.flush)
+                get_cache_registry().register(f"shared_tier:{path}", tier.stats)
+            except sqlite3.Error as e:
+                logger.warning("Shared cache %s unavailable: %s", path, e)
+                tier = None  # remembered, so it is not retried on every lookup
+            _shared_tiers[path] = tier
+        return _shared_tiers[path]
@@ -38,6 +38,10 @@ class GameConfig:
     async_data_collection: bool = True
     preload_word_lists: bool = True
     max_cache_size: int = 10000
+    cache_policy: str = "lru"  # 'lru' or 'arc'
+    shared_cache_enabled: bool = True  # host-wide SQLite tier shared by worker processes
+    shared_cache_flush_size: int = 256
+    shared_cache_flush_interval: float = 2.0  # seconds
     
     # Data collection settings
     data_collection_enabled: bool = True
@@ -48,6 +52,8 @@ class GameConfig:
     encoding_name: str = "o200k_base"
     token_range_for_hints: int = 50
     nearby_words_count: int = 10
+    word_vectors_path: str = ""  # GloVe/fastText text, .npz or .npy file for semantic hints (needs numpy)
+    word_packs_dir: str = "word_packs"  # extra target word lists (.txt/.csv), merged into the categories
 
 @dataclass
 class WebConfig:
@@ -0,0 +1,163 @@
+"""
+Encoder Registry Module
+Lazily loaded, process-wide tiktoken encoders for Token Quest
+
+Encoders are loaded on first use and then kept for the life of the process.
+They come from a local binary snapshot in the cache directory when one exists
+(no network, no BPE parsing); otherwise tiktoken loads them and a snapshot plus
+decode table are written for the next cold start.
+
+Encodings that cannot be loaded here (e.g. the BPE file is not cached and
+there is no network) are remembered, so they are skipped instead of being
+retried on every comparison.  Only encodings with local data - a snapshot or
+tiktoken's cached BPE file - count as available, and ``preload_encoders``
+loads them on a background thread so a request never waits on a download or
+a BPE parse.
+"""
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import tiktoken
+
+from cache_registry import get_cache_registry
+from vocab_snapshot import load_snapshot, snapshot_path, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Encodings compared by default in multi-encoding mode
+DEFAULT_COMPARISON_ENCODINGS = ['o200k_base', 'cl100k_base', 'r50k_base']
+
+# BPE files tiktoken downloads for each encoding (see tiktoken_ext.openai_public)
+_BLOB_ROOT = "https://openaipublic.blob.core.windows.net"
+BPE_FILES: Dict[str, Tuple[str, ...]] = {
+    'gpt2': (f"{_BLOB_ROOT}/gpt-2/encodings/main/vocab.bpe", f"{_BLOB_ROOT}/gpt-2/encodings/main/encoder.json"),
+    'r50k_base': (f"{_BLOB_ROOT}/encodings/r50k_base.tiktoken",),
+    'p50k_base': (f"{_BLOB_ROOT}/encodings/p50k_base.tiktoken",),
+    'p50k_edit': (f"{_BLOB_ROOT}/encodings/p50k_base.tiktoken",),
+    'cl100k_base': (f"{_BLOB_ROOT}/encodings/cl100k_base.tiktoken",),
+    'o200k_base': (f"{_BLOB_ROOT}/encodings/o200k_base.tiktoken",),
+    'o200k_harmony': (f"{_BLOB_ROOT}/encodings/o200k_base.tiktoken",),
+}
+
+_encoders: Dict[str, "tiktoken.Encoding"] = {}
+_failed: Dict[str, str] = {}
+_preloading: Set[str] = set()
+_load_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _load_encoder(encoding_name: str, cache_dir: Union[str, Path]) -> "tiktoken.Encoding":
+    """Load from the local snapshot, falling back to tiktoken (and writing one)."""
+    path = snapshot_path(encoding_name, cache_dir)
+    if path.exists():
+        try:
+            return load_snapshot(path)
+        except (OSError, ValueError, struct.error, IndexError) as e:
+            # Truncated or corrupt: drop it so a fresh one is written below
+            logger.warning("Rebuilding unreadable snapshot %s: %s", path, e)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    encoder = tiktoken.get_encoding(encoding_name)
+    try:
+        write_snapshot(encoder, cache_dir)
+        logger.info("Wrote encoding snapshot %s", path)
+    except OSError as e:
+        logger.warning("Could not write encoding snapshot %s: %s", path, e)
+    return encoder
+
+
+def get_encoder(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> "tiktoken.Encoding":
+    """Get a shared encoder, loading it on first use."""
+    encoder = _encoders.get(encoding_name)
+    if encoder is not None:
+        return encoder
+
+    with _registry_lock:
+        load_lock = _load_locks.setdefault(encoding_name, threading.Lock())
+
+    # One loader per encoding; other encodings can load concurrently
+    with load_lock:
+        encoder = _encoders.get(encoding_name)
+        if encoder is None:
+            start_time = time.time()
+            encoder = _load_encoder(encoding_name, cache_dir)
+            load_time = time.time() - start_time
+            _encoders[encoding_name] = encoder
+            _failed.pop(encoding_name, None)
+            logger.info("Loaded encoding %s in %.3f seconds", encoding_name, load_time)
+            get_cache_registry().register(f"encoder:{encoding_name}", lambda: {'entries': encoder.n_vocab},
+                                          load_time=load_time)
+        return encoder
+
+
+def try_get_encoder(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> Optional["tiktoken.Encoding"]:
+    """Like get_encoder, but returns None (once logged) if it cannot be loaded."""
+    if encoding_name in _failed:
+        return None
+    try:
+        return get_encoder(encoding_name, cache_dir)
+    except Exception as e:
+        _failed[encoding_name] = str(e)
+        logger.warning("Encoding %s is not available: %s", encoding_name, e)
+        return None
+
+
+def loaded_encodings() -> List[str]:
+    """Names of the encoders already loaded in this process."""
+    return list(_encoders)
+
+
+def _tiktoken_cache_dir() -> str:
+    """Where tiktoken keeps downloaded BPE files ("" disables its cache)."""
+    if "TIKTOKEN_CACHE_DIR" in os.environ:
+        return os.environ["TIKTOKEN_CACHE_DIR"]
+    if "DATA_GYM_CACHE_DIR" in os.environ:
+        return os.environ["DATA_GYM_CACHE_DIR"]
+    return os.path.join(tempfile.gettempdir(), "data-gym-cache")
+
+
+def has_local_data(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> bool:
+    """Whether an encoding can be loaded without the network."""
+    if encoding_name in _encoders or snapshot_path(encoding_name, cache_dir).exists():
+        return True
+    files = BPE_FILES.get(encoding_name)
+    tiktoken_cache = _tiktoken_cache_dir()
+    return bool(files and tiktoken_cache) and all(
+        os.path.exists(os.path.join(tiktoken_cache, hashlib.sha1(url.encode()).hexdigest())) for url in files
+    )
+
+
+def available_encodings(cache_dir: Union[str, Path] = "cache") -> List[str]:
+    """Encodings with local data (loaded, snapshotted or BPE-cached) that have not failed here."""
+    return [name for name in tiktoken.list_encoding_names()
+            if name not in _failed and has_local_data(name, cache_dir)]
+
+
+def preload_encoders(encoding_names: Iterable[str], cache_dir: Union[str, Path] = "cache"):
+    """Load encoders on a background thread (names already loaded or loading are skipped)."""
+    with _registry_lock:
+        pending = [name for name in dict.fromkeys(encoding_names)
+                   if name not in _encoders and name not in _failed and name not in _preloading]
+        _preloading.update(pending)
+    if not pending:
+        return
+
+    def run():
+        for name in pending:
+            try:
+                try_get_encoder(name, cache_dir)
+            finally:
+                with _registry_lock:
+                    _preloading.discard(name)
+
+    threading.Thread(target=run, name="encoder-preload", daemon=True).start()
@@ -2,14 +2,157 @@
 Game Logic Module
 Handles scoring, word selection, and game state for Token Quest
 """
+import logging
 import random
-from typing import List, Dict, Optional, Tuple
-from token_handler import TokenHandler
+import threading
+import time
+from typing import Callable, List, Dict, Optional, Tuple
+from token_handler import get_token_handler
+from scoring import calculate_points, get_feedback
+from semantic_index import get_semantic_index
+from config import get_game_config
+from game_state import GameState
+from hint_bundles import get_hint_bundles
+from target_scheduler import TargetScheduler, normalize_seed
+from timer_wheel import Timer, get_timer_wheel
+from word_catalog import ANTONYM_PAIRS, SYNONYM_PAIRS, TARGET_WORDS, get_word_catalog
+
+logger = logging.getLogger(__name__)
+
+# Called as listener(game, round_number) when any speed-mode round runs out of time
+_round_expiry_listeners: List[Callable[["GameLogic", int], None]] = []
+
+
+def add_round_expiry_listener(listener: Callable[["GameLogic", int], None]):
+    """Be told about every expired speed-mode round in this process (e.g. by the web layer)."""
+    _round_expiry_listeners.append(listener)
+
+
+# Built-in semantic hints (used when no word vectors are configured)
+SEMANTIC_MAP = {
+    # Emotions
+    'happy': ['joyful', 'cheerful', 'pleased', 'content', 'glad'],
+    'sad': ['unhappy', 'miserable', 'dejected', 'gloomy', 'upset'],
+    'angry': ['mad', 'furious', 'irritated', 'annoyed', 'rage'],
+    
+    # Size
+    'big': ['large', 'huge', 'massive', 'enormous', 'giant'],
+    'small': ['tiny', 'little', 'mini', 'petite', 'compact'],
+    
+    # Speed
+    'fast': ['quick', 'rapid', 'swift', 'speedy', 'hasty'],
+    'slow': ['sluggish', 'gradual', 'leisurely', 'unhurried'],
+    
+    # Quality
+    'good': ['excellent', 'great', 'wonderful', 'superb', 'fine'],
+    'bad': ['awful', 'terrible', 'horrible', 'poor', 'dreadful'],
+    
+    # Temperature
+    'hot': ['warm', 'boiling', 'scorching', 'heated', 'burning'],
+    'cold': ['freezing', 'chilly', 'frigid', 'icy', 'cool'],
+}
+
+# Word groups for contextual hints
+
+# Emotion words
+EMOTIONS_POSITIVE = frozenset({'happy', 'joy', 'glad', 'cheerful', 'pleased'})
+EMOTIONS_NEGATIVE = frozenset({'sad', 'angry', 'mad', 'upset', 'unhappy'})
+
+# Size words
+SIZE_BIG = frozenset({'big', 'large', 'huge', 'giant', 'massive'})
+SIZE_SMALL = frozenset({'small', 'tiny', 'little', 'mini', 'petite'})
+
+# Speed words
+SPEED_FAST = frozenset({'fast', 'quick', 'rapid', 'swift', 'speedy'})
+SPEED_SLOW = frozenset({'slow', 'sluggish', 'gradual', 'leisurely'})
+
+# Quality words
+QUALITY_GOOD = frozenset({'good', 'great', 'excellent', 'wonderful', 'amazing'})
+QUALITY_BAD = frozenset({'bad', 'awful', 'terrible', 'horrible', 'poor'})
+
+
+# ─────────────────────────────────────────────
+# Hint content (precomputed per target word, see hint_bundles.py)
+# ─────────────────────────────────────────────
+
+HINT_NEARBY_WORDS = 12
+
+
+def semantic_hints_for(token_handler, word: str) -> List[str]:
+    """Get semantic hints based on the word's meaning."""
+    word = word.lower()
+    
+    # Nearest neighbours from local word vectors, when configured
+    semantic_index = get_semantic_index(token_handler)
+    if semantic_index is not None and word in semantic_index:
+        return semantic_index.neighbours(word, k=5)
+    
+    return list(SEMANTIC_MAP.get(word, ()))
+
+
+def contextual_hint_for(token_handler, word: str) -> tuple:
+    """Generate contextual hints based on the target word."""
+    word = word.lower()
+    
+    if word in EMOTIONS_POSITIVE:
+        return "💖 Think of other positive emotions or feelings!", "emotion_positive"
+    elif word in EMOTIONS_NEGATIVE:
+        return "💔 Consider other negative emotions or sad feelings", "emotion_negative"
+    elif word in SIZE_BIG:
+        return "📏 Think of other words meaning large or expansive", "size_big"
+    elif word in SIZE_SMALL:
+        return "🤏 Consider other words meaning tiny or compact", "size_small"
+    elif word in SPEED_FAST:
+        return "⚡ Think of other words meaning quick or rapid", "speed_fast"
+    elif word in SPEED_SLOW:
+        return "🐌 Consider other words meaning gradual or unhurried", "speed_slow"
+    elif word in QUALITY_GOOD:
+        return "⭐ Think of other positive quality words", "quality_good"
+    elif word in QUALITY_BAD:
+        return "👎 Consider other negative quality words", "quality_bad"
+    else:
+        semantic_index = get_semantic_index(token_handler)
+        neighbours = semantic_index.neighbours(word, k=1) if semantic_index is not None else []
+        if neighbours:
+            return f"🧠 Think of words used like '{word}' - '{neighbours[0]}' is a good direction", "semantic"
+        return f"🤔 Think of words similar to '{word}' or with related meanings", "general"
+
+
+def compute_hint_bundle(token_handler, word: str, token_id: int) -> Dict:
+    """Everything get_hint shows for a target except the random token fact."""
+    # Get advanced nearby words with detailed info
+    nearby_words_data = token_handler.get_advanced_nearby_words(token_id, num_words=HINT_NEARBY_WORDS)
+    
+    # Generate contextual hint based on target word
+    hint_message, hint_type = contextual_hint_for(token_handler, word)
+    
+    # Word density around the target, for the hint visualization
+    token_range = get_game_config().token_range_for_hints
+    start_id, end_id = max(0, token_id - token_range), token_id + token_range
+    
+    return {
+        'target_word': word,
+        'target_token_id': token_id,
+        'hint_message': hint_message,
+        'hint_type': hint_type,
+        'semantic_hints': semantic_hints_for(token_handler, word),
+        'token_hints': [entry['word'] for entry in nearby_words_data[:6]],
+        'nearby_words_data': nearby_words_data,
+        'visualization': {
+            'start_id': start_id,
+            'end_id': end_id,
+            'buckets': [[bucket['start_id'], bucket['end_id'], bucket['word_count']]
+                        for bucket in token_handler.token_space.window(start_id, end_id, max_buckets=16)]
+        },
+        'token_range': f"Look for words with token IDs near {token_id}"
+    }
 
 
 class GameLogic:
-    def __init__(self, max_rounds: int = 10, game_mode: str = 'normal', difficulty: str = 'mixed', category: str = 'all'):
-        self.token_handler = TokenHandler()
+    def __init__(self, max_rounds: int = 10, game_mode: str = 'normal', difficulty: str = 'mixed', category: str = 'all',
+                 comparison_encodings: Optional[List[str]] = None, variant_scoring: bool = False,
+                 seed: Optional[int] = None):
+        self.token_handler = get_token_handler()
         self.current_target_word = ""
         self.current_target_token_id = None
         self.score = 0
@@ -22,507 +165,377 @@ class GameLogic:
         self.max_attempts = 3
         
         # Game mode settings
-        self.game_mode = game_mode  # 'normal', 'antonym', 'category', 'speed', 'explorer'
+        self.game_mode = game_mode  # 'normal', 'antonym', 'category', 'speed', 'explorer', 'compare'
         self.difficulty = difficulty  # 'easy', 'medium', 'hard', 'mixed'
         self.category = category  # 'all', 'emotions', 'size', 'speed', etc.
         self.time_limit = None  # For speed mode
         self.round_start_time = None
-        
-        # Comprehensive word list organized by categories and difficulty
-        self.word_categories = {
-            'emotions': {
-                'easy': ['happy', 'sad', 'mad', 'glad', 'calm'],
-                'medium': ['angry', 'upset', 'joyful', 'worried', 'excited', 'nervous'],
-                'hard': ['elated', 'dejected', 'serene', 'melancholy', 'euphoric']
-            },
-            'size': {
-                'easy': ['big', 'small', 'tiny', 'huge', 'tall'],
-                'medium': ['large', 'petite', 'massive', 'mini', 'giant'],
-                'hard': ['colossal', 'minuscule', 'immense', 'diminutive']
-            },
-            'speed': {
-                'easy': ['fast', 'slow', 'quick', 'rapid'],
-                'medium': ['swift', 'sluggish', 'speedy', 'gradual'],
-                'hard': ['brisk', 'leisurely', 'hasty', 'lethargic']
-            },
-            'quality': {
-                'easy': ['good', 'bad', 'nice', 'mean', 'kind'],
-                'medium': ['great', 'awful', 'wonderful', 'terrible', 'excellent'],
-                'hard': ['superb', 'atrocious', 'magnificent', 'dreadful']
-            },
-            'temperature': {
-                'easy': ['hot', 'cold', 'warm', 'cool'],
-                'medium': ['freezing', 'boiling', 'chilly', 'scorching'],
-                'hard': ['frigid', 'sweltering', 'tepid', 'torrid']
-            },
-            'brightness': {
-                'easy': ['light', 'dark', 'bright', 'dim'],
-                'medium': ['brilliant', 'shadowy', 'gleaming', 'murky'],
-                'hard': ['luminous', 'obscure', 'radiant', 'somber']
-            },
-            'actions': {
-                'easy': ['run', 'walk', 'jump', 'sit', 'eat', 'drink'],
-                'medium': ['sprint', 'stroll', 'leap', 'devour', 'sip'],
-                'hard': ['dash', 'amble', 'bound', 'consume', 'quaff']
-            },
-            'difficulty': {
-                'easy': ['easy', 'hard', 'simple', 'tough'],
-                'medium': ['complex', 'effortless', 'challenging', 'basic'],
-                'hard': ['intricate', 'elementary', 'arduous', 'facile']
-            }
-        }
-        
-        # Flatten all words for backward compatibility
-        self.target_words = []
-        for category in self.word_categories.values():
-            for difficulty in category.values():
-                self.target_words.extend(difficulty)
-        
-        # Add synonym/antonym pairs for research
-        self.synonym_pairs = [
-            ('happy', 'glad'), ('sad', 'upset'), ('big', 'large'), ('small', 'tiny'),
-            ('fast', 'quick'), ('slow', 'gradual'), ('good', 'great'), ('bad', 'awful'),
-            ('hot', 'warm'), ('cold', 'cool'), ('bright', 'light'), ('dark', 'dim')
-        ]
-        
-        self.antonym_pairs = [
-            ('happy', 'sad'), ('big', 'small'), ('fast', 'slow'), ('good', 'bad'),
-            ('hot', 'cold'), ('light', 'dark'), ('easy', 'hard'), ('start', 'end')
-        ]
-        
-        # Filter to only single-token words
-        self.single_token_words = [
-            word for word in self.target_words 
-            if self.token_handler.is_single_token(word)
-        ]
+        # Speed-mode enforcement: monotonic deadline plus a timer on the shared wheel
+        self.round_deadline: Optional[float] = None
+        self.round_expired = False
+        self.round_expiry_callbacks: List[Callable[["GameLogic", int], None]] = []
+        self.round_timer: Optional[Timer] = None
+        # Guards round state against the timer wheel thread expiring the round
+        self._round_lock = threading.RLock()
+        # Encodings scored side by side in compare mode (None = all locally available)
+        self.comparison_encodings = comparison_encodings
+        # Score the best single-token spelling of a guess ('happy', ' Happy', ...)
+        self.variant_scoring = variant_scoring
+        # Session seed: round n's random choices come from an RNG seeded with (seed, n),
+        # so a game can be replayed exactly and survives a to_state/from_state trip
+        self.seed = normalize_seed(seed) if seed is not None else random.randrange(2 ** 32)
+        
+        # Shared, pre-validated word lists (built once per encoding)
+        self.word_catalog = get_word_catalog(self.token_handler)
+        self.word_categories = self.word_catalog.categories  # built-in categories plus word packs
+        self.target_words = TARGET_WORDS
+        self.synonym_pairs = SYNONYM_PAIRS
+        self.antonym_pairs = ANTONYM_PAIRS
+        self.single_token_words = self.word_catalog.single_token_words
+        # Precomputed hints for every catalog word (filled in the background on first use)
+        self.hint_bundles = get_hint_bundles(self.token_handler, self.word_catalog)
         
         # Prepare word list based on game settings
         self.active_word_list = self._prepare_word_list()
+        # No-repeat, skill-adaptive target dealer for this session
+        self.scheduler = TargetScheduler(self.word_catalog, self.category, self.difficulty, self.seed)
+        self.current_tier = None
+        if self.game_mode == 'compare':
+            # Load the other encoders now, in the background, not on the first guess
+            self.token_handler.comparison_encodings(self.comparison_encodings)
     
-    def _prepare_word_list(self) -> list:
-        """Prepare the active word list based on game mode, difficulty, and category settings."""
-        words = []
-        
-        # Filter by category
-        if self.category == 'all':
-            categories_to_use = self.word_categories.keys()
-        else:
-            categories_to_use = [self.category] if self.category in self.word_categories else self.word_categories.keys()
-        
-        # Filter by difficulty
-        if self.difficulty == 'mixed':
-            difficulties_to_use = ['easy', 'medium', 'hard']
+    # ─────────────────────────────────────────────
+    # Serializable state
+    # ─────────────────────────────────────────────
+    
+    @property
+    def game_history(self) -> List[Dict]:
+        """Guess records (expanded from a restored state on first access)."""
+        if self._restored_state is not None:
+            self._game_history = self._restored_state.history()
+            self._restored_state = None
+        return self._game_history
+    
+    @game_history.setter
+    def game_history(self, history: List[Dict]):
+        self._game_history = history
+        self._restored_state = None
+    
+    def to_state(self) -> GameState:
+        """Snapshot of this game (settings, current round and full history)."""
+        if self._restored_state is not None:
+            # History untouched since restore: reuse its compact rows
+            targets, guesses = self._restored_state.targets, self._restored_state.guesses
         else:
-            difficulties_to_use = [self.difficulty] if self.difficulty in ['easy', 'medium', 'hard'] else ['easy', 'medium', 'hard']
-        
-        # Collect words based on filters
-        for category in categories_to_use:
-            for difficulty in difficulties_to_use:
-                if difficulty in self.word_categories[category]:
-                    words.extend(self.word_categories[category][difficulty])
-        
-        # Filter to only single-token words
-        filtered_words = [word for word in words if self.token_handler.is_single_token(word)]
-        
-        return filtered_words if filtered_words else self.single_token_words  # Fallback to all words
+            targets, guesses = GameState.compact_history(self._game_history)
+        return GameState(
+            self.max_rounds, self.game_mode, self.difficulty, self.category, self.comparison_encodings,
+            self.variant_scoring, self.current_target_word, self.current_target_token_id, self.score,
+            self.round_number, self.correct_guesses, self.game_completed, self.current_attempts,
+            self.max_attempts, self.time_limit, self.round_start_time, targets, guesses, self.seed,
+            self.scheduler.to_state(), self.round_expired
+        )
+    
+    @classmethod
+    def from_state(cls, state: GameState) -> "GameLogic":
+        """Rebuild a game from a GameState."""
+        game = cls(state.max_rounds, state.game_mode, state.difficulty, state.category,
+                   state.comparison_encodings, state.variant_scoring, state.seed)
+        game.current_target_word = state.target_word
+        game.current_target_token_id = state.target_token_id
+        game.score = state.score
+        game.round_number = state.round_number
+        game.correct_guesses = state.correct_guesses
+        game.game_completed = state.game_completed
+        game.current_attempts = state.current_attempts
+        game.max_attempts = state.max_attempts
+        game.time_limit = state.time_limit
+        game.round_start_time = state.round_start_time
+        game.round_expired = state.round_expired
+        if game.game_mode == 'speed' and state.round_start_time is not None and state.time_limit:
+            # Wall-clock start time -> deadline on this process's monotonic clock
+            elapsed = time.time() - state.round_start_time
+            game.round_deadline = time.monotonic() + state.time_limit - elapsed
+        if state.schedule is not None:
+            game.scheduler.load_state(state.schedule)
+            game.current_tier = game.scheduler.current_tier
+        game._restored_state = state  # history is expanded lazily
+        return game
+    
+    def _prepare_word_list(self) -> Tuple[str, ...]:
+        """Prepare the active word list based on game mode, difficulty, and category settings."""
+        return self.word_catalog.words_for(self.category, self.difficulty)
+    
+    def round_rng(self, round_number: Optional[int] = None) -> random.Random:
+        """Deterministic RNG for one round of this session (default: the current round)."""
+        return random.Random(f"{self.seed}:{self.round_number if round_number is None else round_number}")
     
     def start_new_round(self) -> Dict:
         """Start a new round with a random target word."""
-        if self.game_completed:
-            return {'error': 'Game already completed'}
-        
-        self.round_number += 1
-        
-        # Check if game should end
-        if self.round_number > self.max_rounds:
-            self.game_completed = True
-            return {
-                'game_ended': True,
-                'final_score': self.score,
-                'correct_guesses': self.correct_guesses,
-                'total_rounds': self.max_rounds
-            }
-        
-        # Select random target word from active list
-        self.current_target_word = random.choice(self.active_word_list)
-        self.current_target_token_id = self.token_handler.get_single_token_id(
-            self.current_target_word
-        )
-        
-        # Reset attempts for new round
-        self.current_attempts = 0
-        self.max_attempts = 3
-        
-        # Set round start time for speed mode
-        if self.game_mode == 'speed':
-            import time
-            self.round_start_time = time.time()
-            if not self.time_limit:
-                self.time_limit = 30  # 30 seconds default
-        
-        return {
-            'target_word': self.current_target_word,
-            'target_token_id': self.current_target_token_id,
-            'current_round': self.round_number,
-            'round_number': self.round_number,  # Keep for backward compatibility
-            'max_rounds': self.max_rounds,
-            'attempts_left': self.max_attempts,
-            'game_ended': False,
-            'game_mode': self.game_mode,
-            'difficulty': self.difficulty,
-            'category': self.category,
-            'time_limit': self.time_limit if self.game_mode == 'speed' else None
-        }
-    
-    def submit_guess(self, guess_word: str) -> Dict:
-        """Submit a guess and calculate score."""
-        guess_word = guess_word.strip().lower()
-        
-        # Check if max attempts reached
-        if self.current_attempts >= self.max_attempts:
-            return {
-                'valid_guess': False,
-                'error': 'Maximum attempts (3) reached for this round',
-                'max_attempts_reached': True
-            }
-        
-        # Get guess token info
-        guess_info = self.token_handler.get_word_info(guess_word)
-        guess_token_id = self.token_handler.get_single_token_id(guess_word)
-        
-        # Calculate distance
-        if guess_token_id is not None and self.current_target_token_id is not None:
-            self.current_attempts += 1
-            distance = abs(guess_token_id - self.current_target_token_id)
+        with self._round_lock:
+            if self.game_completed:
+                return {'error': 'Game already completed'}
             
-            # Calculate points using new system
-            feedback = self._get_feedback(distance, guess_token_id, self.current_target_token_id)
-            round_score = feedback['points']
-            self.score += round_score
+            self.round_number += 1
             
-            # Check if correct
-            if feedback['is_correct']:
-                self.correct_guesses += 1
-            
-            # Record this guess
-            guess_record = {
-                'round': self.round_number,
-                'target_word': self.current_target_word,
-                'target_token_id': self.current_target_token_id,
-                'guess_word': guess_word,
-                'guess_token_id': guess_token_id,
-                'distance': distance,
-                'round_score': round_score,
-                'total_score': self.score,
-                'is_correct': feedback['is_correct'],
-                'result_type': feedback['result'],
-                'attempt_number': self.current_attempts
-            }
+            self._cancel_round_timer()
+            self.round_deadline = None
+            self.round_expired = False
             
-            self.game_history.append(guess_record)
+            # Check if game should end
+            if self.round_number > self.max_rounds:
+                self.scheduler.finish_round(self.correct_guesses)
+                self.game_completed = True
+                return {
+                    'game_ended': True,
+                    'final_score': self.score,
+                    'correct_guesses': self.correct_guesses,
+                    'total_rounds': self.max_rounds
+                }
             
-            # Get educational explanation and token fact
-            educational_explanation = self.token_handler.get_educational_explanation(
-                self.current_target_word, guess_word
+            # Deal the next target (no repeats; tier adapts to the player; reproducible from the seed)
+            self.current_target_word, self.current_tier = self.scheduler.next_target(
+                self.round_rng(), self.correct_guesses
             )
-            token_fact = self.token_handler.get_random_token_fact()
+            self.current_target_token_id = self.word_catalog.token_id(self.current_target_word)
+            
+            # Reset attempts for new round
+            self.current_attempts = 0
+            self.max_attempts = 3
+            
+            # Set round start time for speed mode and arm the round's timer
+            if self.game_mode == 'speed':
+                self.round_start_time = time.time()
+                if not self.time_limit:
+                    self.time_limit = 30  # 30 seconds default
+                self.round_deadline = time.monotonic() + self.time_limit
+                self.round_timer = get_timer_wheel().schedule_at(
+                    self.round_deadline, self._expire_round, self.round_number
+                )
             
             return {
-                'valid_guess': True,
-                'guess_word': guess_word,
-                'guess_token_id': guess_token_id,
+                'target_word': self.current_target_word,
                 'target_token_id': self.current_target_token_id,
-                'distance': distance,
-                'round_score': round_score,
-                'total_score': self.score,
-                'feedback': feedback,
-                'guess_info': guess_info,
                 'current_round': self.round_number,
                 'round_number': self.round_number,  # Keep for backward compatibility
                 'max_rounds': self.max_rounds,
-                'attempts_used': self.current_attempts,
-                'attempts_left': self.max_attempts - self.current_attempts,
-                'max_attempts_reached': self.current_attempts >= self.max_attempts,
-                'educational_explanation': educational_explanation,
-                'token_fact': token_fact
+                'attempts_left': self.max_attempts,
+                'game_ended': False,
+                'game_mode': self.game_mode,
+                'difficulty': self.difficulty,
+                'tier': self.current_tier,
+                'category': self.category,
+                'time_limit': self.time_limit if self.game_mode == 'speed' else None
             }
-        else:
-            # Invalid guess (multi-token or not found) - still counts as attempt
-            self.current_attempts += 1
-            return {
-                'valid_guess': False,
-                'error': 'Word must be a single token',
-                'guess_info': guess_info,
-                'attempts_used': self.current_attempts,
-                'attempts_left': self.max_attempts - self.current_attempts,
-                'max_attempts_reached': self.current_attempts >= self.max_attempts
-            }
-    
-    def _calculate_points(self, distance: int) -> int:
-        """Calculate points based on distance ranges."""
-        if self.game_mode == 'antonym':
-            # In antonym mode, higher distances get more points
-            if distance >= 50000:
-                return 10
-            elif distance >= 30000:
-                return 9
-            elif distance >= 20000:
-                return 8
-            elif distance >= 10000:
-                return 7
-            elif distance >= 5000:
-                return 6
-            elif distance >= 1000:
-                return 5
-            else:
-                return 0
-        else:
-            # Normal mode - closer distances get more points
-            if distance <= 1:
-                return 10
-            elif distance <= 100:
-                return 9
-            elif distance <= 500:
-                return 8
-            elif distance <= 1000:
-                return 7
-            elif distance <= 5000:
-                return 6
-            elif distance <= 10000:
-                return 5
-            else:
-                return 0
     
-    def _get_feedback(self, distance: int, guess_token_id: int, target_token_id: int) -> dict:
-        """Generate feedback with clear right/wrong indication and detailed token info."""
-        
-        # Calculate points (different for antonym mode)
-        points = self._calculate_points(distance)
-        
-        # Antonym mode has different success criteria
-        if self.game_mode == 'antonym':
-            if distance >= 50000:
+    def submit_guess(self, guess_word: str) -> Dict:
+        """Submit a guess and calculate score."""
+        with self._round_lock:
+            guess_word = guess_word.strip().lower()
+            
+            # Speed mode: the server's clock decides, whatever the client shows
+            if self._round_timed_out():
                 return {
-                    'message': f"🎯 PERFECT ANTONYM! 👍",
-                    'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                    'result': 'PERFECT OPPOSITE',
-                    'color': '#4CAF50',
-                    'is_correct': True,
-                    'points': points,
-                    'encouragement': "Amazing! Maximum distance achieved! 🎉"
+                    'valid_guess': False,
+                    'error': f'Time is up ({self.time_limit}s) for this round',
+                    'time_expired': True,
+                    'max_attempts_reached': True
                 }
-            elif distance >= 30000:
+            
+            # Check if max attempts reached
+            if self.current_attempts >= self.max_attempts:
                 return {
-                    'message': f"👍 GREAT ANTONYM! Very opposite!",
-                    'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                    'result': 'EXCELLENT OPPOSITE',
-                    'color': '#4CAF50',
-                    'is_correct': True,
-                    'points': points,
-                    'encouragement': "Great opposite thinking! 🔥"
+                    'valid_guess': False,
+                    'error': 'Maximum attempts (3) reached for this round',
+                    'max_attempts_reached': True
                 }
-            elif distance >= 10000:
-                return {
-                    'message': f"🤔 Getting more opposite... try for even more distant!",
-                    'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                    'result': 'SOMEWHAT OPPOSITE',
-                    'color': '#FF9800',
-                    'is_correct': False,
-                    'points': points,
-                    'encouragement': "Think of more contrasting words! 💪"
+            
+            # Get guess token info
+            guess_info = self.token_handler.get_word_info(guess_word)
+            guess_token_id, matched_variant = self._resolve_guess_token(guess_word)
+            
+            # Calculate distance
+            if guess_token_id is not None and self.current_target_token_id is not None:
+                self.current_attempts += 1
+                distance = abs(guess_token_id - self.current_target_token_id)
+            
+                # Calculate points using new system
+                feedback = self._get_feedback(distance, guess_token_id, self.current_target_token_id)
+                round_score = feedback['points']
+                self.score += round_score
+            
+                # Check if correct
+                if feedback['is_correct']:
+                    self.correct_guesses += 1
+            
+                # Record this guess
+                guess_record = {
+                    'round': self.round_number,
+                    'target_word': self.current_target_word,
+                    'target_token_id': self.current_target_token_id,
+                    'guess_word': guess_word,
+                    'guess_token_id': guess_token_id,
+                    'distance': distance,
+                    'round_score': round_score,
+                    'total_score': self.score,
+                    'is_correct': feedback['is_correct'],
+                    'result_type': feedback['result'],
+                    'attempt_number': self.current_attempts
+                }
+            
+                self.game_history.append(guess_record)
+            
+                # Get educational explanation and token fact
+                educational_explanation = self.token_handler.get_educational_explanation(
+                    self.current_target_word, guess_word, guess_token_id
+                )
+                token_fact = self.token_handler.get_random_token_fact()
+            
+                result = {
+                    'valid_guess': True,
+                    'guess_word': guess_word,
+                    'guess_token_id': guess_token_id,
+                    'matched_variant': matched_variant,
+                    'target_token_id': self.current_target_token_id,
+                    'distance': distance,
+                    'round_score': round_score,
+                    'total_score': self.score,
+                    'feedback': feedback,
+                    'guess_info': guess_info,
+                    'current_round': self.round_number,
+                    'round_number': self.round_number,  # Keep for backward compatibility
+                    'max_rounds': self.max_rounds,
+                    'attempts_used': self.current_attempts,
+                    'attempts_left': self.max_attempts - self.current_attempts,
+                    'max_attempts_reached': self.current_attempts >= self.max_attempts,
+                    'educational_explanation': educational_explanation,
+                    'token_fact': token_fact
                 }
+            
+                if self.game_mode == 'compare':
+                    result['encoding_comparison'] = self.compare_guess_across_encodings(guess_word)
+            
+                return result
             else:
+                # Invalid guess (multi-token or not found) - still counts as attempt
+                self.current_attempts += 1
                 return {
-                    'message': f"❌ Too similar! Find the opposite meaning!",
-                    'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                    'result': 'TOO SIMILAR',
-                    'color': '#F44336',
-                    'is_correct': False,
-                    'points': points,
-                    'encouragement': "Try words with opposite meanings! 💡"
+                    'valid_guess': False,
+                    'error': 'Word must be a single token',
+                    'guess_info': guess_info,
+                    'attempts_used': self.current_attempts,
+                    'attempts_left': self.max_attempts - self.current_attempts,
+                    'max_attempts_reached': self.current_attempts >= self.max_attempts
                 }
-        elif distance <= 1:
-            return {
-                'message': f"🎯 YOU GOT IT! 👍",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'PERFECT',
-                'color': '#4CAF50',
-                'is_correct': True,
-                'points': points,
-                'encouragement': "Amazing! Perfect match! 🎉"
-            }
-        elif distance <= 100:
-            return {
-                'message': f"👍 YOU GOT IT! Aww so close!",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'EXCELLENT',
-                'color': '#4CAF50',
-                'is_correct': True,
-                'points': points,
-                'encouragement': "Great synonym sense! 🔥"
-            }
-        elif distance <= 500:
-            return {
-                'message': f"🤔 Almost there! Getting warmer...",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'CLOSE',
-                'color': '#FF9800',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "You're on the right track! 💪"
-            }
-        elif distance <= 1000:
-            return {
-                'message': f"❄️ Getting colder... try something closer!",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'COLD',
-                'color': '#FF5722',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "Think of more similar words! 🤔"
-            }
-        elif distance <= 5000:
-            return {
-                'message': f"🧊 Pretty cold! You're getting distant...",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'FAR',
-                'color': '#D32F2F',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "Try a completely different type of word! 🔄"
-            }
-        elif distance <= 15000:
-            return {
-                'message': f"❄️ Very cold! Way off track...",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'VERY FAR',
-                'color': '#B71C1C',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "Think of totally different word categories! 💭"
-            }
-        elif distance <= 30000:
-            return {
-                'message': f"🌨️ Freezing! Completely different territory!",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'OPPOSITE ZONE',
-                'color': '#880E4F',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "You're in opposite territory! Try antonym mode? 🔀"
-            }
+    
+    def _resolve_guess_token(self, guess_word: str) -> Tuple[Optional[int], Optional[str]]:
+        """Token id and matched spelling for a guess (None, None if no single-token form)."""
+        if self.variant_scoring and self.current_target_token_id is not None:
+            resolved = self.token_handler.resolve_variant(
+                guess_word, self.current_target_token_id, farthest=self.game_mode == 'antonym'
+            )
         else:
-            return {
-                'message': f"❌ MISS! In another universe entirely!",
-                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
-                'result': 'TOTAL MISS',
-                'color': '#4A148C',
-                'is_correct': False,
-                'points': points,
-                'encouragement': "Complete opposite! Perfect for antonym mode! 🌌"
-            }
+            token_id = self.token_handler.get_single_token_id(guess_word)
+            if token_id is not None:
+                return token_id, guess_word
+            # Fall back to e.g. ' happy' when the bare form is not a single token
+            resolved = self.token_handler.resolve_variant(guess_word)
+        
+        if resolved is None:
+            return None, None
+        variant, token_id = resolved
+        return token_id, variant
+    
+    # ─────────────────────────────────────────────
+    # Speed-mode timing
+    # ─────────────────────────────────────────────
+    
+    def time_remaining(self) -> Optional[float]:
+        """Seconds left in the current speed-mode round (None without a time limit)."""
+        if self.round_deadline is None:
+            return None
+        return max(0.0, self.round_deadline - time.monotonic())
+    
+    def round_over(self) -> bool:
+        """Whether the current round is already won or out of attempts."""
+        return self.current_attempts >= self.max_attempts or self.correct_guesses > self.scheduler.correct_before
+    
+    def check_round_expired(self) -> bool:
+        """Whether the current round ran out of time (expiring it now if its deadline has passed).
+
+        Works on a restored game too, whose timer lives in another process or
+        is gone: the deadline itself decides.
+        """
+        with self._round_lock:
+            self._round_timed_out()
+            return self.round_expired
+    
+    def _round_timed_out(self) -> bool:
+        """Whether the round's deadline has passed (caller holds the round lock)."""
+        if self.round_deadline is None or time.monotonic() < self.round_deadline:
+            return False
+        self._expire_round(self.round_number)  # the wheel may not have fired yet (or ran in another process)
+        return True
+    
+    def _expire_round(self, round_number: int):
+        """End a speed-mode round whose time ran out (timer wheel callback)."""
+        with self._round_lock:
+            if round_number != self.round_number or self.round_expired:
+                return
+            self.round_timer = None
+            if self.round_over():
+                return
+            self.round_expired = True
+            self.current_attempts = self.max_attempts  # no more guesses this round
+            
+        # Listeners run outside the lock when called from the wheel's thread
+        for listener in (*self.round_expiry_callbacks, *_round_expiry_listeners):
+            try:
+                listener(self, round_number)
+            except Exception:
+                logger.exception("Round expiry listener %r failed", listener)
+    
+    def _cancel_round_timer(self):
+        if self.round_timer is not None:
+            self.round_timer.cancel()
+            self.round_timer = None
+    
+    def compare_guess_across_encodings(self, guess_word: str) -> Dict[str, List]:
+        """Score a guess against the current target under several encodings."""
+        comparison = self.token_handler.compare_across_encodings(
+            self.current_target_word, guess_word.strip().lower(), self.comparison_encodings
+        )
+        comparison['target_ids'] = comparison.pop('word1_ids')
+        comparison['guess_ids'] = comparison.pop('word2_ids')
+        comparison['points'] = [
+            self._calculate_points(distance) if distance is not None else None
+            for distance in comparison['distances']
+        ]
+        return comparison
+    
+    def _calculate_points(self, distance: int) -> int:
+        """Calculate points based on distance ranges."""
+        return calculate_points(self.game_mode, distance)
+    
+    def _get_feedback(self, distance: int, guess_token_id: int, target_token_id: int) -> dict:
+        """Generate feedback with clear right/wrong indication and detailed token info."""
+        return get_feedback(self.game_mode, distance, guess_token_id, target_token_id)
     
     def get_hint(self) -> Dict:
-        """Get an enhanced hint for the current target word."""
+        """Get an enhanced hint for the current target word (a precomputed bundle plus a token fact)."""
         if not self.current_target_token_id:
             return {'error': 'No active round'}
         
-        # Get advanced nearby words with detailed info
-        nearby_words_data = self.token_handler.get_advanced_nearby_words(
-            self.current_target_token_id, 
-            num_words=12
-        )
-        
-        # Generate contextual hint based on target word
-        hint_message, hint_type = self._generate_contextual_hint(self.current_target_word)
-        
-        # Separate semantic hints from token-based hints
-        semantic_hints = self._get_semantic_hints(self.current_target_word)
-        token_hints = [word['word'] for word in nearby_words_data[:6]]
-        
-        # Get a random educational fact
-        token_fact = self.token_handler.get_random_token_fact()
-        
-        return {
-            'target_word': self.current_target_word,
-            'target_token_id': self.current_target_token_id,
-            'hint_message': hint_message,
-            'hint_type': hint_type,
-            'semantic_hints': semantic_hints,
-            'token_hints': token_hints,
-            'nearby_words_data': nearby_words_data,
-            'token_fact': token_fact,
-            'token_range': f"Look for words with token IDs near {self.current_target_token_id}"
-        }
+        bundle = self.hint_bundles.get(self.current_target_word, self.current_target_token_id)
+        return dict(bundle, token_fact=self.token_handler.get_random_token_fact())
     
     def _get_semantic_hints(self, word: str) -> List[str]:
         """Get semantic hints based on the word's meaning."""
-        word = word.lower()
-        
-        # Create semantic hint mappings
-        semantic_map = {
-            # Emotions
-            'happy': ['joyful', 'cheerful', 'pleased', 'content', 'glad'],
-            'sad': ['unhappy', 'miserable', 'dejected', 'gloomy', 'upset'],
-            'angry': ['mad', 'furious', 'irritated', 'annoyed', 'rage'],
-            
-            # Size
-            'big': ['large', 'huge', 'massive', 'enormous', 'giant'],
-            'small': ['tiny', 'little', 'mini', 'petite', 'compact'],
-            
-            # Speed
-            'fast': ['quick', 'rapid', 'swift', 'speedy', 'hasty'],
-            'slow': ['sluggish', 'gradual', 'leisurely', 'unhurried'],
-            
-            # Quality
-            'good': ['excellent', 'great', 'wonderful', 'superb', 'fine'],
-            'bad': ['awful', 'terrible', 'horrible', 'poor', 'dreadful'],
-            
-            # Temperature
-            'hot': ['warm', 'boiling', 'scorching', 'heated', 'burning'],
-            'cold': ['freezing', 'chilly', 'frigid', 'icy', 'cool'],
-        }
-        
-        return semantic_map.get(word, [])
+        return semantic_hints_for(self.token_handler, word)
     
     def _generate_contextual_hint(self, word: str) -> tuple:
         """Generate contextual hints based on the target word."""
-        word = word.lower()
-        
-        # Emotion words
-        emotions_positive = ['happy', 'joy', 'glad', 'cheerful', 'pleased']
-        emotions_negative = ['sad', 'angry', 'mad', 'upset', 'unhappy']
-        
-        # Size words  
-        size_big = ['big', 'large', 'huge', 'giant', 'massive']
-        size_small = ['small', 'tiny', 'little', 'mini', 'petite']
-        
-        # Speed words
-        speed_fast = ['fast', 'quick', 'rapid', 'swift', 'speedy']
-        speed_slow = ['slow', 'sluggish', 'gradual', 'leisurely']
-        
-        # Quality words
-        quality_good = ['good', 'great', 'excellent', 'wonderful', 'amazing']
-        quality_bad = ['bad', 'awful', 'terrible', 'horrible', 'poor']
-        
-        if word in emotions_positive:
-            return "💖 Think of other positive emotions or feelings!", "emotion_positive"
-        elif word in emotions_negative:
-            return "💔 Consider other negative emotions or sad feelings", "emotion_negative"
-        elif word in size_big:
-            return "📏 Think of other words meaning large or expansive", "size_big"
-        elif word in size_small:
-            return "🤏 Consider other words meaning tiny or compact", "size_small"
-        elif word in speed_fast:
-            return "⚡ Think of other words meaning quick or rapid", "speed_fast"
-        elif word in speed_slow:
-            return "🐌 Consider other words meaning gradual or unhurried", "speed_slow"
-        elif word in quality_good:
-            return "⭐ Think of other positive quality words", "quality_good"
-        elif word in quality_bad:
-            return "👎 Consider other negative quality words", "quality_bad"
-        else:
-            return f"🤔 Think of words similar to '{word}' or with related meanings", "general"
+        return contextual_hint_for(self.token_handler, word)
     
     def get_game_stats(self) -> Dict:
         """Get current game statistics."""
@@ -545,15 +558,21 @@ class GameLogic:
             'current_round': self.round_number
         }
     
-    def reset_game(self):
-        """Reset the game to initial state."""
-        self.score = 0
-        self.round_number = 0
-        self.current_target_word = ""
-        self.current_target_token_id = None
-        self.game_history = []
-        self.correct_guesses = 0
-        self.game_completed = False
+    def reset_game(self, seed: Optional[int] = None):
+        """Reset the game to initial state (a new session seed unless one is given)."""
+        with self._round_lock:
+            self.seed = normalize_seed(seed) if seed is not None else random.randrange(2 ** 32)
+            self.scheduler.reseed(self.seed)  # the player's accuracy per tier carries over
+            self._cancel_round_timer()
+            self.round_deadline = None
+            self.round_expired = False
+            self.score = 0
+            self.round_number = 0
+            self.current_target_word = ""
+            self.current_target_token_id = None
+            self.game_history = []
+            self.correct_guesses = 0
+            self.game_completed = False
     
     def get_final_results(self) -> Dict:
         """Get final game results summary."""
@@ -577,15 +596,20 @@ class GameLogic:
     
     def change_game_settings(self, game_mode: str = None, difficulty: str = None, category: str = None):
         """Change game settings and refresh word list."""
-        if game_mode:
-            self.game_mode = game_mode
-        if difficulty:
-            self.difficulty = difficulty
-        if category:
-            self.category = category
-        
-        # Refresh the active word list
-        self.active_word_list = self._prepare_word_list()
+        with self._round_lock:
+            if game_mode:
+                self.game_mode = game_mode
+            if difficulty:
+                self.difficulty = difficulty
+            if category:
+                self.category = category
+            
+            # Refresh the active word list and target decks (keeping the player's statistics)
+            self.active_word_list = self._prepare_word_list()
+            self.scheduler = TargetScheduler(self.word_catalog, self.category, self.difficulty, self.seed,
+                                             self.scheduler.to_state())
+        if self.game_mode == 'compare':
+            self.token_handler.comparison_encodings(self.comparison_encodings)
     
     @staticmethod
     def get_available_modes():
@@ -594,7 +618,8 @@ class GameLogic:
             'normal': 'Classic synonym finding',
             'antonym': 'Find words with opposite meanings (maximum distance)',
             'category': 'Words from specific semantic category',
-            'speed': 'Time-limited rounds for extra challenge'
+            'speed': 'Time-limited rounds for extra challenge',
+            'compare': 'Score each guess under several tokenizers side by side'
         }
     
     @staticmethod
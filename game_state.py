@@ -0,0 +1,148 @@
+"""
+Game State Module
+Compact, serializable snapshot of a GameLogic game
+
+A GameState holds everything needed to rebuild a game between stateless web
+requests: the settings, session seed and target scheduler, the current round
+and the full guess history.
+Encoding uses short keys and positional lists, and the history stores each
+target word once, with distances and running totals derived on restore.
+``to_dict`` suits the (JSON) Flask session; ``to_bytes`` adds zlib for
+server-side stores.
+"""
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMAT_VERSION = 4  # 2 added the session seed, 3 the target scheduler, 4 round expiry (older states still load)
+
+# Guess rows: (round, target index, guess word, guess id, round score,
+#              is correct, result type, attempt number)
+GuessRow = Tuple[int, int, str, int, int, bool, str, int]
+
+
+class GameState:
+    """Slot-based snapshot of one game (see GameLogic.to_state / from_state)."""
+
+    __slots__ = (
+        'max_rounds', 'game_mode', 'difficulty', 'category', 'comparison_encodings', 'variant_scoring',
+        'target_word', 'target_token_id', 'score', 'round_number', 'correct_guesses', 'game_completed',
+        'current_attempts', 'max_attempts', 'time_limit', 'round_start_time', 'targets', 'guesses', 'seed',
+        'schedule', 'round_expired'
+    )
+
+    def __init__(self, max_rounds: int = 10, game_mode: str = 'normal', difficulty: str = 'mixed',
+                 category: str = 'all', comparison_encodings: Optional[List[str]] = None,
+                 variant_scoring: bool = False, target_word: str = "", target_token_id: Optional[int] = None,
+                 score: int = 0, round_number: int = 0, correct_guesses: int = 0, game_completed: bool = False,
+                 current_attempts: int = 0, max_attempts: int = 3, time_limit: Optional[int] = None,
+                 round_start_time: Optional[float] = None,
+                 targets: Optional[List[Tuple[str, int]]] = None, guesses: Optional[List[GuessRow]] = None,
+                 seed: Optional[int] = None, schedule: Optional[List[int]] = None, round_expired: bool = False):
+        self.max_rounds = max_rounds
+        self.game_mode = game_mode
+        self.difficulty = difficulty
+        self.category = category
+        self.comparison_encodings = comparison_encodings
+        self.variant_scoring = variant_scoring
+        self.target_word = target_word
+        self.target_token_id = target_token_id
+        self.score = score
+        self.round_number = round_number
+        self.correct_guesses = correct_guesses
+        self.game_completed = game_completed
+        self.current_attempts = current_attempts
+        self.max_attempts = max_attempts
+        self.time_limit = time_limit
+        self.round_start_time = round_start_time
+        self.targets = targets if targets is not None else []  # distinct (word, id) pairs
+        self.guesses = guesses if guesses is not None else []
+        self.seed = seed
+        self.schedule = schedule  # TargetScheduler.to_state()
+        self.round_expired = round_expired  # speed round ended by its time limit
+
+    # ─────────────────────────────────────────────
+    # History rows
+    # ─────────────────────────────────────────────
+
+    @staticmethod
+    def compact_history(history: List[Dict]) -> Tuple[List[Tuple[str, int]], List[GuessRow]]:
+        """Split GameLogic guess records into a target table and short rows."""
+        targets: List[Tuple[str, int]] = []
+        target_index: Dict[Tuple[str, int], int] = {}
+        rows: List[GuessRow] = []
+        for record in history:
+            target = (record['target_word'], record['target_token_id'])
+            index = target_index.get(target)
+            if index is None:
+                index = target_index[target] = len(targets)
+                targets.append(target)
+            rows.append((record['round'], index, record['guess_word'], record['guess_token_id'],
+                         record['round_score'], record['is_correct'], record['result_type'],
+                         record['attempt_number']))
+        return targets, rows
+
+    def history(self) -> List[Dict]:
+        """Expand the rows back into GameLogic guess records."""
+        records = []
+        total_score = 0
+        for round_number, index, guess_word, guess_id, round_score, is_correct, result_type, attempt in self.guesses:
+            target_word, target_id = self.targets[index]
+            total_score += round_score
+            records.append({
+                'round': round_number,
+                'target_word': target_word,
+                'target_token_id': target_id,
+                'guess_word': guess_word,
+                'guess_token_id': guess_id,
+                'distance': abs(guess_id - target_id),
+                'round_score': round_score,
+                'total_score': total_score,
+                'is_correct': bool(is_correct),
+                'result_type': result_type,
+                'attempt_number': attempt
+            })
+        return records
+
+    # ─────────────────────────────────────────────
+    # Encoding
+    # ─────────────────────────────────────────────
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Short-key, JSON-ready form (small enough for a session cookie)."""
+        return {
+            'v': FORMAT_VERSION,
+            'g': [self.max_rounds, self.game_mode, self.difficulty, self.category,
+                  self.comparison_encodings, int(self.variant_scoring), self.seed],
+            'r': [self.target_word, self.target_token_id, self.score, self.round_number, self.correct_guesses,
+                  int(self.game_completed), self.current_attempts, self.max_attempts,
+                  self.time_limit, self.round_start_time, int(self.round_expired)],
+            't': [list(target) for target in self.targets],
+            's': self.schedule,
+            'h': [[round_number, index, guess_word, guess_id, round_score, int(is_correct), result_type, attempt]
+                  for round_number, index, guess_word, guess_id, round_score, is_correct, result_type, attempt
+                  in self.guesses]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameState":
+        """Inverse of to_dict (ValueError for another format version)."""
+        if data.get('v') not in (1, 2, 3, FORMAT_VERSION):
+            raise ValueError(f"Unsupported game state version: {data.get('v')!r}")
+        max_rounds, game_mode, difficulty, category, comparison_encodings, variant_scoring, *rest = data['g']
+        seed = rest[0] if rest else None
+        (target_word, target_token_id, score, round_number, correct_guesses, game_completed,
+         current_attempts, max_attempts, time_limit, round_start_time, *round_rest) = data['r']
+        return cls(max_rounds, game_mode, difficulty, category, comparison_encodings, bool(variant_scoring),
+                   target_word, target_token_id, score, round_number, correct_guesses, bool(game_completed),
+                   current_attempts, max_attempts, time_limit, round_start_time,
+                   [tuple(target) for target in data['t']], [tuple(row) for row in data['h']], seed,
+                   data.get('s'), bool(round_rest and round_rest[0]))
+
+    def to_bytes(self) -> bytes:
+        """Compressed binary form for server-side session stores."""
+        return zlib.compress(json.dumps(self.to_dict(), separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameState":
+        return cls.from_dict(json.loads(zlib.decompress(data)))
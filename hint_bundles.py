@@ -0,0 +1,258 @@
+"""
+Hint Bundles Module
+Precomputed hints for every target word of the catalog
+
+A hint bundle is everything GameLogic.get_hint shows for a target except the
+random token fact: nearby words, semantic neighbours, the contextual message
+and a small token-space density strip for the visualization.  Bundles are
+computed once per word - in a background thread pool when the first game
+starts, or ahead of time by ``python -m token_cache warm`` - and persisted
+in ``cache/hint_bundles.sqlite3``.  A hint is one keyed read from that file,
+behind a small LRU of recently shown bundles; workers keep only the set of
+stored words in memory, not every bundle.  Callers get their own copy of a
+bundle, so changing a hint never touches the cached one.
+
+The store namespace includes the encoding, the hint settings and the word
+vector file's identity, so changing any of them recomputes the bundles
+instead of serving stale ones.
+"""
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from bounded_cache import LRUCache
+from cache_registry import approx_bytes, get_cache_registry
+from cache_store import MISSING, SQLiteCacheStore
+
+logger = logging.getLogger(__name__)
+
+HINT_BUNDLE_VERSION = 1  # bump when the bundle contents change
+SAVE_BATCH = 64  # on-demand bundles written per store transaction
+PRECOMPUTE_CHUNK = 256
+RECENT_BUNDLES = 1024  # bundles kept in memory per worker
+
+# compute(word, token_id) -> bundle
+BundleFactory = Callable[[str, int], Dict]
+
+
+def bundle_namespace(encoding_name: str, token_range: int, vectors_path: str = "") -> str:
+    """Store namespace for one encoding and hint configuration."""
+    semantic_key = "builtin"
+    if vectors_path and Path(vectors_path).exists():
+        stat = Path(vectors_path).stat()
+        semantic_key = hashlib.sha1(
+            f"{Path(vectors_path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()[:12]
+    return f"hints:v{HINT_BUNDLE_VERSION}:{encoding_name}:{token_range}:{semantic_key}"
+
+
+def _copy(value: Any) -> Any:
+    """Copy of a bundle's nested dicts and lists (leaves are immutable)."""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class HintBundleStore:
+    """Word -> bundle lookups from disk, filled by background precomputation."""
+
+    def __init__(self, compute: BundleFactory, store: Optional[SQLiteCacheStore], namespace: str,
+                 recent_size: int = RECENT_BUNDLES):
+        self._compute = compute
+        self.store = store
+        self.namespace = namespace
+        self._recent = LRUCache(recent_size)
+        self._stored: Set[str] = set()  # words with a bundle in the store
+        self._unsaved: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._precompute_thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+
+    def load(self):
+        """Read which words already have a persisted bundle (not the bundles)."""
+        if self.store is None:
+            return
+        start_time = time.time()
+        try:
+            self._stored.update(self.store.keys(self.namespace))
+        except Exception as e:  # a broken cache file only costs recomputation
+            logger.warning("Could not read hint bundles: %s", e)
+        self.load_time = time.time() - start_time
+        logger.info("Found %d stored hint bundles in %.3f seconds", len(self._stored), self.load_time)
+
+    # ─────────────────────────────────────────────
+    # Lookup
+    # ─────────────────────────────────────────────
+
+    def get(self, word: str, token_id: int) -> Dict:
+        """A copy of the target's bundle, computed on the spot if precomputation has not reached it."""
+        bundle = self._recent.get(word)
+        if bundle is None:
+            bundle = self._unsaved.get(word)
+        if bundle is None and word in self._stored:
+            bundle = self._read(word)
+        if bundle is not None and bundle['target_token_id'] == token_id:
+            self.hits += 1
+            self._recent.put(word, bundle)
+            return _copy(bundle)
+
+        self.misses += 1
+        bundle = self._compute(word, token_id)
+        self._recent.put(word, bundle)
+        with self._lock:
+            self._unsaved[word] = bundle
+            save_now = len(self._unsaved) >= SAVE_BATCH
+        if save_now:
+            self.save()
+        return _copy(bundle)
+
+    def _read(self, word: str) -> Optional[Dict]:
+        try:
+            bundle = self.store.get(self.namespace, word)
+        except Exception as e:
+            logger.warning("Could not read hint bundle for %r: %s", word, e)
+            return None
+        return None if bundle is MISSING else bundle
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._stored or word in self._recent
+
+    def __len__(self) -> int:
+        return len(self._stored)
+
+    # ─────────────────────────────────────────────
+    # Precomputation
+    # ─────────────────────────────────────────────
+
+    def precompute(self, targets: Iterable, workers: int = 4, wait: bool = False) -> int:
+        """Compute bundles for (word, token_id) targets that have none, in a thread pool.
+
+        With ``wait=False`` the work runs in the background and this returns
+        at once; either way the number of bundles to compute is returned.
+        """
+        missing = [(word, token_id) for word, token_id in targets if word not in self._stored]
+        if not missing:
+            return 0
+
+        def run():
+            start_time = time.time()
+            chunks = [missing[start:start + PRECOMPUTE_CHUNK] for start in range(0, len(missing), PRECOMPUTE_CHUNK)]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hint-bundles") as pool:
+                for chunk in pool.map(self._compute_chunk, chunks):
+                    self._persist(chunk)
+            logger.info("Precomputed %d hint bundles in %.2f seconds", len(missing), time.time() - start_time)
+
+        if wait:
+            run()
+        else:
+            self._precompute_thread = threading.Thread(target=run, name="hint-bundle-precompute", daemon=True)
+            self._precompute_thread.start()
+        return len(missing)
+
+    def _compute_chunk(self, chunk: List) -> Dict[str, Dict]:
+        bundles = {}
+        for word, token_id in chunk:
+            try:
+                bundles[word] = self._compute(word, token_id)
+            except Exception as e:
+                logger.warning("Could not build hint bundle for %r: %s", word, e)
+        if self.store is None:
+            # Nowhere to persist them: keep what fits in memory
+            for word, bundle in bundles.items():
+                self._recent.put(word, bundle)
+        return bundles
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until background precomputation has finished."""
+        thread = self._precompute_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # ─────────────────────────────────────────────
+    # Persistence
+    # ─────────────────────────────────────────────
+
+    def _persist(self, bundles: Dict[str, Dict]):
+        if self.store is None or not bundles:
+            return
+        try:
+            self.store.put_many(self.namespace, bundles.items())
+            self._stored.update(bundles)
+        except Exception as e:
+            logger.warning("Could not save hint bundles: %s", e)
+
+    def save(self):
+        """Write bundles computed on demand since the last save."""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        self._persist(unsaved)
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._stored),
+            'in_memory': len(self._recent),
+            'hits': self.hits,
+            'misses': self.misses,
+            'unsaved': len(self._unsaved),
+            'precomputing': self._precompute_thread is not None and self._precompute_thread.is_alive()
+        }
+
+    def clear(self):
+        """Drop the in-memory bundles (the store is kept)."""
+        self._recent.clear()
+
+
+# Process-wide stores keyed by (encoding, cache directory)
+_stores: Dict[Tuple[str, str], HintBundleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_hint_bundles(token_handler, catalog=None, compute: Optional[BundleFactory] = None,
+                     precompute: bool = True) -> HintBundleStore:
+    """The shared bundle store for a handler's encoding and the current hint settings.
+
+    On first use it loads the persisted bundles and starts precomputing the
+    missing ones for every word of ``catalog`` in the background.
+    """
+    key = (token_handler.encoding_name, str(token_handler.cache_dir))
+    bundles = _stores.get(key)
+    if bundles is not None:
+        return bundles
+
+    with _stores_lock:
+        bundles = _stores.get(key)
+        if bundles is None:
+            from config import get_game_config
+            config = get_game_config()
+            namespace = bundle_namespace(token_handler.encoding_name, config.token_range_for_hints,
+                                         config.word_vectors_path)
+            if compute is None:
+                from game_logic import compute_hint_bundle
+
+                def compute(word: str, token_id: int) -> Dict:
+                    return compute_hint_bundle(token_handler, word, token_id)
+            try:
+                store = SQLiteCacheStore(Path(token_handler.cache_dir) / "hint_bundles.sqlite3")
+            except Exception as e:
+                logger.warning("Hint bundles will not be persisted: %s", e)
+                store = None
+            bundles = HintBundleStore(compute, store, namespace)
+            bundles.load()
+            atexit.register(bundles.save)
+            get_cache_registry().register(
+                f"hint_bundles:{token_handler.encoding_name}", bundles.stats, bundles.clear,
+                measure=lambda: approx_bytes(dict(bundles._recent.items()), sample=8), load_time=bundles.load_time
+            )
+            if precompute and catalog is not None:
+                bundles.precompute(catalog.token_ids.items())
+            _stores[key] = bundles
+        return bundles
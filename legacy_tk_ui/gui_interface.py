@@ -1208,6 +1208,25 @@ class TokenGameGUI:
         target_x = margin + ((target_id - vis_range[0]) / range_size) * usable_width
         guess_x = margin + ((guess_id - vis_range[0]) / range_size) * usable_width
         
+        # Draw word density backdrop from the precomputed token space pyramid
+        density = viz_data.get('density', [])
+        max_count = max((bucket['word_count'] for bucket in density), default=0)
+        if max_count:
+            for bucket in density:
+                bucket_start = max(bucket['start_id'], vis_range[0])
+                bucket_end = min(bucket['end_id'] + 1, vis_range[1])
+                if bucket_end <= bucket_start:
+                    continue
+                x0 = margin + ((bucket_start - vis_range[0]) / range_size) * usable_width
+                x1 = margin + ((bucket_end - vis_range[0]) / range_size) * usable_width
+                bar_height = (bucket['word_count'] / max_count) * (height // 2 - 14)
+                canvas.create_rectangle(
+                    x0, height//2 - bar_height,
+                    x1, height//2,
+                    fill=MaterialColors.TARGET_HIGHLIGHT,
+                    outline=''
+                )
+        
         # Draw modern timeline base
         canvas.create_line(
             margin, height//2, 
@@ -27,6 +27,7 @@ except ImportError as exc:
 from legacy_tk_ui.gui_interface import TokenGameGUI
 from legacy_tk_ui.startup_dialog import show_startup_dialog
 from game_logic import GameLogic
+from encoder_registry import get_encoder
 
 # --------------------------------------
 # UI theme palette (built once at import)
@@ -85,8 +86,8 @@ def main():
     print("-" * 50)
     
     try:
-        # Test tiktoken installation
-        enc = tiktoken.get_encoding("o200k_base")
+        # Test tiktoken installation (loads from the local snapshot when present)
+        enc = get_encoder("o200k_base")
         test_tokens = enc.encode("hello world")
         print(f"✅ tiktoken working! Test encoding: {test_tokens}")
         
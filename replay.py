@@ -0,0 +1,283 @@
+"""
+Token Quest replay engine
+Re-scores historical guess logs with the current scoring rules
+
+Streams guess records out of the research CSVs (``detailed_guesses_*.csv``
+and the other exports with the same columns) and ``session_*.json`` files,
+re-scores each one with ``scoring.calculate_points`` / ``get_feedback`` and
+reports every record whose logged points or correctness no longer match.
+Scoring depends only on the game mode and the token distance, so no encoder
+is loaded and records are scored in batches: each mode's distinct distances
+are scored once (found with numpy's ``unique`` when it is installed) and the
+results are mapped back over the whole batch.
+
+    python replay.py "Token data from token game"
+    python replay.py game_data/*.csv --diff-csv changes.csv --json
+"""
+import argparse
+import csv
+import json
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # batches are scored through a plain dict instead
+    np = None
+
+from scoring import calculate_points, get_feedback
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 65536
+DEFAULT_PATTERNS = ('detailed_guesses_*.csv', 'session_*.json')
+DIFF_FIELDS = ('source', 'session_id', 'timestamp', 'game_mode', 'target_word', 'guess_word', 'distance',
+               'logged_points', 'points', 'logged_correct', 'is_correct', 'result')
+
+# Outcome of one distance: (points, result, is_correct)
+Outcome = Tuple[int, str, bool]
+
+
+# ─────────────────────────────────────────────
+# Reading logs
+# ─────────────────────────────────────────────
+
+def iter_log_files(paths: Iterable[str]) -> Iterator[Path]:
+    """Expand directories into their guess logs; files are taken as given."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in DEFAULT_PATTERNS:
+                yield from sorted(path.glob(pattern))
+        elif path.exists():
+            yield path
+        else:
+            logger.warning("No such log file: %s", path)
+
+
+def _as_bool(value) -> Optional[bool]:
+    if isinstance(value, bool) or value is None:
+        return value
+    text = str(value).strip().lower()
+    return {'true': True, '1': True, 'false': False, '0': False}.get(text)
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def read_guess_records(path: Path) -> Iterator[Dict]:
+    """Raw guess rows of one CSV export or session JSON file."""
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from (data.get('guesses', []) if isinstance(data, dict) else data)
+    else:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+
+def normalize_record(raw: Dict, source: str) -> Optional[Dict]:
+    """The fields replay needs, or None if the record cannot be re-scored."""
+    target_id = _as_int(raw.get('target_token_id'))
+    guess_id = _as_int(raw.get('guess_token_id'))
+    if raw.get('target_word') and target_id is not None and guess_id is not None:
+        distance = abs(guess_id - target_id)
+    else:
+        # Research exports leave the target blank (id 0) but log the real distance
+        distance = _as_int(raw.get('token_distance', raw.get('distance')))
+        if distance is None or guess_id is None:
+            return None
+    return {
+        'source': source,
+        'session_id': raw.get('session_id', ''),
+        'timestamp': raw.get('timestamp', ''),
+        'game_mode': raw.get('game_mode') or 'normal',
+        'target_word': raw.get('target_word') or '',
+        'guess_word': raw.get('guess_word', ''),
+        'distance': abs(distance),
+        # Research exports log 'points_earned', game_data sessions 'round_score'
+        'logged_points': _as_int(raw.get('points_earned', raw.get('round_score'))),
+        'logged_correct': _as_bool(raw.get('is_correct'))
+    }
+
+
+# ─────────────────────────────────────────────
+# Scoring
+# ─────────────────────────────────────────────
+
+class Rescorer:
+    """Memoized current-rules outcome of a distance, per game mode."""
+
+    def __init__(self):
+        self._outcomes: Dict[str, Dict[int, Outcome]] = {}
+
+    @staticmethod
+    def _score(game_mode: str, distance: int) -> Outcome:
+        feedback = get_feedback(game_mode, distance, guess_token_id=distance, target_token_id=0)  # ids only fill in text
+        return calculate_points(game_mode, distance), feedback['result'], feedback['is_correct']
+
+    def score_batch(self, game_mode: str, distances: List[int]) -> List[Outcome]:
+        """Outcomes for a column of distances, scoring each distinct distance once."""
+        outcomes = self._outcomes.setdefault(game_mode, {})
+        if np is not None and len(distances) > 1:
+            unique, inverse = np.unique(np.asarray(distances, dtype=np.int64), return_inverse=True)
+            table = []
+            for distance in unique.tolist():
+                outcome = outcomes.get(distance)
+                if outcome is None:
+                    outcome = outcomes[distance] = self._score(game_mode, distance)
+                table.append(outcome)
+            return [table[index] for index in inverse.tolist()]
+
+        batch = []
+        for distance in distances:
+            outcome = outcomes.get(distance)
+            if outcome is None:
+                outcome = outcomes[distance] = self._score(game_mode, distance)
+            batch.append(outcome)
+        return batch
+
+    def distinct_distances(self) -> int:
+        return sum(len(outcomes) for outcomes in self._outcomes.values())
+
+
+# ─────────────────────────────────────────────
+# Replay
+# ─────────────────────────────────────────────
+
+def _new_totals() -> Dict:
+    return {'records': 0, 'logged_score': 0, 'rescored_score': 0,
+            'changed_points': 0, 'changed_correct': 0, 'results': Counter()}
+
+
+def replay(paths: Iterable[str], on_diff: Optional[Callable[[Dict], None]] = None,
+           batch_size: int = BATCH_SIZE) -> Dict:
+    """Re-score every guess in ``paths``; ``on_diff`` receives each changed record."""
+    start_time = time.perf_counter()
+    rescorer = Rescorer()
+    totals = _new_totals()
+    by_mode: Dict[str, Dict] = {}
+    transitions: Counter = Counter()  # (logged points, new points) -> count
+    seen = set()
+    files = skipped = duplicates = 0
+
+    def flush(batch: List[Dict]):
+        groups: Dict[str, List[Dict]] = {}
+        for record in batch:
+            groups.setdefault(record['game_mode'], []).append(record)
+        for game_mode, records in groups.items():
+            mode_totals = by_mode.setdefault(game_mode, _new_totals())
+            outcomes = rescorer.score_batch(game_mode, [record['distance'] for record in records])
+            for record, (points, result, is_correct) in zip(records, outcomes):
+                logged_points = record['logged_points']
+                points_changed = logged_points is not None and logged_points != points
+                correct_changed = record['logged_correct'] is not None and record['logged_correct'] != is_correct
+                for counts in (totals, mode_totals):
+                    counts['records'] += 1
+                    counts['logged_score'] += logged_points or 0
+                    counts['rescored_score'] += points
+                    counts['changed_points'] += points_changed
+                    counts['changed_correct'] += correct_changed
+                    counts['results'][result] += 1
+                if points_changed or correct_changed:
+                    transitions[(logged_points, points)] += 1
+                    if on_diff is not None:
+                        on_diff(dict(record, points=points, result=result, is_correct=is_correct))
+
+    batch: List[Dict] = []
+    for path in iter_log_files(paths):
+        files += 1
+        for raw in read_guess_records(path):
+            record = normalize_record(raw, path.name)
+            if record is None:
+                skipped += 1
+                continue
+            # The same guess is usually in both the CSV and the session JSON
+            key = (record['session_id'], record['timestamp'], record['guess_word'])
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    if batch:
+        flush(batch)
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'files': files,
+        'skipped': skipped,
+        'duplicates': duplicates,
+        'distinct_distances': rescorer.distinct_distances(),
+        'seconds': elapsed,
+        'records_per_second': totals['records'] / elapsed if elapsed > 0 else 0.0,
+        'totals': totals,
+        'by_mode': by_mode,
+        'point_changes': {f"{old}->{new}": count for (old, new), count in transitions.most_common()}
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Re-score historical Token Quest guess logs with the current rules")
+    parser.add_argument("paths", nargs="*", default=["Token data from token game"],
+                        help="log files, or directories to search for detailed_guesses_*.csv / session_*.json")
+    parser.add_argument("--diff-csv", help="write every changed record to this CSV file")
+    parser.add_argument("--show", type=int, default=10, help="changed records to print")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    shown: List[Dict] = []
+    diff_file = open(args.diff_csv, 'w', encoding='utf-8', newline='') if args.diff_csv else None
+    writer = csv.DictWriter(diff_file, DIFF_FIELDS, extrasaction='ignore') if diff_file else None
+    if writer:
+        writer.writeheader()
+
+    def on_diff(record: Dict):
+        if writer:
+            writer.writerow(record)
+        if len(shown) < args.show:
+            shown.append(record)
+
+    try:
+        report = replay(args.paths, on_diff)
+    finally:
+        if diff_file:
+            diff_file.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=dict))
+        return
+
+    totals = report['totals']
+    print(f"Replayed {totals['records']:,} guesses from {report['files']} files in {report['seconds']:.2f}s "
+          f"({report['records_per_second']:,.0f}/s; {report['skipped']:,} without a distance, "
+          f"{report['duplicates']:,} duplicates)")
+    print(f"  {'mode':<12} {'guesses':>9} {'logged':>9} {'rescored':>9} {'delta':>8} "
+          f"{'changed pts':>12} {'changed correct':>16}")
+    for game_mode, counts in sorted(report['by_mode'].items()) + [('all', totals)]:
+        print(f"  {game_mode:<12} {counts['records']:>9,} {counts['logged_score']:>9,} "
+              f"{counts['rescored_score']:>9,} {counts['rescored_score'] - counts['logged_score']:>+8,} "
+              f"{counts['changed_points']:>12,} {counts['changed_correct']:>16,}")
+    if report['point_changes']:
+        print("  Point changes (logged->rescored): " +
+              ", ".join(f"{change} x{count}" for change, count in report['point_changes'].items()))
+    for record in shown:
+        print(f"    {record['source']} {record['timestamp']} {record['game_mode']}: "
+              f"{record['guess_word']!r} -> {record['target_word']!r} distance {record['distance']}: "
+              f"{record['logged_points']} -> {record['points']} pts, {record['result']}")
+
+
+if __name__ == "__main__":
+    main()
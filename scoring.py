@@ -0,0 +1,175 @@
+"""
+Scoring Module
+Points and feedback for a guess in Token Quest
+
+Scoring depends only on the game mode and the token distance between the
+guess and the target, so these are plain functions: GameLogic scores live
+guesses with them and ``replay.py`` re-scores logged ones without loading
+an encoder.
+"""
+
+
+def calculate_points(game_mode: str, distance: int) -> int:
+    """Calculate points based on distance ranges."""
+    if game_mode == 'antonym':
+        # In antonym mode, higher distances get more points
+        if distance >= 50000:
+            return 10
+        elif distance >= 30000:
+            return 9
+        elif distance >= 20000:
+            return 8
+        elif distance >= 10000:
+            return 7
+        elif distance >= 5000:
+            return 6
+        elif distance >= 1000:
+            return 5
+        else:
+            return 0
+    else:
+        # Normal mode - closer distances get more points
+        if distance <= 1:
+            return 10
+        elif distance <= 100:
+            return 9
+        elif distance <= 500:
+            return 8
+        elif distance <= 1000:
+            return 7
+        elif distance <= 5000:
+            return 6
+        elif distance <= 10000:
+            return 5
+        else:
+            return 0
+
+
+def get_feedback(game_mode: str, distance: int, guess_token_id: int, target_token_id: int) -> dict:
+    """Generate feedback with clear right/wrong indication and detailed token info."""
+
+    # Calculate points (different for antonym mode)
+    points = calculate_points(game_mode, distance)
+
+    # Antonym mode has different success criteria
+    if game_mode == 'antonym':
+        if distance >= 50000:
+            return {
+                'message': f"🎯 PERFECT ANTONYM! 👍",
+                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+                'result': 'PERFECT OPPOSITE',
+                'color': '#4CAF50',
+                'is_correct': True,
+                'points': points,
+                'encouragement': "Amazing! Maximum distance achieved! 🎉"
+            }
+        elif distance >= 30000:
+            return {
+                'message': f"👍 GREAT ANTONYM! Very opposite!",
+                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+                'result': 'EXCELLENT OPPOSITE',
+                'color': '#4CAF50',
+                'is_correct': True,
+                'points': points,
+                'encouragement': "Great opposite thinking! 🔥"
+            }
+        elif distance >= 10000:
+            return {
+                'message': f"🤔 Getting more opposite... try for even more distant!",
+                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+                'result': 'SOMEWHAT OPPOSITE',
+                'color': '#FF9800',
+                'is_correct': False,
+                'points': points,
+                'encouragement': "Think of more contrasting words! 💪"
+            }
+        else:
+            return {
+                'message': f"❌ Too similar! Find the opposite meaning!",
+                'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+                'result': 'TOO SIMILAR',
+                'color': '#F44336',
+                'is_correct': False,
+                'points': points,
+                'encouragement': "Try words with opposite meanings! 💡"
+            }
+    elif distance <= 1:
+        return {
+            'message': f"🎯 YOU GOT IT! 👍",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'PERFECT',
+            'color': '#4CAF50',
+            'is_correct': True,
+            'points': points,
+            'encouragement': "Amazing! Perfect match! 🎉"
+        }
+    elif distance <= 100:
+        return {
+            'message': f"👍 YOU GOT IT! Aww so close!",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'EXCELLENT',
+            'color': '#4CAF50',
+            'is_correct': True,
+            'points': points,
+            'encouragement': "Great synonym sense! 🔥"
+        }
+    elif distance <= 500:
+        return {
+            'message': f"🤔 Almost there! Getting warmer...",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'CLOSE',
+            'color': '#FF9800',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "You're on the right track! 💪"
+        }
+    elif distance <= 1000:
+        return {
+            'message': f"❄️ Getting colder... try something closer!",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'COLD',
+            'color': '#FF5722',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "Think of more similar words! 🤔"
+        }
+    elif distance <= 5000:
+        return {
+            'message': f"🧊 Pretty cold! You're getting distant...",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'FAR',
+            'color': '#D32F2F',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "Try a completely different type of word! 🔄"
+        }
+    elif distance <= 15000:
+        return {
+            'message': f"❄️ Very cold! Way off track...",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'VERY FAR',
+            'color': '#B71C1C',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "Think of totally different word categories! 💭"
+        }
+    elif distance <= 30000:
+        return {
+            'message': f"🌨️ Freezing! Completely different territory!",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'OPPOSITE ZONE',
+            'color': '#880E4F',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "You're in opposite territory! Try antonym mode? 🔀"
+        }
+    else:
+        return {
+            'message': f"❌ MISS! In another universe entirely!",
+            'detail': f"Your token ID: {guess_token_id} | Target: {target_token_id} | Distance: {distance}",
+            'result': 'TOTAL MISS',
+            'color': '#4A148C',
+            'is_correct': False,
+            'points': points,
+            'encouragement': "Complete opposite! Perfect for antonym mode! 🌌"
+        }
@@ -0,0 +1,277 @@
+"""
+Semantic Index Module
+Word-vector neighbour search for semantic hints
+
+Loads a local word-vector file (GloVe/fastText text format, ``.npz`` with
+``words`` and ``vectors`` arrays, or ``.npy`` with a ``.vocab`` word list next
+to it), keeps only words the game can accept as single tokens, and stores
+them as a unit-normalized float16 matrix.  Queries go through a random
+projection LSH index (several tables of sign bits, probing the buckets one
+bit away when a word's own buckets are sparse) and are re-ranked by exact
+cosine similarity.  Neighbours of the words actually asked about are cached,
+CACHED_NEIGHBOURS deep, and written behind to disk next to the other Token
+Quest caches.
+
+NumPy is optional: without it (or without a configured vector file) the game
+keeps using its built-in semantic word map.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # semantic hints fall back to the built-in word map
+    np = None
+
+from cache_registry import approx_bytes, get_cache_registry
+
+logger = logging.getLogger(__name__)
+
+LSH_TABLES = 8
+LSH_BITS = 12
+MIN_CANDIDATES = 50
+CACHED_NEIGHBOURS = 10  # neighbours computed per word, whatever k is asked for
+SAVE_EVERY = 32  # new neighbour lists between cache file writes
+
+
+def load_word_vectors(path: Union[str, Path],
+                      keep: Optional[Callable[[str], bool]] = None) -> Tuple[List[str], "np.ndarray"]:
+    """Read a vector file into (words, unit-normalized float16 matrix)."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        data = np.load(path, allow_pickle=False)
+        words = [str(word) for word in data["words"]]
+        vectors = np.asarray(data["vectors"], dtype=np.float32)
+    elif path.suffix == ".npy":
+        with open(path.with_suffix(".vocab"), "r", encoding="utf-8") as f:
+            words = [line.strip() for line in f]
+        vectors = np.load(path, mmap_mode="r")
+    else:
+        words, rows = [], []
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.rstrip().split(" ")
+                if len(parts) <= 2:
+                    continue  # fastText header ("count dim") or blank line
+                word = parts[0]
+                if keep is not None and not keep(word):
+                    continue
+                words.append(word)
+                rows.append(np.asarray(parts[1:], dtype=np.float32))
+        vectors = np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+
+    if keep is not None and path.suffix in (".npz", ".npy"):
+        kept = [row for row, word in enumerate(words) if keep(word)]
+        words = [words[row] for row in kept]
+        vectors = np.asarray(vectors[kept], dtype=np.float32)
+
+    # Keep the first occurrence of each word
+    first_rows: Dict[str, int] = {}
+    for row, word in enumerate(words):
+        first_rows.setdefault(word, row)
+    rows = sorted(first_rows.values())
+    words = [words[row] for row in rows]
+    vectors = np.asarray(vectors[rows], dtype=np.float32)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return words, (vectors / norms).astype(np.float16)
+
+
+class SemanticIndex:
+    """Random-projection LSH over unit word vectors, with exact re-ranking."""
+
+    def __init__(self, words: List[str], vectors: "np.ndarray", n_tables: int = LSH_TABLES,
+                 n_bits: int = LSH_BITS, seed: int = 0, cache_file: Optional[Path] = None):
+        self.words = words
+        self.vectors = vectors
+        self.word_to_row = {word: row for row, word in enumerate(words)}
+        self.cache_file = cache_file
+        self._neighbours: Dict[str, List[str]] = {}
+        self._depth: Dict[str, int] = {}  # k each list was computed for (shorter lists are exhaustive)
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        rng = np.random.default_rng(seed)
+        dim = vectors.shape[1] if vectors.size else 0
+        self._planes = rng.standard_normal((dim, n_tables * n_bits)).astype(np.float32)
+        self._n_tables = n_tables
+        self._n_bits = n_bits
+        self._weights = (1 << np.arange(n_bits, dtype=np.int64))
+        self._tables: List[Dict[int, "np.ndarray"]] = []
+
+        codes = self._hash(vectors)
+        for table in range(n_tables):
+            column = codes[:, table]
+            order = np.argsort(column, kind="stable")
+            keys, starts = np.unique(column[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self._tables.append({int(key): order[start:end] for key, start, end in zip(keys, starts, ends)})
+
+        self._load_cached_neighbours()
+
+    def _hash(self, vectors: "np.ndarray") -> "np.ndarray":
+        """LSH codes, one integer per table, for each row of ``vectors``."""
+        bits = (np.asarray(vectors, dtype=np.float32) @ self._planes) > 0
+        bits = bits.reshape(len(vectors), self._n_tables, self._n_bits)
+        return bits @ self._weights
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_to_row
+
+    def _query(self, word: str, k: int) -> List[str]:
+        row = self.word_to_row.get(word)
+        if row is None:
+            return []
+        vector = self.vectors[row].astype(np.float32)
+        codes = self._hash(vector[np.newaxis, :])[0]
+
+        needed = max(MIN_CANDIDATES, k + 1)
+        buckets = [self._tables[table].get(int(code)) for table, code in enumerate(codes)]
+        buckets = [bucket for bucket in buckets if bucket is not None]
+        candidates = np.unique(np.concatenate(buckets)) if buckets else np.arange(0)
+        if len(candidates) < needed:
+            # Sparse buckets: multi-probe the buckets one sign bit away
+            buckets += [bucket for table, code in enumerate(codes) for bit in range(self._n_bits)
+                        for bucket in (self._tables[table].get(int(code) ^ (1 << bit)),) if bucket is not None]
+            candidates = np.unique(np.concatenate(buckets)) if buckets else np.arange(0)
+        if len(candidates) < needed:
+            candidates = np.arange(len(self.words))  # still too few: exact scan
+        candidates = candidates[candidates != row]
+        if not len(candidates):
+            return []
+
+        scores = self.vectors[candidates].astype(np.float32) @ vector
+        top = min(k, len(candidates))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [self.words[candidates[position]] for position in best]
+
+    def neighbours(self, word: str, k: int = 5) -> List[str]:
+        """Up to k most similar single-token words (cached per word)."""
+        word = word.strip().lower()
+        cached = self._neighbours.get(word)
+        if cached is not None and (len(cached) >= k or self._depth.get(word, 0) >= k):
+            return cached[:k]
+        depth = max(k, CACHED_NEIGHBOURS)
+        result = self._query(word, depth)
+        with self._lock:
+            self._neighbours[word] = result
+            self._depth[word] = depth
+            self._unsaved += 1
+            save_now = self._unsaved >= SAVE_EVERY
+        if save_now:
+            self.save()
+        return result[:k]
+
+    def precompute(self, words: Iterable[str], k: int = 10):
+        """Compute neighbours for many words and persist them to the cache file."""
+        for word in words:
+            self.neighbours(word, k)
+        self.save()
+
+    # ─────────────────────────────────────────────
+    # On-disk neighbour cache
+    # ─────────────────────────────────────────────
+
+    def _load_cached_neighbours(self):
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                self._neighbours = json.load(f)
+            logger.info("Loaded %d cached semantic neighbour lists", len(self._neighbours))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring semantic neighbour cache %s: %s", self.cache_file, e)
+
+    def save_if_changed(self):
+        """Write the neighbour cache if lists were computed since the last save."""
+        if self._unsaved:
+            self.save()
+
+    def save(self):
+        """Write the neighbour cache atomically."""
+        if self.cache_file is None:
+            return
+        with self._lock:
+            data = dict(self._neighbours)
+            self._unsaved = 0
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning("Could not save semantic neighbour cache: %s", e)
+
+
+def neighbour_cache_path(vectors_path: Union[str, Path], encoding_name: str,
+                         cache_dir: Union[str, Path] = "cache") -> Path:
+    """Neighbour cache file, keyed by the vector file's identity and the encoding."""
+    stat = Path(vectors_path).stat()
+    key = f"{Path(vectors_path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{encoding_name}|{LSH_TABLES}x{LSH_BITS}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"semantic_neighbours_{digest}.json"
+
+
+# Process-wide index (None once loading is known to be impossible)
+_index: Optional[SemanticIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_semantic_index(token_handler=None) -> Optional[SemanticIndex]:
+    """Shared index for GameConfig.word_vectors_path, or None if unavailable."""
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+
+    with _index_lock:
+        if _index_loaded:
+            return _index
+        _index_loaded = True
+
+        from config import get_game_config
+        vectors_path = get_game_config().word_vectors_path
+        if not vectors_path:
+            return None
+        if np is None:
+            logger.warning("NumPy is not installed; word vectors in %s are ignored", vectors_path)
+            return None
+
+        if token_handler is None:
+            from token_handler import get_token_handler
+            token_handler = get_token_handler()
+        variants = token_handler.variant_index
+
+        def keep(word: str) -> bool:
+            return word.isalpha() and word == word.lower() and bool(variants.lookup(word))
+
+        try:
+            start_time = time.time()
+            words, vectors = load_word_vectors(vectors_path, keep)
+            cache_file = neighbour_cache_path(vectors_path, token_handler.encoding_name, token_handler.cache_dir)
+            _index = SemanticIndex(words, vectors, cache_file=cache_file)
+            load_time = time.time() - start_time
+            logger.info("Semantic index over %d words ready in %.2f seconds", len(_index), load_time)
+            index = _index
+            atexit.register(index.save_if_changed)
+            get_cache_registry().register(
+                "semantic_index", lambda: {'entries': len(index), 'cached_neighbours': len(index._neighbours)},
+                measure=lambda: index.vectors.nbytes + approx_bytes(index._neighbours), load_time=load_time
+            )
+        except (OSError, ValueError) as e:
+            logger.error("Could not load word vectors from %s: %s", vectors_path, e)
+            _index = None
+        return _index
@@ -11,13 +11,20 @@ from werkzeug.security import generate_password_hash, check_password_hash
 
 # Import our game modules
 from game_logic import GameLogic
-from token_handler import TokenHandler
+from game_state import GameState
+from token_handler import get_token_handler
+from token_space_api import make_token_space_blueprint
 
 app = Flask(__name__)
 app.secret_key = 'token-quest-secret-change-in-production'
 
 # Initialize game components
-token_handler = TokenHandler()
+token_handler = get_token_handler()
+app.register_blueprint(make_token_space_blueprint(token_handler))
+
+# Speed-mode rounds: each request rebuilds the game from the session, so the
+# round's stored deadline decides expiry (GameLogic.check_round_expired), not
+# a timer armed on the throwaway GameLogic of whichever worker started it
 
 # Simple database functions
 def init_db():
@@ -110,6 +117,22 @@ def update_user_stats(user_id, score):
     conn.commit()
     conn.close()
 
+# Game state is kept in the session in GameState's compact form
+def load_game():
+    """Rebuild the session's game, or None if there is none (or it is unreadable)."""
+    data = session.get('game')
+    if not data:
+        return None
+    try:
+        return GameLogic.from_state(GameState.from_dict(data))
+    except (KeyError, TypeError, ValueError):
+        session.pop('game', None)
+        return None
+
+def save_game(game):
+    """Store a game in the session."""
+    session['game'] = game.to_state().to_dict()
+
 # Routes
 @app.route('/')
 def index():
@@ -173,39 +196,30 @@ def api_start_game():
         difficulty = data.get('difficulty', 'medium')
         game_mode = data.get('game_mode', 'classic')
         max_rounds = data.get('max_rounds', 10)
+        seed = data.get('seed')  # optional: replay a known session
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            return jsonify({'success': False, 'error': 'seed must be an integer'}), 400
         
-        # Initialize game
-        game = GameLogic(game_mode=game_mode, difficulty=difficulty)
+        # Continue the session's game if the settings match, otherwise start fresh
+        game = load_game()
+        if game is None or game.game_completed or \
+                (game.difficulty, game.game_mode, game.max_rounds) != (difficulty, game_mode, max_rounds) or \
+                (seed is not None and seed != game.seed):
+            game = GameLogic(max_rounds=max_rounds, game_mode=game_mode, difficulty=difficulty, seed=seed)
         round_info = game.start_new_round()
+        if round_info.get('game_ended'):
+            # The last round was already played - start a new game
+            game = GameLogic(max_rounds=max_rounds, game_mode=game_mode, difficulty=difficulty, seed=seed)
+            round_info = game.start_new_round()
         
         if 'error' in round_info:
             return jsonify({'success': False, 'error': round_info['error']}), 400
         
         target_word = round_info['target_word']
         target_token_id = round_info['target_token_id']
-        
-        # Check if we're continuing an existing game or starting fresh
-        existing_game_state = session.get('game_state')
-        if existing_game_state and existing_game_state.get('difficulty') == difficulty and existing_game_state.get('game_mode') == game_mode and existing_game_state.get('max_rounds') == max_rounds:
-            # Continue existing game - keep the score and increment round
-            current_score = existing_game_state.get('score', 0)
-            current_round = existing_game_state.get('round_number', 1) + 1
-        else:
-            # New game - start fresh
-            current_score = 0
-            current_round = 1
-        
-        # Store game state in session
-        session['game_state'] = {
-            'target_word': target_word,
-            'target_token_id': target_token_id,
-            'attempts': 0,
-            'score': current_score,
-            'difficulty': difficulty,
-            'game_mode': game_mode,
-            'round_number': current_round,
-            'max_rounds': max_rounds
-        }
+        current_score = game.score
+        current_round = game.round_number
+        save_game(game)
         
         return jsonify({
             'success': True,
@@ -215,7 +229,9 @@ def api_start_game():
             'game_mode': game_mode,
             'current_score': current_score,
             'round_number': current_round,
-            'max_rounds': max_rounds
+            'max_rounds': max_rounds,
+            'seed': game.seed,
+            'time_limit': round_info.get('time_limit')
         })
     
     except Exception as e:
@@ -233,32 +249,22 @@ def api_make_guess():
         if not guess_word:
             return jsonify({'success': False, 'error': 'No word provided'}), 400
         
-        # Get game state
-        game_state = session.get('game_state')
-        if not game_state:
+        # Restore the game
+        game = load_game()
+        if game is None:
             return jsonify({'success': False, 'error': 'No active game'}), 400
         
-        # Create a temporary game object to process the guess
-        game = GameLogic(game_mode=game_state['game_mode'], difficulty=game_state['difficulty'])
-        game.current_target_word = game_state['target_word']
-        game.current_target_token_id = game_state['target_token_id']
-        game.score = game_state['score']
-        game.current_attempts = game_state['attempts']
-        
-        # Process guess using GameLogic
+        # Process guess using GameLogic (invalid guesses use up an attempt too)
         result = game.submit_guess(guess_word)
+        save_game(game)
         
         if not result.get('valid_guess', True):
             return jsonify({
                 'success': False,
-                'error': result.get('error', 'Invalid guess')
+                'error': result.get('error', 'Invalid guess'),
+                'time_expired': result.get('time_expired', False)
             }), 400
         
-        # Update game state
-        game_state['attempts'] = result['attempts_used']
-        game_state['score'] = result['total_score']
-        session['game_state'] = game_state
-        
         # Extract result data
         guess_token_id = result['guess_token_id']
         distance = result['distance']
@@ -270,11 +276,11 @@ def api_make_guess():
             'success': True,
             'guess_word': guess_word,
             'guess_token_id': guess_token_id,
-            'target_token_id': game_state['target_token_id'],
+            'target_token_id': game.current_target_token_id,
             'distance': distance,
             'score': score,
             'total_score': total_score,
-            'attempts': game_state['attempts'],
+            'attempts': result['attempts_used'],
             'is_correct': is_correct,
             'feedback': result['feedback'],
             'educational_explanation': result['educational_explanation'],
@@ -284,14 +290,31 @@ def api_make_guess():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/round_status')
+def api_round_status():
+    """Server-side clock of the current round (ask when the client's countdown ends)."""
+    game = load_game()
+    if game is None:
+        return jsonify({'success': False, 'error': 'No active game'}), 400
+    
+    expired = game.check_round_expired()
+    save_game(game)
+    return jsonify({
+        'success': True,
+        'round_number': game.round_number,
+        'time_limit': game.time_limit,
+        'time_remaining': game.time_remaining(),
+        'expired': expired
+    })
+
 @app.route('/api/get_hints', methods=['POST'])
 def api_get_hints():
     """Get hints for the current target word."""
     # Allow guest play - no login required
     
     try:
-        game_state = session.get('game_state')
-        if not game_state:
+        game = load_game()
+        if game is None:
             return jsonify({'success': False, 'error': 'No active game'}), 400
         
         # Simple hints for now
@@ -305,7 +328,7 @@ def api_get_hints():
         return jsonify({
             'success': True,
             'hints': hints,
-            'target_token_id': game_state['target_token_id']
+            'target_token_id': game.current_target_token_id
         })
     
     except Exception as e:
@@ -315,25 +338,25 @@ def api_get_hints():
 def api_end_game():
     """End the current game session."""
     try:
-        game_state = session.get('game_state')
+        game = load_game()
         
         # Only save to database if user is logged in
-        if game_state and 'user_id' in session:
+        if game is not None and 'user_id' in session:
             # Update user statistics
-            update_user_stats(session['user_id'], game_state['score'])
+            update_user_stats(session['user_id'], game.score)
             
             # Save game session to database
             conn = sqlite3.connect('token_quest.db')
             cursor = conn.cursor()
             cursor.execute(
                 'INSERT INTO game_sessions (user_id, score, difficulty, game_mode, completed_at) VALUES (?, ?, ?, ?, ?)',
-                (session['user_id'], game_state['score'], game_state['difficulty'], game_state['game_mode'], datetime.now())
+                (session['user_id'], game.score, game.difficulty, game.game_mode, datetime.now())
             )
             conn.commit()
             conn.close()
         
         # Clear session
-        session.pop('game_state', None)
+        session.pop('game', None)
         
         return jsonify({'success': True})
     
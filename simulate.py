@@ -0,0 +1,207 @@
+"""
+Token Quest game simulator
+Headless load harness for the GameLogic engine
+
+Plays many games concurrently (threads or processes) with a pluggable guess
+strategy and reports, per operation (start_new_round, get_hint,
+submit_guess), throughput and latency percentiles.  With ``--allocations`` a
+separate single-threaded pass measures memory per operation with tracemalloc:
+peak bytes allocated while it runs and blocks still allocated afterwards.
+
+    python simulate.py --games 2000 --workers 8 --strategy oracle
+    python simulate.py --games 500 --processes --strategy semantic --allocations
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from game_logic import GameLogic
+
+OPERATIONS = ('start_new_round', 'get_hint', 'submit_guess')
+
+
+# ─────────────────────────────────────────────
+# Guess strategies: (game, rng, hint or None) -> guess word
+# ─────────────────────────────────────────────
+
+def random_word_strategy(game: GameLogic, rng: random.Random, hint: Optional[Dict]) -> str:
+    """Any word-like token from the vocabulary."""
+    words = game.token_handler.word_index.words
+    return words[rng.randrange(len(words))].strip().lower()
+
+
+def semantic_hint_strategy(game: GameLogic, rng: random.Random, hint: Optional[Dict]) -> str:
+    """A semantic hint for the target if there is one, else a token-range hint."""
+    if hint:
+        candidates = hint.get('semantic_hints') or hint.get('token_hints')
+        if candidates:
+            return rng.choice(candidates).strip().lower()
+    return random_word_strategy(game, rng, hint)
+
+
+def nearest_token_strategy(game: GameLogic, rng: random.Random, hint: Optional[Dict]) -> str:
+    """The closest other word-like token to the target (an id-aware oracle)."""
+    nearest = game.token_handler.word_index.nearest(game.current_target_token_id, k=1)
+    return nearest[0][0].strip().lower() if nearest else random_word_strategy(game, rng, hint)
+
+
+STRATEGIES: Dict[str, Callable[[GameLogic, random.Random, Optional[Dict]], str]] = {
+    'random': random_word_strategy,
+    'semantic': semantic_hint_strategy,
+    'oracle': nearest_token_strategy
+}
+
+
+# ─────────────────────────────────────────────
+# Playing
+# ─────────────────────────────────────────────
+
+def play_games(n_games: int, strategy: str, seed: int, rounds: int = 10,
+               hint_rate: float = 0.5) -> Dict[str, List[float]]:
+    """Play ``n_games`` full games; returns per-operation latencies in seconds."""
+    choose = STRATEGIES[strategy]
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = {operation: [] for operation in OPERATIONS}
+    clock = time.perf_counter
+
+    for _ in range(n_games):
+        game = GameLogic(max_rounds=rounds, seed=rng.randrange(2 ** 32))
+        while True:
+            start = clock()
+            round_info = game.start_new_round()
+            latencies['start_new_round'].append(clock() - start)
+            if round_info.get('game_ended') or 'error' in round_info:
+                break
+
+            hint = None
+            if rng.random() < hint_rate:
+                start = clock()
+                hint = game.get_hint()
+                latencies['get_hint'].append(clock() - start)
+
+            while game.current_attempts < game.max_attempts:
+                guess = choose(game, rng, hint)
+                start = clock()
+                result = game.submit_guess(guess)
+                latencies['submit_guess'].append(clock() - start)
+                if result.get('feedback', {}).get('is_correct'):
+                    break
+    return latencies
+
+
+def _play_chunk(args) -> Dict[str, List[float]]:
+    return play_games(*args)
+
+
+def run(n_games: int, workers: int, strategy: str, processes: bool = False, seed: int = 0,
+        rounds: int = 10, hint_rate: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """Spread the games over workers and summarize every operation (ops/s is over wall time)."""
+    # Warm shared state (encoder, word catalog, indexes) outside the timing
+    play_games(1, strategy, seed, rounds=1, hint_rate=1.0)
+
+    chunks = [(n_games // workers + (1 if worker < n_games % workers else 0), strategy, seed + worker + 1,
+               rounds, hint_rate) for worker in range(workers)]
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    start_time = time.perf_counter()
+    with pool_class(max_workers=workers) as pool:
+        results = list(pool.map(_play_chunk, chunks))
+    elapsed = time.perf_counter() - start_time
+
+    summary = {}
+    for operation in OPERATIONS:
+        samples = sorted(latency for result in results for latency in result[operation])
+        summary[operation] = summarize(samples, elapsed)
+    summary['all'] = summarize(sorted(latency for result in results for samples in result.values()
+                                      for latency in samples), elapsed)
+    return summary
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """Count, throughput and latency percentiles (in microseconds)."""
+    if not samples:
+        return {'count': 0, 'per_second': 0.0, 'p50_us': 0.0, 'p90_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0}
+
+    def percentile(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1e6
+
+    return {
+        'count': len(samples),
+        'per_second': len(samples) / elapsed if elapsed > 0 else float('inf'),
+        'p50_us': percentile(0.50),
+        'p90_us': percentile(0.90),
+        'p99_us': percentile(0.99),
+        'max_us': samples[-1] * 1e6
+    }
+
+
+def measure_allocations(strategy: str, n_rounds: int = 200, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Average peak bytes and retained blocks per operation (single-threaded, tracemalloc)."""
+    choose = STRATEGIES[strategy]
+    rng = random.Random(seed)
+    play_games(1, strategy, seed, rounds=1, hint_rate=1.0)  # warm shared state first
+    totals = {operation: [0, 0, 0] for operation in OPERATIONS}  # calls, peak bytes, blocks
+
+    def measured(operation: str, call: Callable[[], Dict]) -> Dict:
+        blocks_before = sys.getallocatedblocks()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = call()
+        _, peak = tracemalloc.get_traced_memory()
+        totals[operation][0] += 1
+        totals[operation][1] += peak - current
+        totals[operation][2] += sys.getallocatedblocks() - blocks_before
+        return result
+
+    tracemalloc.start()
+    try:
+        game = GameLogic(max_rounds=n_rounds, seed=seed)
+        for _ in range(n_rounds):
+            measured('start_new_round', game.start_new_round)
+            hint = measured('get_hint', game.get_hint)
+            while game.current_attempts < game.max_attempts:
+                guess = choose(game, rng, hint)
+                measured('submit_guess', lambda: game.submit_guess(guess))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        operation: {
+            'peak_bytes': peak / calls if calls else 0.0,
+            'retained_blocks': blocks / calls if calls else 0.0
+        }
+        for operation, (calls, peak, blocks) in totals.items()
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Headless load test of the Token Quest game engine")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--rounds", type=int, default=10, help="rounds per game")
+    parser.add_argument("--hint-rate", type=float, default=0.5, help="fraction of rounds that ask for a hint")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--allocations", action="store_true", help="also measure memory per operation")
+    args = parser.parse_args(argv)
+
+    print(f"Simulating {args.games} games x {args.rounds} rounds, strategy={args.strategy}, "
+          f"{args.workers} {'processes' if args.processes else 'threads'}")
+    summary = run(args.games, args.workers, args.strategy, args.processes, args.seed, args.rounds, args.hint_rate)
+    print(f"  {'operation':<16} {'count':>9} {'ops/s':>11} {'p50 µs':>9} {'p90 µs':>9} {'p99 µs':>9} {'max µs':>10}")
+    for operation, stats in summary.items():
+        print(f"  {operation:<16} {stats['count']:>9,} {stats['per_second']:>11,.0f} {stats['p50_us']:>9.1f} "
+              f"{stats['p90_us']:>9.1f} {stats['p99_us']:>9.1f} {stats['max_us']:>10.1f}")
+
+    if args.allocations:
+        print("Memory per operation (single thread, tracemalloc)")
+        for operation, stats in measure_allocations(args.strategy, seed=args.seed).items():
+            print(f"  {operation:<16} peak {stats['peak_bytes']:>10,.0f} B   retained {stats['retained_blocks']:>7.1f} blocks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Target Scheduler Module
+No-repeat, skill-adaptive target word selection for Token Quest
+
+Each game session owns a small TargetScheduler.  Target words are dealt from
+one deck per difficulty tier: a deck is a keyed pseudo-random permutation of
+the tier's word list (a Feistel network with cycle walking), so a word never
+repeats until its whole tier has been dealt, and the session only stores how
+many cards it has drawn - no shuffled copy of a 100k-word list per session.
+
+With 'mixed' difficulty the tier of every round is drawn from an alias table
+whose weights follow the player's running accuracy in each tier: tiers near
+TARGET_ACCURACY are preferred, tiers that are far too easy or too hard fade
+out (never below MIN_WEIGHT).  Selecting a target is O(1) - one alias draw
+plus an expected constant number of Feistel evaluations - and the whole
+scheduler state is a dozen integers that round-trip through GameState.
+"""
+import math
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from word_catalog import DIFFICULTIES, WordCatalog
+
+TIERS = DIFFICULTIES
+ANY_TIER = len(TIERS)  # deck index used when no tier has words (catalog fallback list)
+
+TARGET_ACCURACY = 0.6  # round success rate the adaptive weights aim for
+ACCURACY_WIDTH = 0.25  # how quickly a tier fades as its accuracy moves away from the target
+MIN_WEIGHT = 0.05
+
+_MASK64 = (1 << 64) - 1
+_FEISTEL_ROUNDS = 4
+
+
+# ─────────────────────────────────────────────
+# Sampling primitives
+# ─────────────────────────────────────────────
+
+def normalize_seed(seed) -> int:
+    """A session seed as an unsigned 64-bit integer (ValueError/TypeError if it is not a number)."""
+    return int(seed) & _MASK64
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer: a fast, well-distributed 64-bit hash of an integer."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def permute_index(index: int, size: int, key: int) -> int:
+    """Element ``index`` of a keyed pseudo-random permutation of range(size).
+
+    A balanced Feistel network permutes the smallest even-bit domain that
+    holds ``size``; values outside range(size) are walked through the network
+    again (at most ~4 steps expected).
+    """
+    if size <= 1:
+        return 0
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    half_mask = (1 << half_bits) - 1
+    while True:
+        left, right = index >> half_bits, index & half_mask
+        for round_number in range(_FEISTEL_ROUNDS):
+            left, right = right, left ^ (_mix64((key + round_number * 0x9E3779B97F4A7C15 + right) & _MASK64)
+                                         & half_mask)
+        index = (left << half_bits) | right
+        if index < size:
+            return index
+
+
+class AliasTable:
+    """Vose alias table: O(n) to build, O(1) to sample an index with the given weights."""
+
+    __slots__ = ('probabilities', 'aliases')
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+        scaled = [weight * n / total for weight in weights]
+        self.probabilities = [1.0] * n
+        self.aliases = list(range(n))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probabilities[low] = scaled[low]
+            self.aliases[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Leftovers are 1.0 up to rounding error
+
+    def sample(self, rng) -> int:
+        """One weighted index (a single rng.random() call)."""
+        position = rng.random() * len(self.probabilities)
+        index = int(position)
+        return index if position - index < self.probabilities[index] else self.aliases[index]
+
+
+# ─────────────────────────────────────────────
+# Scheduler
+# ─────────────────────────────────────────────
+
+def tier_weight(rounds: int, correct: int) -> float:
+    """Weight of a tier from the player's (smoothed) success rate in it."""
+    accuracy = (correct + 1) / (rounds + 2)  # unplayed tiers count as 50%
+    return MIN_WEIGHT + math.exp(-((accuracy - TARGET_ACCURACY) / ACCURACY_WIDTH) ** 2)
+
+
+class TargetScheduler:
+    """Per-session target dealer (see the module docstring)."""
+
+    __slots__ = ('category', 'difficulty', 'seed', 'drawn', 'rounds', 'correct', 'last_tier',
+                 'correct_before', '_decks', '_alias', '_deck_keys')
+
+    def __init__(self, catalog: WordCatalog, category: str = 'all', difficulty: str = 'mixed',
+                 seed: int = 0, state: Optional[Sequence[int]] = None):
+        self.category = category
+        self.difficulty = difficulty
+        self.seed = normalize_seed(seed)
+        self.drawn = [0] * (len(TIERS) + 1)   # cards dealt per deck (tiers + fallback deck)
+        self.rounds = [0] * len(TIERS)        # finished rounds per tier
+        self.correct = [0] * len(TIERS)       # won rounds per tier
+        self.last_tier: Optional[int] = None  # tier of the round in progress
+        self.correct_before = 0               # GameLogic.correct_guesses when that round started
+        if state is not None:
+            self.load_state(state)
+
+        # (tier index, words) for every deck this session can deal from
+        tiers = TIERS if difficulty not in TIERS else (difficulty,)
+        self._decks: List[Tuple[int, Tuple[str, ...]]] = [
+            (TIERS.index(tier), words) for tier in tiers
+            for words in (catalog.tier_words(category, tier),) if words
+        ]
+        if not self._decks:
+            self._decks = [(ANY_TIER, catalog.words_for(category, difficulty))]
+        self._deck_keys: Dict[int, int] = {}
+        self._alias: Optional[AliasTable] = None
+
+    # ─────────────────────────────────────────────
+    # Dealing
+    # ─────────────────────────────────────────────
+
+    def tier_weights(self) -> Dict[str, float]:
+        """Current selection probability of each tier this session deals from."""
+        weights = self._weights()
+        total = sum(weights)
+        return {TIERS[tier] if tier < len(TIERS) else 'any': weight / total
+                for (tier, _), weight in zip(self._decks, weights)}
+
+    def _weights(self) -> List[float]:
+        return [tier_weight(self.rounds[tier], self.correct[tier]) if tier < len(TIERS) else 1.0
+                for tier, _ in self._decks]
+
+    def finish_round(self, correct_guesses: int):
+        """Record whether the round in progress was won (GameLogic's running correct count)."""
+        if self.last_tier is None:
+            return
+        if self.last_tier < len(TIERS):
+            self.rounds[self.last_tier] += 1
+            self.correct[self.last_tier] += correct_guesses > self.correct_before
+            self._alias = None  # weights changed
+        self.last_tier = None
+
+    def next_target(self, rng, correct_guesses: int) -> Tuple[str, str]:
+        """Deal the next target as (word, tier); ``rng`` drives the tier choice."""
+        self.finish_round(correct_guesses)
+        if len(self._decks) == 1:
+            deck = 0
+        else:
+            if self._alias is None:
+                self._alias = AliasTable(self._weights())
+            deck = self._alias.sample(rng)
+        tier, words = self._decks[deck]
+
+        # The n-th card of pass p is position n % size of that pass's permutation
+        card = self.drawn[tier]
+        self.drawn[tier] += 1
+        word = words[permute_index(card % len(words), len(words), self._deck_key(tier, card // len(words)))]
+
+        self.last_tier = tier
+        self.correct_before = correct_guesses
+        return word, self.current_tier
+
+    @property
+    def current_tier(self) -> Optional[str]:
+        """Difficulty tier of the round in progress."""
+        if self.last_tier is None:
+            return None
+        return TIERS[self.last_tier] if self.last_tier < len(TIERS) else self.difficulty
+
+    def _deck_key(self, tier: int, deal_pass: int) -> int:
+        base = self._deck_keys.get(tier)
+        if base is None:
+            base = self._deck_keys[tier] = _mix64(
+                (self.seed * 0x100000001B3 + zlib.crc32(f"{self.category}:{tier}".encode("utf-8"))) & _MASK64
+            )
+        return _mix64(base ^ deal_pass)
+
+    def reseed(self, seed: int):
+        """Fresh decks for a new game; the player's accuracy statistics are kept."""
+        self.seed = normalize_seed(seed)
+        self.drawn = [0] * (len(TIERS) + 1)
+        self.last_tier = None
+        self.correct_before = 0
+        self._deck_keys = {}
+
+    def accuracy(self) -> Dict[str, Optional[float]]:
+        """Raw success rate per tier (None for unplayed tiers)."""
+        return {tier: self.correct[i] / self.rounds[i] if self.rounds[i] else None for i, tier in enumerate(TIERS)}
+
+    # ─────────────────────────────────────────────
+    # State
+    # ─────────────────────────────────────────────
+
+    def to_state(self) -> List[int]:
+        """Compact integer list for GameState (decks are rebuilt from the seed)."""
+        return [*self.drawn, *self.rounds, *self.correct,
+                -1 if self.last_tier is None else self.last_tier, self.correct_before]
+
+    def load_state(self, state: Sequence[int]):
+        n = len(TIERS)
+        self.drawn = list(state[:n + 1])
+        self.rounds = list(state[n + 1:2 * n + 1])
+        self.correct = list(state[2 * n + 1:3 * n + 1])
+        last_tier = state[3 * n + 1]
+        self.last_tier = None if last_tier < 0 else last_tier
+        self.correct_before = state[3 * n + 2]
+        self._alias = None
@@ -0,0 +1,106 @@
+"""ARC cache: hits, eviction, ghost-list adaptation and resizing."""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bounded_cache import ARCCache, make_cache  # noqa: E402
+
+
+def assert_arc_invariants(cache: ARCCache):
+    capacity = cache.maxsize
+    assert len(cache._t1) + len(cache._t2) <= capacity
+    assert len(cache._t1) + len(cache._b1) <= capacity
+    assert len(cache._t1) + len(cache._t2) + len(cache._b1) + len(cache._b2) <= 2 * capacity
+    assert 0 <= cache._p <= capacity
+    resident = set(cache._t1) | set(cache._t2)
+    assert not resident & (set(cache._b1) | set(cache._b2))
+
+
+def test_hits_misses_and_evictions_are_counted():
+    cache = make_cache('arc', 2)
+    assert isinstance(cache, ARCCache)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    assert cache.get('a') == 1
+    assert cache.get('missing', 'default') == 'default'
+    cache.put('c', 3)  # full: evicts the once-seen 'b', not the re-used 'a'
+
+    assert 'a' in cache and 'b' not in cache and 'c' in cache
+    stats = cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses'], stats['evictions']) == (2, 1, 1, 1)
+
+
+def test_scan_does_not_flush_frequently_used_keys():
+    cache = ARCCache(10)
+    hot = [f"hot{i}" for i in range(5)]
+    for key in hot:
+        cache.put(key, key)
+        cache.get(key)  # second access promotes to the frequency list
+
+    for i in range(1000):
+        cache.put(f"scan{i}", i)
+
+    assert all(key in cache for key in hot)
+    assert len(cache) == 10
+    assert_arc_invariants(cache)
+
+
+def test_ghost_hit_readmits_key_as_frequent():
+    cache = ARCCache(3)
+    for key in 'abc':
+        cache.put(key, key)
+    cache.get('c')
+    cache.put('d', 'd')  # evicts the oldest once-seen key into the recency ghosts
+    assert 'a' not in cache and 'a' in cache._b1
+
+    cache.put('a', 'again')
+    assert cache.get('a') == 'again'
+    assert 'a' in cache._t2
+    assert cache._p > 0  # a recency ghost hit grows the recency target
+    assert_arc_invariants(cache)
+
+
+def test_invariants_hold_under_random_workload():
+    rng = random.Random(11)
+    cache = ARCCache(50)
+    for _ in range(20000):
+        key = int(rng.paretovariate(1.2)) if rng.random() < 0.7 else rng.randrange(2000)
+        if cache.get(key) is None:
+            cache.put(key, key)
+        assert_arc_invariants(cache)
+    assert cache.stats()['hit_rate'] > 0.3
+
+
+def test_resize_shrinks_to_capacity_and_can_grow_again():
+    cache = ARCCache(20)
+    for i in range(20):
+        cache.put(i, i)
+        if i % 2:
+            cache.get(i)
+
+    cache.resize(5)
+    assert len(cache) == 5
+    assert cache.stats()['evictions'] == 15
+    assert_arc_invariants(cache)
+    survivors = dict(cache.items())
+    assert all(value == key for key, value in survivors.items())
+
+    cache.resize(30)
+    for i in range(100, 125):
+        cache.put(i, i)
+    assert len(cache) == 30
+    assert_arc_invariants(cache)
+
+    with pytest.raises(ValueError):
+        cache.resize(0)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        make_cache('fifo', 10)
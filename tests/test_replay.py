@@ -0,0 +1,43 @@
+"""Replay engine against rows of the repo's own guess logs."""
+import csv
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from replay import normalize_record, replay  # noqa: E402
+
+RESEARCH_CSV = ROOT / "Token data from token game" / "detailed_guesses_20250611.csv"
+SESSION_JSON = ROOT / "game_data" / "session_20250608_211732.json"
+
+
+def test_research_row_without_target_uses_logged_distance():
+    with open(RESEARCH_CSV, 'r', encoding='utf-8', newline='') as f:
+        raw = next(csv.DictReader(f))
+    assert raw['target_word'] == '' and raw['target_token_id'] == '0'
+
+    record = normalize_record(raw, RESEARCH_CSV.name)
+    assert record is not None
+    assert record['distance'] == 90734
+    assert record['logged_points'] == 0
+
+
+def test_session_row_reads_round_score():
+    with open(SESSION_JSON, 'r', encoding='utf-8') as f:
+        raw = next(guess for guess in json.load(f)['guesses'] if guess['guess_word'] == 'nice')
+
+    record = normalize_record(raw, SESSION_JSON.name)
+    assert record['distance'] == 19169
+    assert record['logged_points'] == raw['round_score'] == 7
+
+
+def test_replay_reports_changed_session_points():
+    changed = []
+    report = replay([str(SESSION_JSON)], on_diff=changed.append)
+
+    assert report['skipped'] == 0
+    assert report['totals']['records'] == 3
+    assert report['totals']['changed_points'] == 3
+    assert (changed[0]['guess_word'], changed[0]['logged_points'], changed[0]['points']) == ('nice', 7, 0)
@@ -0,0 +1,85 @@
+"""Target scheduler: no-repeat decks and state round-trips."""
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from target_scheduler import TIERS, TargetScheduler, permute_index  # noqa: E402
+
+WORDS = {
+    'easy': tuple(f"easy{i}" for i in range(37)),
+    'medium': tuple(f"medium{i}" for i in range(20)),
+    'hard': tuple(f"hard{i}" for i in range(5)),
+}
+
+
+class StubCatalog:
+    """The two WordCatalog look-ups the scheduler uses."""
+
+    def tier_words(self, category, tier):
+        return WORDS[tier]
+
+    def words_for(self, category, difficulty):
+        return tuple(word for tier in TIERS for word in WORDS[tier])
+
+
+def test_permutation_covers_every_index_once():
+    for size in (1, 2, 3, 37, 100, 1000):
+        assert sorted(permute_index(i, size, key=12345) for i in range(size)) == list(range(size))
+
+
+def test_one_pass_deals_every_word_once():
+    scheduler = TargetScheduler(StubCatalog(), difficulty='easy', seed=7)
+    rng = random.Random(0)
+    dealt = [scheduler.next_target(rng, 0)[0] for _ in WORDS['easy']]
+
+    assert sorted(dealt) == sorted(WORDS['easy'])
+    # The second pass is a fresh permutation of the same deck
+    second = [scheduler.next_target(rng, 0)[0] for _ in WORDS['easy']]
+    assert sorted(second) == sorted(WORDS['easy'])
+
+
+def test_mixed_decks_never_repeat_within_a_pass():
+    scheduler = TargetScheduler(StubCatalog(), difficulty='mixed', seed=99)
+    rng = random.Random(1)
+    dealt = {tier: [] for tier in TIERS}
+    for _ in range(200):
+        word, tier = scheduler.next_target(rng, 0)
+        dealt[tier].append(word)
+
+    for tier, words in dealt.items():
+        size = len(WORDS[tier])
+        for start in range(0, len(words) - size + 1, size):
+            assert sorted(words[start:start + size]) == sorted(WORDS[tier])
+
+
+def test_state_round_trip_continues_the_same_deal():
+    scheduler = TargetScheduler(StubCatalog(), difficulty='mixed', seed=2024)
+    rng = random.Random(5)
+    for correct in range(30):
+        scheduler.next_target(rng, correct // 2)
+
+    state = scheduler.to_state()
+    restored = TargetScheduler(StubCatalog(), difficulty='mixed', seed=2024, state=state)
+    assert restored.to_state() == state
+    assert restored.current_tier == scheduler.current_tier
+
+    rng_state = rng.getstate()
+    original_rng, restored_rng = random.Random(), random.Random()
+    original_rng.setstate(rng_state)
+    restored_rng.setstate(rng_state)
+    assert [scheduler.next_target(original_rng, 20) for _ in range(40)] == \
+        [restored.next_target(restored_rng, 20) for _ in range(40)]
+
+
+def test_reseed_deals_a_different_order_but_keeps_accuracy():
+    scheduler = TargetScheduler(StubCatalog(), difficulty='easy', seed=1)
+    rng = random.Random(0)
+    first = [scheduler.next_target(rng, i) for i in range(10)]
+    accuracy = scheduler.accuracy()
+
+    scheduler.reseed(2)
+    assert scheduler.accuracy() == accuracy
+    assert [scheduler.next_target(rng, 10) for _ in range(10)] != first
@@ -0,0 +1,95 @@
+"""Timer wheel: deadlines, level cascades and cancellation on a fake clock."""
+import math
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from timer_wheel import WHEEL_SIZE, TimerWheel  # noqa: E402
+
+
+def make_wheel():
+    now = [0.0]
+    return TimerWheel(tick=1.0, clock=lambda: now[0]), now
+
+
+def test_timer_fires_at_its_deadline_not_before():
+    wheel, now = make_wheel()
+    fired = []
+    timer = wheel.schedule(10.5, fired.append, 'round')
+
+    assert wheel.advance(10.4) == 0 and timer.active
+    assert wheel.advance(10.99) == 0
+    assert wheel.advance(11.0) == 1
+    assert fired == ['round'] and not timer.active
+
+
+def test_deadlines_hold_across_level_cascades():
+    wheel, now = make_wheel()
+    rng = random.Random(3)
+    # Level 0, level 1 (>= WHEEL_SIZE ticks) and level 2 (>= WHEEL_SIZE**2 ticks)
+    deadlines = [rng.uniform(0, 3 * WHEEL_SIZE ** 2) for _ in range(500)]
+    deadlines += [WHEEL_SIZE - 0.5, WHEEL_SIZE, WHEEL_SIZE + 0.5, WHEEL_SIZE ** 2, WHEEL_SIZE ** 2 + 1.25]
+    fired_at = {}
+    for index, deadline in enumerate(deadlines):
+        wheel.schedule_at(deadline, lambda i: fired_at.setdefault(i, now[0]), index)
+
+    while now[0] < 3 * WHEEL_SIZE ** 2 + 2:
+        now[0] += rng.uniform(0.1, 700.0)
+        wheel.advance()
+        for index, deadline in enumerate(deadlines):
+            if index in fired_at:
+                assert fired_at[index] >= deadline
+            else:
+                assert math.ceil(deadline) > math.floor(now[0])
+
+    assert len(fired_at) == len(deadlines)
+    assert wheel.stats()['pending'] == 0
+
+
+def test_each_timer_fires_within_one_tick_of_its_deadline():
+    wheel, now = make_wheel()
+    fired_at = {}
+    deadlines = [0.5, 255.5, 256.0, 511.75, 65535.5, 65536.0, 70000.25]
+    for deadline in deadlines:
+        wheel.schedule_at(deadline, lambda d: fired_at.setdefault(d, now[0]), deadline)
+
+    while now[0] < 70002:
+        now[0] += 0.25
+        wheel.advance()
+
+    for deadline in deadlines:
+        assert deadline <= fired_at[deadline] <= deadline + wheel.tick
+
+
+def test_cancelled_timer_never_fires():
+    wheel, now = make_wheel()
+    fired = []
+    kept = wheel.schedule(5, fired.append, 'kept')
+    dropped = wheel.schedule(5, fired.append, 'dropped')
+    far = wheel.schedule(WHEEL_SIZE * 3, fired.append, 'far')
+
+    assert dropped.cancel() is True
+    assert dropped.cancel() is False
+    assert far.cancel() is True
+    wheel.advance(WHEEL_SIZE * 4)
+
+    assert fired == ['kept'] and not kept.active
+    assert kept.cancel() is False
+    stats = wheel.stats()
+    assert (stats['pending'], stats['fired'], stats['cancelled']) == (0, 1, 2)
+
+
+def test_past_deadline_fires_on_the_next_tick():
+    wheel, now = make_wheel()
+    now[0] = 50.0
+    wheel.advance()
+    fired = []
+    wheel.schedule_at(10.0, fired.append, 'late')
+
+    assert wheel.advance() == 0  # tick 50 was already processed
+    now[0] = 51.0
+    assert wheel.advance() == 1
+    assert fired == ['late']
@@ -0,0 +1,201 @@
+"""
+Timer Wheel Module
+Hierarchical timing wheel for server-side round timers
+
+Speed-mode rounds of every session in the process share one TimerWheel.
+Timers are bucketed by their expiry tick into LEVELS wheels of WHEEL_SIZE
+slots each (level n slots span WHEEL_SIZE**n ticks); a tick fires one
+level-0 slot and, every WHEEL_SIZE ticks, cascades one slot of the level
+above down.  Scheduling and cancelling are O(1) and a tick costs O(1) plus
+the timers it fires, however many thousands of rounds are running.
+
+Time comes from ``time.monotonic`` so wall-clock jumps never fire or delay a
+round.  ``get_timer_wheel()`` returns the process-wide wheel, driven by a
+single daemon thread; callbacks run on that thread, outside the wheel's lock.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 0.05
+WHEEL_BITS = 8
+WHEEL_SIZE = 1 << WHEEL_BITS
+LEVELS = 4  # 2**32 ticks: years at 50 ms per tick
+
+
+class Timer:
+    """Handle of one scheduled callback (cancel it with ``cancel()``)."""
+
+    __slots__ = ('expires', 'callback', 'args', 'wheel', 'slot')
+
+    def __init__(self, expires: int, callback: Callable[..., Any], args: tuple, wheel: "TimerWheel"):
+        self.expires = expires  # absolute tick
+        self.callback = callback
+        self.args = args
+        self.wheel = wheel
+        self.slot: Optional[Set["Timer"]] = None  # bucket holding it, None once fired or cancelled
+
+    @property
+    def active(self) -> bool:
+        return self.slot is not None
+
+    def cancel(self) -> bool:
+        """Remove the timer; False if it already fired or was cancelled."""
+        return self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """Hierarchical timing wheel (see the module docstring)."""
+
+    def __init__(self, tick: float = TICK_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self._clock = clock
+        self._origin = clock()
+        self._next_tick = 0  # first tick not processed yet
+        self._wheels: List[List[Set[Timer]]] = [[set() for _ in range(WHEEL_SIZE)] for _ in range(LEVELS)]
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._fired = 0
+        self._cancelled = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _tick_at(self, when: float) -> int:
+        return math.ceil((when - self._origin) / self.tick)
+
+    # ─────────────────────────────────────────────
+    # Scheduling
+    # ─────────────────────────────────────────────
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> Timer:
+        """Call ``callback(*args)`` ``delay`` seconds from now (up to one tick late)."""
+        return self.schedule_at(self._clock() + delay, callback, *args)
+
+    def schedule_at(self, deadline: float, callback: Callable[..., Any], *args) -> Timer:
+        """Call ``callback(*args)`` at a monotonic-clock deadline."""
+        with self._lock:
+            timer = Timer(max(self._tick_at(deadline), self._next_tick), callback, args, self)
+            self._place(timer)
+            self._pending += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        with self._lock:
+            if timer.slot is None:
+                return False
+            timer.slot.discard(timer)
+            timer.slot = None
+            self._pending -= 1
+            self._cancelled += 1
+            return True
+
+    def _place(self, timer: Timer):
+        """Bucket a timer by how far its expiry is from the current tick (lock held)."""
+        delta = min(timer.expires - self._next_tick, (1 << (WHEEL_BITS * LEVELS)) - 1)
+        level = 0
+        while delta >> (WHEEL_BITS * (level + 1)):
+            level += 1
+        slot = self._wheels[level][(timer.expires >> (WHEEL_BITS * level)) & (WHEEL_SIZE - 1)]
+        slot.add(timer)
+        timer.slot = slot
+
+    # ─────────────────────────────────────────────
+    # Ticking
+    # ─────────────────────────────────────────────
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Process every tick up to ``now``; returns the number of callbacks fired."""
+        due: List[Timer] = []
+        with self._lock:
+            last_tick = int(((self._clock() if now is None else now) - self._origin) / self.tick)
+            while self._next_tick <= last_tick:
+                tick = self._next_tick
+                if tick and not tick & (WHEEL_SIZE - 1):
+                    self._cascade(tick)
+                slot = self._wheels[0][tick & (WHEEL_SIZE - 1)]
+                if slot:
+                    for timer in slot:
+                        timer.slot = None
+                    due.extend(slot)
+                    slot.clear()
+                self._next_tick += 1
+            self._pending -= len(due)
+            self._fired += len(due)
+
+        for timer in due:
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                logger.exception("Timer callback %r failed", timer.callback)
+        return len(due)
+
+    def _cascade(self, tick: int):
+        """Move the upper-level slots that start at ``tick`` down a level (lock held)."""
+        for level in range(1, LEVELS):
+            index = (tick >> (WHEEL_BITS * level)) & (WHEEL_SIZE - 1)
+            slot = self._wheels[level][index]
+            timers = list(slot)
+            slot.clear()
+            for timer in timers:
+                self._place(timer)
+            if index:
+                break
+
+    # ─────────────────────────────────────────────
+    # Driver thread
+    # ─────────────────────────────────────────────
+
+    def start(self):
+        """Tick from a daemon thread until ``stop()``."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.advance()
+            next_tick_time = self._origin + self._next_tick * self.tick
+            self._stop.wait(max(0.0, next_tick_time - self._clock()))
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'fired': self._fired,
+                'cancelled': self._cancelled,
+                'tick_seconds': self.tick,
+                'running': self._thread is not None
+            }
+
+
+# Process-wide wheel
+_wheel: Optional[TimerWheel] = None
+_wheel_lock = threading.Lock()
+
+
+def get_timer_wheel() -> TimerWheel:
+    """The shared, running wheel (started on first use)."""
+    global _wheel
+    if _wheel is not None:
+        return _wheel
+
+    with _wheel_lock:
+        if _wheel is None:
+            wheel = TimerWheel()
+            wheel.start()
+            _wheel = wheel
+            logger.info("Timer wheel started (%.0f ms ticks)", wheel.tick * 1000)
+        return _wheel
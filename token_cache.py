@@ -1,228 +1,524 @@
 """
 Token Cache System for Token Quest
 High-performance caching for token lookups and word mappings
+
+Entries are persisted incrementally in a SQLite store (see ``cache_store``):
+lookups fall through memory -> store -> encoder, and saving writes only the
+entries added since the last save.  The store file is shared by every worker
+process on the host, and new entries are written behind in small batches by
+a background writer thread (lookups never wait on the store) so a word
+encoded by one worker is a store hit for the others.
 """
-import tiktoken
+import atexit
 import json
-import os
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from pathlib import Path
 import logging
-from functools import lru_cache
 import threading
 import time
 
+from bounded_cache import LRUCache
+from cache_registry import approx_bytes, get_cache_registry, register_cache
+from cache_store import MISSING, SQLiteCacheStore
+from config import get_game_config
+from encoder_registry import get_encoder
+from vocab_table import get_vocab_table
+from word_index import get_word_index
+
 logger = logging.getLogger(__name__)
 
+# Store namespaces
+WORD_TO_TOKEN = "word_to_token"
+TOKEN_TO_WORD = "token_to_word"
+META = "meta"
+
+# Nearby-word lists (persisted only for warmed game targets)
+NEARBY_WORDS = "nearby_words"
+
+# Minimum number of staged entries before a new snapshot is published
+PUBLISH_BATCH = 256
+
+class _Flight:
+    """One in-progress miss that other threads can wait on."""
+    
+    __slots__ = ("done", "value")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
 class TokenCache:
-    """High-performance token cache with persistent storage."""
+    """High-performance token cache with persistent storage.
+    
+    Reads are lock-free: lookups hit immutable snapshot dicts.  New entries
+    are staged under a writer lock and published in batches by swapping in a
+    copied-and-extended snapshot, so readers never see a dict being mutated.
+    """
     
     def __init__(self, cache_dir: str = "cache", encoding_name: str = "o200k_base"):
+        start_time = time.time()
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         
         self.encoding_name = encoding_name
-        self.encoder = tiktoken.get_encoding(encoding_name)
+        self.encoder = get_encoder(encoding_name, cache_dir)
+        
+        # Persistent store
+        self.store = SQLiteCacheStore(self.cache_dir / f"token_cache_{encoding_name}.sqlite3")
         
-        # Cache files
+        # Legacy whole-file JSON caches (imported into the store once)
         self.word_to_token_file = self.cache_dir / f"word_to_token_{encoding_name}.json"
         self.token_to_word_file = self.cache_dir / f"token_to_word_{encoding_name}.json"
-        self.nearby_tokens_file = self.cache_dir / f"nearby_tokens_{encoding_name}.json"
         
-        # In-memory caches
-        self._word_to_token_cache: Dict[str, int] = {}
-        self._token_to_word_cache: Dict[int, str] = {}
-        self._nearby_tokens_cache: Dict[int, List[int]] = {}
+        # Published, never-mutated snapshots (filled lazily from the store)
+        self._snapshots: Dict[str, Dict] = self._empty_namespaces()
+        # Entries waiting for the next publish
+        self._staged: Dict[str, Dict] = self._empty_namespaces()
+        self._publishes = 0
         
-        # Thread safety
-        self._cache_lock = threading.RLock()
+        # Bounded LRU of filtered nearby-word lists, keyed by (token_id, range_size)
+        self._nearby_words_cache = LRUCache(get_game_config().max_cache_size)
         
-        # Load existing caches
+        # Entries not yet written to the store, per namespace
+        self._pending: Dict[str, Dict] = self._empty_namespaces()
+        self._last_save = time.monotonic()
+        
+        # Background writer for due saves, started on first use
+        self._save_requested = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        
+        # Writer lock (readers never take it for published entries)
+        self._cache_lock = threading.Lock()
+        
+        # Misses being computed, keyed by (namespace, key), and how many
+        # lookups waited on one instead of repeating it
+        self._in_flight: Dict[Tuple[str, Any], _Flight] = {}
+        self._coalesced = 0
+        
+        # Import legacy caches
         self._load_caches()
+        self._drop_decoded_word_mappings()
+        
+        register_cache(f"token_cache.nearby_words:{encoding_name}", self._nearby_words_cache)
+        get_cache_registry().register(
+            f"token_cache:{encoding_name}", self._memory_stats, self.clear_memory,
+            measure=lambda: approx_bytes(self._snapshots[WORD_TO_TOKEN]) + approx_bytes(self._snapshots[TOKEN_TO_WORD]),
+            load_time=time.time() - start_time
+        )
         
         logger.info("Token cache initialized with encoding: %s", encoding_name)
     
+    @staticmethod
+    def _empty_namespaces() -> Dict[str, Dict]:
+        return {WORD_TO_TOKEN: {}, TOKEN_TO_WORD: {}}
+    
     def _load_caches(self):
-        """Load caches from disk."""
+        """Import the legacy JSON cache files into the store (once)."""
+        legacy_files = {
+            WORD_TO_TOKEN: self.word_to_token_file,
+            TOKEN_TO_WORD: self.token_to_word_file
+        }
+        if self.store.get(META, "legacy_json_imported", False):
+            return
+        
         try:
-            if self.word_to_token_file.exists():
-                with open(self.word_to_token_file, 'r', encoding='utf-8') as f:
-                    self._word_to_token_cache = json.load(f)
-                logger.info("Loaded %d word-to-token mappings", len(self._word_to_token_cache))
-            
-            if self.token_to_word_file.exists():
-                with open(self.token_to_word_file, 'r', encoding='utf-8') as f:
-                    # Convert string keys back to integers
-                    data = json.load(f)
-                    self._token_to_word_cache = {int(k): v for k, v in data.items()}
-                logger.info("Loaded %d token-to-word mappings", len(self._token_to_word_cache))
-            
-            if self.nearby_tokens_file.exists():
-                with open(self.nearby_tokens_file, 'r', encoding='utf-8') as f:
-                    # Convert string keys back to integers
-                    data = json.load(f)
-                    self._nearby_tokens_cache = {int(k): v for k, v in data.items()}
-                logger.info("Loaded %d nearby token mappings", len(self._nearby_tokens_cache))
+            for namespace, path in legacy_files.items():
+                if path.exists():
+                    with open(path, 'r', encoding='utf-8') as f:
+                        count = self.store.put_many(namespace, json.load(f).items())
+                    logger.info("Imported %d %s mappings from %s", count, namespace, path.name)
+            self.store.put_many(META, [("legacy_json_imported", True)])
         
         except Exception as e:
-            logger.error("Error loading caches: %s", e, exc_info=True)
+            logger.error("Error importing legacy caches: %s", e, exc_info=True)
+    
+    def _drop_decoded_word_mappings(self):
+        """Clear word -> token rows written by older versions (once).
+        
+        They also stored every decoded text lowercased, so 'HAPPY' or ' happy'
+        could overwrite the encoder's id for 'happy'.
+        """
+        if self.store.get(META, "word_to_token_from_encode", False):
+            return
+        try:
+            self.store.clear([WORD_TO_TOKEN])
+            self.store.put_many(META, [("word_to_token_from_encode", True)])
+        except Exception as e:
+            logger.error("Error clearing stale word mappings: %s", e, exc_info=True)
     
     def _save_caches(self):
-        """Save caches to disk."""
+        """Write the entries added since the last save to the store."""
+        with self._cache_lock:
+            self._publish()
+            pending, self._pending = self._pending, self._empty_namespaces()
+            self._last_save = time.monotonic()
+        
         try:
-            with self._cache_lock:
-                # Save word-to-token cache
-                with open(self.word_to_token_file, 'w', encoding='utf-8') as f:
-                    json.dump(self._word_to_token_cache, f, indent=2)
-                
-                # Save token-to-word cache (convert int keys to strings for JSON)
-                with open(self.token_to_word_file, 'w', encoding='utf-8') as f:
-                    data = {str(k): v for k, v in self._token_to_word_cache.items()}
-                    json.dump(data, f, indent=2)
-                
-                # Save nearby tokens cache
-                with open(self.nearby_tokens_file, 'w', encoding='utf-8') as f:
-                    data = {str(k): v for k, v in self._nearby_tokens_cache.items()}
-                    json.dump(data, f, indent=2)
-                
-                logger.debug("Caches saved to disk")
+            written = sum(self.store.put_many(namespace, entries.items())
+                          for namespace, entries in pending.items())
+            logger.debug("Saved %d new cache entries", written)
         
         except Exception as e:
             logger.error("Error saving caches: %s", e, exc_info=True)
+            # Keep the entries for the next save
+            with self._cache_lock:
+                for namespace, entries in pending.items():
+                    for key, value in entries.items():
+                        self._pending[namespace].setdefault(key, value)
+    
+    # ─────────────────────────────────────────────
+    # Copy-on-write snapshots
+    # ─────────────────────────────────────────────
+    
+    def _lookup(self, namespace: str, key):
+        """Published value (no lock), else a staged one, else MISSING."""
+        value = self._snapshots[namespace].get(key, MISSING)
+        if value is MISSING and self._staged[namespace]:
+            with self._cache_lock:
+                value = self._staged[namespace].get(key, MISSING)
+        return value
+    
+    def _stage(self, namespace: str, entries: Dict, persist: bool = True):
+        """Queue entries for the next publish (and the next save if ``persist``)."""
+        with self._cache_lock:
+            self._staged[namespace].update(entries)
+            if persist:
+                self._pending[namespace].update(entries)
+            # Publish once the batch is a fair fraction of the snapshot, so
+            # the copying stays amortized O(1) per entry
+            staged = sum(len(batch) for batch in self._staged.values())
+            published = sum(len(snapshot) for snapshot in self._snapshots.values())
+            if staged >= max(PUBLISH_BATCH, published // 4):
+                self._publish()
+            save_due = persist and self._save_due()
+        if save_due:
+            # The store is shared by every worker on the host: write behind
+            # in small batches so the others see new entries soon
+            self._request_save()
+    
+    def _request_save(self):
+        """Wake the background writer, starting it on first use."""
+        if self._writer is None:
+            with self._cache_lock:
+                if self._writer is None and not self._closed:
+                    self._writer = threading.Thread(target=self._write_behind, daemon=True,
+                                                    name=f"token-cache-writer:{self.encoding_name}")
+                    self._writer.start()
+        self._save_requested.set()
+    
+    def _write_behind(self):
+        """Writer loop: save when asked, and once per flush interval while entries are pending."""
+        while not self._closed:
+            self._save_requested.wait(get_game_config().shared_cache_flush_interval)
+            self._save_requested.clear()
+            with self._cache_lock:
+                pending = not self._closed and any(self._pending.values())
+            if pending:
+                self._save_caches()
+    
+    def _save_due(self) -> bool:
+        """Whether enough new entries (or time) have piled up to save (caller holds the lock)."""
+        game_config = get_game_config()
+        if not game_config.shared_cache_enabled:
+            return False
+        pending = sum(len(entries) for entries in self._pending.values())
+        return pending > 0 and (pending >= game_config.shared_cache_flush_size or
+                                time.monotonic() - self._last_save >= game_config.shared_cache_flush_interval)
+    
+    def _stage_word(self, word: str, token_id: Optional[int]):
+        """Queue a word -> token mapping and, for single tokens, its reverse."""
+        self._stage(WORD_TO_TOKEN, {word: token_id})
+        if token_id is not None:
+            self._stage(TOKEN_TO_WORD, {token_id: word})
+    
+    def _publish(self):
+        """Swap in snapshots extended by the staged entries (caller holds the lock)."""
+        for namespace, staged in self._staged.items():
+            if staged:
+                snapshot = dict(self._snapshots[namespace])
+                snapshot.update(staged)
+                self._snapshots[namespace] = snapshot
+                self._publishes += 1
+        self._staged = self._empty_namespaces()
+    
+    # ─────────────────────────────────────────────
+    # Single-flight miss handling
+    # ─────────────────────────────────────────────
+    
+    def _claim(self, namespace: str, keys: List) -> Tuple[Dict, List, Dict]:
+        """Split missed keys into (now cached, led by this thread, in flight elsewhere)."""
+        found, led, joined = {}, [], {}
+        with self._cache_lock:
+            for key in keys:
+                # Another thread may have landed the key since our lock-free miss
+                if namespace in self._snapshots:
+                    value = self._snapshots[namespace].get(key, MISSING)
+                    if value is MISSING:
+                        value = self._staged[namespace].get(key, MISSING)
+                    if value is not MISSING:
+                        found[key] = value
+                        continue
+                flight = self._in_flight.get((namespace, key))
+                if flight is None:
+                    self._in_flight[(namespace, key)] = _Flight()
+                    led.append(key)
+                else:
+                    joined[key] = flight
+            self._coalesced += len(joined)
+        return found, led, joined
+    
+    def _land(self, namespace: str, results: Dict):
+        """Hand the results of led keys to the threads waiting on them."""
+        with self._cache_lock:
+            flights = [self._in_flight.pop((namespace, key)) for key in results]
+        for flight, value in zip(flights, results.values()):
+            flight.value = value
+            flight.done.set()
+    
+    def _single_flight(self, namespace: str, key, compute: Callable[[], Any]) -> Any:
+        """Run ``compute`` for a missed key once, however many threads missed it."""
+        found, led, joined = self._claim(namespace, [key])
+        if found:
+            return found[key]
+        if joined:
+            flight = joined[key]
+            flight.done.wait()
+            return flight.value
+        
+        value = None
+        try:
+            value = compute()
+        finally:
+            self._land(namespace, {key: value})
+        return value
     
-    @lru_cache(maxsize=10000)
     def get_token_id(self, word: str) -> Optional[int]:
         """Get token ID for a word with caching."""
         word = word.strip().lower()
         
         # Check cache first
-        with self._cache_lock:
-            if word in self._word_to_token_cache:
-                return self._word_to_token_cache[word]
+        token_id = self._lookup(WORD_TO_TOKEN, word)
+        if token_id is not MISSING:
+            return token_id
+        return self._single_flight(WORD_TO_TOKEN, word, lambda: self._load_token_id(word))
+    
+    def _load_token_id(self, word: str) -> Optional[int]:
+        """Token id of a missed word, from the store or the encoder."""
+        # Then the persistent store
+        stored = self.store.get(WORD_TO_TOKEN, word)
+        if stored is not MISSING:
+            self._stage(WORD_TO_TOKEN, {word: stored}, persist=False)
+            return stored
         
         # Encode the word
         try:
             tokens = self.encoder.encode(word)
-            if len(tokens) == 1:
-                token_id = tokens[0]
-                
-                # Cache the result
-                with self._cache_lock:
-                    self._word_to_token_cache[word] = token_id
-                    self._token_to_word_cache[token_id] = word
-                
-                return token_id
-            else:
-                # Multi-token word - cache as None
-                with self._cache_lock:
-                    self._word_to_token_cache[word] = None
-                return None
+            # Multi-token words are cached as None
+            token_id = tokens[0] if len(tokens) == 1 else None
+            self._stage_word(word, token_id)
+            return token_id
         
         except Exception as e:
             logger.error("Error encoding word '%s': %s", word, e)
             return None
     
-    @lru_cache(maxsize=10000)
     def get_word_from_token(self, token_id: int) -> Optional[str]:
         """Get word from token ID with caching."""
         # Check cache first
-        with self._cache_lock:
-            if token_id in self._token_to_word_cache:
-                return self._token_to_word_cache[token_id]
+        word = self._lookup(TOKEN_TO_WORD, token_id)
+        if word is not MISSING:
+            return word
+        return self._single_flight(TOKEN_TO_WORD, token_id, lambda: self._load_word(token_id))
+    
+    def _load_word(self, token_id: int) -> Optional[str]:
+        """Text of a missed token id, from the store or the encoder."""
+        # Then the persistent store
+        stored = self.store.get(TOKEN_TO_WORD, token_id)
+        if stored is not MISSING:
+            self._stage(TOKEN_TO_WORD, {token_id: stored}, persist=False)
+            return stored
         
         # Decode the token
         try:
             word = self.encoder.decode([token_id])
-            
-            # Cache the result
-            with self._cache_lock:
-                self._token_to_word_cache[token_id] = word
-                self._word_to_token_cache[word.lower()] = token_id
-            
+            # No reverse mapping: 'Happy' and ' happy' decode from their own
+            # ids, but get_token_id('happy') must stay what encode() says
+            self._stage(TOKEN_TO_WORD, {token_id: word})
             return word
         
         except Exception as e:
             logger.error("Error decoding token %d: %s", token_id, e)
             return None
     
-    def get_nearby_tokens(self, token_id: int, range_size: int = 100) -> List[int]:
-        """Get tokens near the given token ID."""
-        cache_key = token_id
+    def get_words_from_tokens(self, token_ids: List[int]) -> List[Optional[str]]:
+        """Words for many token ids, filling every miss in one pass."""
+        results: Dict[int, Optional[str]] = {}
+        misses = []
+        for token_id in dict.fromkeys(token_ids):
+            word = self._lookup(TOKEN_TO_WORD, token_id)
+            if word is MISSING:
+                misses.append(token_id)
+            else:
+                results[token_id] = word
         
-        # Check cache first
-        with self._cache_lock:
-            if cache_key in self._nearby_tokens_cache:
-                return self._nearby_tokens_cache[cache_key]
+        if misses:
+            found, led, joined = self._claim(TOKEN_TO_WORD, misses)
+            results.update(found)
+            loaded: Dict[int, Optional[str]] = {}
+            try:
+                loaded = self._load_words(led)
+            finally:
+                self._land(TOKEN_TO_WORD, {token_id: loaded.get(token_id) for token_id in led})
+            results.update(loaded)
+            for token_id, flight in joined.items():
+                flight.done.wait()
+                results[token_id] = flight.value
         
-        # Generate nearby tokens
-        nearby = []
-        for offset in range(-range_size, range_size + 1):
-            nearby_token = token_id + offset
-            if nearby_token >= 0:  # Ensure valid token ID
-                nearby.append(nearby_token)
+        return [results[token_id] for token_id in token_ids]
+    
+    def _load_words(self, token_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Texts of missed token ids: one store query, then one batched decode."""
+        if not token_ids:
+            return {}
+        stored = {int(key): word for key, word in self.store.get_many(TOKEN_TO_WORD, token_ids).items()}
+        self._stage(TOKEN_TO_WORD, stored, persist=False)
         
-        # Cache the result
-        with self._cache_lock:
-            self._nearby_tokens_cache[cache_key] = nearby
+        misses = [token_id for token_id in token_ids if token_id not in stored]
+        decoded: Dict[int, Optional[str]] = {}
+        try:
+            decoded = dict(zip(misses, self.encoder.decode_batch([[token_id] for token_id in misses])))
+        except Exception:
+            # An invalid id fails the whole batch; fall back to one at a time
+            for token_id in misses:
+                try:
+                    decoded[token_id] = self.encoder.decode([token_id])
+                except Exception as e:
+                    logger.error("Error decoding token %d: %s", token_id, e)
         
-        return nearby
+        self._stage(TOKEN_TO_WORD, decoded)
+        return {token_id: stored.get(token_id, decoded.get(token_id)) for token_id in token_ids}
+    
+    def get_nearby_tokens(self, token_id: int, range_size: int = 100) -> Sequence[int]:
+        """Get tokens near the given token ID (a range view, nothing is stored)."""
+        return range(max(0, token_id - range_size), token_id + range_size + 1)
     
     def get_nearby_words(self, token_id: int, range_size: int = 50) -> List[tuple]:
         """Get words with tokens near the given token ID."""
-        nearby_tokens = self.get_nearby_tokens(token_id, range_size)
-        nearby_words = []
+        cache_key = (token_id, range_size)
+        cached = self._nearby_words_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return self._single_flight(NEARBY_WORDS, cache_key, lambda: self._load_nearby_words(token_id, range_size))
+    
+    def _load_nearby_words(self, token_id: int, range_size: int) -> List[tuple]:
+        """Nearby-word list for a missed (token_id, range_size): warmed store entry, else computed."""
+        cache_key = (token_id, range_size)
+        # Neighbourhoods of game targets are precomputed by ``warm``
+        stored = self.store.get(NEARBY_WORDS, f"{token_id}:{range_size}")
+        if stored is not MISSING:
+            nearby_words = [tuple(entry) for entry in stored]
+            self._nearby_words_cache.put(cache_key, nearby_words)
+            return nearby_words
         
-        for nearby_token in nearby_tokens:
-            word = self.get_word_from_token(nearby_token)
-            if word and word.strip() and word.isalpha():  # Only valid alphabetic words
-                distance = abs(nearby_token - token_id)
-                nearby_words.append((word.strip(), nearby_token, distance))
+        # Only valid alphabetic words, answered from the sorted word index
+        word_index = get_word_index(get_vocab_table(self.encoder, self.cache_dir), min_length=1)
+        window = word_index.words_between(max(0, token_id - range_size), token_id + range_size)
+        nearby_words = [(word, nearby_token, abs(nearby_token - token_id)) for word, nearby_token in window]
         
         # Sort by distance
         nearby_words.sort(key=lambda x: x[2])
+        self._nearby_words_cache.put(cache_key, nearby_words)
         return nearby_words
     
-    def preload_word_list(self, words: List[str]):
-        """Preload a list of words into the cache."""
+    def preload_word_list(self, words: List[str], refresh: bool = False) -> Dict[str, Optional[int]]:
+        """Preload a list of words into the cache; returns each word's (single) token id.
+        
+        With ``refresh`` every word is re-encoded and overwrites whatever the
+        cache and the store held for it.
+        """
         logger.info("Preloading %d words into cache...", len(words))
         start_time = time.time()
         
-        for word in words:
-            self.get_token_id(word)
+        # Encode all uncached words in one multi-threaded batch
+        normalized = list(dict.fromkeys(word.strip().lower() for word in words))
+        if refresh:
+            misses, stored = normalized, {}
+        else:
+            misses = [word for word in normalized if self._lookup(WORD_TO_TOKEN, word) is MISSING]
+            # Words already in the store only need reading back
+            stored = self.store.get_many(WORD_TO_TOKEN, misses) if misses else {}
+            misses = [word for word in misses if word not in stored]
+        
+        encoded = self.encoder.encode_batch(misses) if misses else []
+        words = {word: tokens[0] if len(tokens) == 1 else None for word, tokens in zip(misses, encoded)}
+        self._stage(WORD_TO_TOKEN, stored, persist=False)
+        self._stage(WORD_TO_TOKEN, words)
+        self._stage(TOKEN_TO_WORD, {token_id: word for word, token_id in words.items() if token_id is not None})
         
         elapsed = time.time() - start_time
         logger.info("Preloaded %d words in %.2f seconds", len(words), elapsed)
         
         # Save caches after preloading
         self._save_caches()
+        return {word: self._lookup(WORD_TO_TOKEN, word) for word in normalized}
     
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
         with self._cache_lock:
             return {
-                'word_to_token_entries': len(self._word_to_token_cache),
-                'token_to_word_entries': len(self._token_to_word_cache),
-                'nearby_tokens_entries': len(self._nearby_tokens_cache),
-                'lru_cache_info': {
-                    'get_token_id': self.get_token_id.cache_info()._asdict(),
-                    'get_word_from_token': self.get_word_from_token.cache_info()._asdict()
+                'word_to_token_entries': len(self._snapshots[WORD_TO_TOKEN]) + len(self._staged[WORD_TO_TOKEN]),
+                'token_to_word_entries': len(self._snapshots[TOKEN_TO_WORD]) + len(self._staged[TOKEN_TO_WORD]),
+                'snapshot_publishes': self._publishes,
+                'coalesced_misses': self._coalesced,
+                'nearby_words_cache': self._nearby_words_cache.stats(),
+                'pending_writes': sum(len(entries) for entries in self._pending.values()),
+                'persisted_entries': {
+                    namespace: self.store.count(namespace)
+                    for namespace in (WORD_TO_TOKEN, TOKEN_TO_WORD, NEARBY_WORDS)
                 }
             }
     
+    def _memory_stats(self) -> Dict[str, int]:
+        """In-memory entry counts for the cache registry."""
+        with self._cache_lock:
+            return {
+                'entries': sum(len(self._snapshots[namespace]) + len(self._staged[namespace])
+                               for namespace in self._snapshots),
+                'pending_writes': sum(len(entries) for entries in self._pending.values()),
+                'snapshot_publishes': self._publishes,
+                'coalesced_misses': self._coalesced
+            }
+    
+    def clear_memory(self):
+        """Drop the in-memory snapshots (after saving), keeping the persistent store."""
+        self._save_caches()
+        with self._cache_lock:
+            self._snapshots = self._empty_namespaces()
+            self._staged = self._empty_namespaces()
+        self._nearby_words_cache.clear()
+    
     def clear_cache(self):
         """Clear all caches."""
         with self._cache_lock:
-            self._word_to_token_cache.clear()
-            self._token_to_word_cache.clear()
-            self._nearby_tokens_cache.clear()
-            self.get_token_id.cache_clear()
-            self.get_word_from_token.cache_clear()
+            self._snapshots = self._empty_namespaces()
+            self._staged = self._empty_namespaces()
+            self._pending = self._empty_namespaces()
+        self._nearby_words_cache.clear()
+        self.store.clear([WORD_TO_TOKEN, TOKEN_TO_WORD, NEARBY_WORDS])
         
         logger.info("All caches cleared")
     
     def save_and_close(self):
-        """Save caches and cleanup."""
+        """Stop the background writer, save caches and cleanup."""
+        with self._cache_lock:
+            self._closed = True
+            writer = self._writer
+        if writer is not None:
+            self._save_requested.set()
+            writer.join()
         self._save_caches()
+        self.store.close()
         logger.info("Token cache saved and closed")
 
 # Global cache instance
@@ -233,4 +529,99 @@ def get_global_cache(encoding_name: str = "o200k_base") -> TokenCache:
     global _global_cache
     if _global_cache is None or _global_cache.encoding_name != encoding_name:
         _global_cache = TokenCache(encoding_name=encoding_name)
-    return _global_cache 
\ No newline at end of file
+        atexit.register(_global_cache._save_caches)
+    return _global_cache 
+
+# ─────────────────────────────────────────────
+# Cache warm-up (``python -m token_cache warm``)
+# ─────────────────────────────────────────────
+
+def _timed(label: str, count: int, func: Callable[[], Any]) -> Any:
+    start_time = time.time()
+    result = func()
+    elapsed = time.time() - start_time
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"  {label:<28} {count:>8,} in {elapsed:6.2f}s  ({rate:,.0f}/s)")
+    return result
+
+
+def warm(encoding_name: str = "o200k_base", cache_dir: str = "cache", workers: int = 8,
+         chunk_size: int = 4096) -> TokenCache:
+    """Precompute the decode table, game word lists, hint neighbourhoods and hint bundles."""
+    from concurrent.futures import ThreadPoolExecutor
+    from semantic_index import get_semantic_index
+    from token_handler import get_token_handler
+    from hint_bundles import get_hint_bundles
+    from word_catalog import TARGET_WORDS, get_word_catalog
+    from word_packs import PACK_SUFFIXES, load_word_packs
+    
+    total_start = time.time()
+    print(f"Warming caches for {encoding_name} in {cache_dir}/ with {workers} workers")
+    cache = TokenCache(cache_dir=cache_dir, encoding_name=encoding_name)
+    n_vocab = cache.encoder.n_vocab
+    
+    # 1. Memory-mapped decode table and word index, then every id -> word row
+    table = _timed("decode table", n_vocab, lambda: get_vocab_table(cache.encoder, cache_dir))
+    word_index = _timed("word index", n_vocab, lambda: get_word_index(table, min_length=1))
+    valid_ids = [token_id for token_id in range(n_vocab) if table.is_valid(token_id)]
+    chunks = [valid_ids[start:start + chunk_size] for start in range(0, len(valid_ids), chunk_size)]
+    
+    def decode_all():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(cache.get_words_from_tokens, chunks))
+        cache._save_caches()
+    _timed("id -> word entries", len(valid_ids), decode_all)
+    
+    # 2. Every word of every game category, and the single-token filtering of every word pack
+    words = sorted(set(TARGET_WORDS))
+    word_ids = _timed("category words", len(words), lambda: cache.preload_word_list(words, refresh=True))
+    packs_dir = Path(get_game_config().word_packs_dir)
+    pack_files = [path for path in packs_dir.glob("*") if path.suffix.lower() in PACK_SUFFIXES]
+    _timed("word pack files", len(pack_files), lambda: load_word_packs(packs_dir, cache.encoder, cache_dir))
+    
+    # 3. Hint neighbourhoods of every single-token target
+    targets = [(word, token_id) for word, token_id in word_ids.items() if token_id is not None]
+    range_size = get_game_config().token_range_for_hints
+    
+    def neighbourhoods():
+        def nearby(token_id: int):
+            return f"{token_id}:{range_size}", cache.get_nearby_words(token_id, range_size)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(nearby, [token_id for _, token_id in targets]))
+        cache.store.put_many(NEARBY_WORDS, entries)
+    _timed("hint neighbourhoods", len(targets), neighbourhoods)
+    
+    # Semantic neighbours too, when word vectors are configured
+    token_handler = get_token_handler(encoding_name, cache_dir)
+    semantic_index = get_semantic_index(token_handler)
+    if semantic_index is not None:
+        _timed("semantic neighbours", len(targets),
+               lambda: semantic_index.precompute([word for word, _ in targets]))
+    
+    # 4. A hint bundle for every catalog word (built-in categories and word packs)
+    catalog = get_word_catalog(token_handler)
+    bundles = get_hint_bundles(token_handler, catalog, precompute=False)
+    _timed("hint bundles", len(catalog.token_ids),
+           lambda: bundles.precompute(catalog.token_ids.items(), workers=workers, wait=True))
+    
+    cache._save_caches()
+    print(f"Done in {time.time() - total_start:.2f}s ({len(word_index):,} words indexed): "
+          f"{cache.get_cache_stats()['persisted_entries']}")
+    return cache
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="python -m token_cache", description="Token Quest cache tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm_parser = commands.add_parser("warm", help="precompute the persistent caches (e.g. at image build)")
+    warm_parser.add_argument("--encoding", action="append",
+                             help="encoding to warm (repeatable; default: GameConfig.encoding_name)")
+    warm_parser.add_argument("--cache-dir", default="cache")
+    warm_parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING)
+    for name in args.encoding or [get_game_config().encoding_name]:
+        warm(name, args.cache_dir, args.workers).save_and_close()
@@ -3,35 +3,117 @@ Token Handler Module
 Manages all tiktoken operations for Token Quest
 """
 
-import tiktoken
 import random
 import logging
-from functools import lru_cache
+import threading
 from typing import List, Tuple, Optional, Dict
 
+import tiktoken
+
+from bounded_cache import BoundedCache, make_cache
+from cache_registry import register_cache
+from cache_store import SharedCacheTier, get_shared_tier
+from config import get_game_config
+from encoder_registry import (DEFAULT_COMPARISON_ENCODINGS, available_encodings, get_encoder, loaded_encodings,
+                               preload_encoders)
+from token_space import TokenSpacePyramid, get_token_space_pyramid
+from vocab_table import VocabTable, get_vocab_table, load_vocab_table
+from word_index import VariantIndex, WordIndex, get_variant_index, get_word_index
+
+
+class EncodingCaches:
+    """Process-wide encode/decode caches shared by every handler of one encoding."""
+
+    def __init__(self, encoding_name: str, maxsize: int, policy: str):
+        self.encoding_name = encoding_name
+        self.encode: BoundedCache = make_cache(policy, maxsize)
+        self.decode: BoundedCache = make_cache(policy, maxsize)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {'encode': self.encode.stats(), 'decode': self.decode.stats()}
+
+    def clear(self):
+        self.encode.clear()
+        self.decode.clear()
+
+
+_encoding_caches: Dict[str, EncodingCaches] = {}
+_encoding_caches_lock = threading.Lock()
+
+
+def get_encoding_caches(encoding_name: str) -> EncodingCaches:
+    """Get the shared caches for an encoding, sized from GameConfig on first use."""
+    caches = _encoding_caches.get(encoding_name)
+    if caches is None:
+        with _encoding_caches_lock:
+            caches = _encoding_caches.get(encoding_name)
+            if caches is None:
+                game_config = get_game_config()
+                caches = EncodingCaches(encoding_name, game_config.max_cache_size, game_config.cache_policy)
+                _encoding_caches[encoding_name] = caches
+                register_cache(f"encode:{encoding_name}", caches.encode)
+                register_cache(f"decode:{encoding_name}", caches.decode)
+    return caches
+
+
+def clear_encoding_caches(encoding_name: Optional[str] = None):
+    """Clear the shared caches of one encoding (or of all encodings)."""
+    with _encoding_caches_lock:
+        targets = list(_encoding_caches.values()) if encoding_name is None else \
+            [_encoding_caches[encoding_name]] if encoding_name in _encoding_caches else []
+    for caches in targets:
+        caches.clear()
+
+
+# Educational facts about tokenization
+TOKEN_FACTS = (
+    "🧠 Token IDs are assigned based on how frequently words appear in training data!",
+    "📊 Lower token IDs usually represent more common words and characters.",
+    "🔤 Words that start with spaces have different token IDs than the same word without spaces.",
+    "🌍 The same word can have different token IDs in different tokenization schemes.",
+    "📝 Compound words might tokenize differently than you expect!",
+    "🎯 Token distance doesn't always correlate with semantic similarity.",
+    "🔄 Some tokens represent parts of words, not complete words.",
+    "💡 Tokenization is the first step in how AI models understand language!",
+    "🎨 Creative spellings and internet slang can create surprising token patterns.",
+    "📈 Token IDs can reveal biases in training data frequency."
+)
+
 
 class TokenHandler:
-    def __init__(self, encoding_name: str = "o200k_base"):
+    """Encoding, decoding and token-space queries for one tiktoken encoding.
+
+    Cache layers (all keyed per encoding):
+
+    - per-process bounded LRUs (``EncodingCaches``) for every encode and decode;
+    - the memory-mapped decode table, shared host-wide through the page cache,
+      for decoding regular ids;
+    - the host-wide SQLite tier (``SharedCacheTier``) for catalog-word encodes
+      (batches and ``catalog=True`` look-ups) and for the decodes the table
+      cannot answer (special ids), both bounded key spaces.
+
+    Arbitrary guesses are encoded through the per-process LRU only: they are
+    cheaper to encode than to query, and would grow the shared file without bound.
+    """
+
+    def __init__(self, encoding_name: str = "o200k_base", cache_dir: str = "cache"):
         """Initialize the token handler with specified encoding."""
         self.encoding_name = encoding_name
-        self.encoder = tiktoken.get_encoding(encoding_name)
+        self.cache_dir = cache_dir
+        self._encoder: Optional["tiktoken.Encoding"] = None
+        self._vocab_table: Optional[VocabTable] = None
+        # Bounded caches shared with every other handler of this encoding
+        self._caches = get_encoding_caches(encoding_name)
+        # Host-wide tier behind them, shared with the other worker processes
+        self._shared: Optional[SharedCacheTier] = get_shared_tier(cache_dir)
+        self._shared_namespace = f"encode:{encoding_name}"
+        self._shared_decode_namespace = f"decode:{encoding_name}"
         
         # Educational facts about tokenization
-        self.token_facts = [
-            "🧠 Token IDs are assigned based on how frequently words appear in training data!",
-            "📊 Lower token IDs usually represent more common words and characters.",
-            "🔤 Words that start with spaces have different token IDs than the same word without spaces.",
-            "🌍 The same word can have different token IDs in different tokenization schemes.",
-            "📝 Compound words might tokenize differently than you expect!",
-            "🎯 Token distance doesn't always correlate with semantic similarity.",
-            "🔄 Some tokens represent parts of words, not complete words.",
-            "💡 Tokenization is the first step in how AI models understand language!",
-            "🎨 Creative spellings and internet slang can create surprising token patterns.",
-            "📈 Token IDs can reveal biases in training data frequency."
-        ]
+        self.token_facts = TOKEN_FACTS
         
-        # Local cache for id→word look-ups (fast runtime, small memory)
-        self._id_to_word: Dict[int, str] = {}
+        # Handlers for other encodings, created on first comparison
+        self._comparison_handlers: Dict[str, "TokenHandler"] = {}
         # Configure logger
         self._logger = logging.getLogger(__name__)
         
@@ -39,27 +121,86 @@ class TokenHandler:
     # Caching helpers
     # ─────────────────────────────────────────────
 
-    @lru_cache(maxsize=100_000)
-    def _encode_cached(self, text: str) -> Tuple[int, ...]:
-        """Cached BPE encoding (immutable tuple so it can be cached)."""
-        return tuple(self.encoder.encode(text))
+    def _encode_cached(self, text: str, shared: bool = False) -> Tuple[int, ...]:
+        """Cached BPE encoding (immutable tuple so it can be cached).
+
+        ``shared`` puts the host-wide tier behind the process cache; pass it
+        only for catalog words, never for guesses.
+        """
+        token_ids = self._caches.encode.get(text)
+        if token_ids is None:
+            shared = shared and self._shared is not None
+            cached = self._shared.get(self._shared_namespace, text, None) if shared else None
+            if cached is not None:
+                token_ids = tuple(cached)
+            else:
+                token_ids = tuple(self.encoder.encode(text))
+                if shared:
+                    self._shared.put(self._shared_namespace, text, token_ids)
+            self._caches.encode.put(text, token_ids)
+        return token_ids
 
-    @lru_cache(maxsize=100_000)
     def _decode_single_cached(self, token_id: int) -> str:
-        """Cached single-token decoding."""
-        return self.encoder.decode([token_id])
+        """Cached single-token decoding: decode table, then the shared tier, then the encoder."""
+        word = self._caches.decode.get(token_id)
+        if word is None:
+            table = self.vocab_table
+            if table.is_valid(token_id):
+                word = table.word(token_id)
+            else:
+                word = self._shared.get(self._shared_decode_namespace, token_id, None) \
+                    if self._shared is not None else None
+                if word is None:
+                    word = self.encoder.decode([token_id])
+                    if self._shared is not None:
+                        self._shared.put(self._shared_decode_namespace, token_id, word)
+            self._caches.decode.put(token_id, word)
+        return word
+
+    def get_cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss/eviction counters of the shared caches for this encoding."""
+        stats = self._caches.stats()
+        if self._shared is not None:
+            stats['shared'] = self._shared.stats()
+        return stats
+
+    def clear_caches(self):
+        """Clear the shared caches for this encoding."""
+        self._caches.clear()
+
+    @property
+    def encoder(self) -> "tiktoken.Encoding":
+        """Shared tiktoken encoder, loaded on first encode (decoding uses the table)."""
+        if self._encoder is None:
+            self._encoder = get_encoder(self.encoding_name, self.cache_dir)
+        return self._encoder
+
+    @property
+    def vocab_table(self) -> VocabTable:
+        """Shared memory-mapped decode table (mapped from disk, or built on first use)."""
+        if self._vocab_table is None:
+            self._vocab_table = load_vocab_table(self.encoding_name, self.cache_dir) or \
+                get_vocab_table(self.encoder, self.cache_dir)
+        return self._vocab_table
+
+    @property
+    def word_index(self) -> WordIndex:
+        """Shared sorted index of word-like tokens (alphabetic, 2+ chars)."""
+        return get_word_index(self.vocab_table, min_length=2)
+
+    @property
+    def token_space(self) -> TokenSpacePyramid:
+        """Shared multi-resolution word-density pyramid for visualizations."""
+        return get_token_space_pyramid(self.word_index, self.vocab_table.n_vocab)
+
+    @property
+    def variant_index(self) -> VariantIndex:
+        """Shared normalized-word → {variant: id} index."""
+        return get_variant_index(self.vocab_table)
 
     def _word_from_id(self, token_id: int) -> str:
-        """Return decoded word for a token id using local + LRU cache."""
-        if token_id in self._id_to_word:
-            return self._id_to_word[token_id]
-        try:
-            word = self._decode_single_cached(token_id)
-        except Exception as exc:
-            self._logger.debug("Decode failed for id %s: %s", token_id, exc)
-            word = ""
-        self._id_to_word[token_id] = word
-        return word
+        """Return decoded word for a token id ('' for special/invalid ids)."""
+        return self.vocab_table.word(token_id)
 
     # ─────────────────────────────────────────────
     # Public API (uses caches)
@@ -69,13 +210,75 @@ class TokenHandler:
         """Get token IDs for a given text."""
         return list(self._encode_cached(text))
     
-    def get_single_token_id(self, word: str) -> Optional[int]:
-        """Get token ID for a word if it's a single token, None otherwise."""
-        token_ids = self.get_token_ids(word)
+    def get_token_ids_batch(self, texts: List[str], num_threads: int = 8) -> List[List[int]]:
+        """Get token IDs for many texts at once, in input order.
+
+        Texts are de-duplicated and only cache misses are sent to tiktoken's
+        multi-threaded batch encoder.  Batches are known word lists (catalog
+        words, word packs), so they also go through the host-wide shared tier.
+        """
+        results: Dict[str, Tuple[int, ...]] = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            cached = self._caches.encode.get(text)
+            if cached is None:
+                misses.append(text)
+            else:
+                results[text] = cached
+        
+        if misses and self._shared is not None:
+            shared = self._shared.get_many(self._shared_namespace, misses)
+            for text in misses:
+                if text in shared:
+                    results[text] = tuple(shared[text])
+                    self._caches.encode.put(text, results[text])
+            misses = [text for text in misses if text not in shared]
+        
+        if misses:
+            encoded = self.encoder.encode_batch(misses, num_threads=num_threads)
+            for text, token_ids in zip(misses, encoded):
+                results[text] = tuple(token_ids)
+                self._caches.encode.put(text, results[text])
+            if self._shared is not None:
+                self._shared.put_many(self._shared_namespace, ((text, results[text]) for text in misses))
+        return [list(results[text]) for text in texts]
+    
+    def get_single_token_ids_batch(self, words: List[str], num_threads: int = 8) -> List[Optional[int]]:
+        """Batch version of get_single_token_id (None for multi-token words)."""
+        return [
+            token_ids[0] if len(token_ids) == 1 else None
+            for token_ids in self.get_token_ids_batch(words, num_threads)
+        ]
+    
+    def get_single_token_id(self, word: str, catalog: bool = False) -> Optional[int]:
+        """Get token ID for a word if it's a single token, None otherwise.
+
+        ``catalog`` marks a known target word, which may use the shared tier.
+        """
+        token_ids = self._encode_cached(word, shared=catalog)
         if len(token_ids) == 1:
             return token_ids[0]
         return None
     
+    def get_token_variants(self, word: str) -> Dict[str, int]:
+        """All single-token spellings of a word ('happy', ' happy', 'Happy', ...)."""
+        return self.variant_index.lookup(word)
+    
+    def resolve_variant(self, word: str, target_id: Optional[int] = None,
+                        farthest: bool = False) -> Optional[Tuple[str, int]]:
+        """Pick one single-token variant of a word as (variant, token_id).
+
+        With a target id the variant closest to it (or farthest, for antonym
+        scoring) wins; otherwise the canonical variant is returned.
+        """
+        if target_id is None:
+            return self.variant_index.preferred(word)
+        variants = self.get_token_variants(word)
+        if not variants:
+            return None
+        pick = max if farthest else min
+        return pick(variants.items(), key=lambda item: (abs(item[1] - target_id), item[1]))
+    
     def decode_tokens(self, token_ids: List[int]) -> str:
         """Decode token IDs back to text."""
         # Fast-path for single id using cache
@@ -97,6 +300,47 @@ class TokenHandler:
         
         return abs(id1 - id2)
     
+    def _handler_for(self, encoding_name: str) -> Optional["TokenHandler"]:
+        """Handler for another encoding (None until its encoder has been loaded)."""
+        if encoding_name == self.encoding_name:
+            return self
+        handler = self._comparison_handlers.get(encoding_name)
+        if handler is None and encoding_name in loaded_encodings():
+            handler = get_token_handler(encoding_name, self.cache_dir)
+            self._comparison_handlers[encoding_name] = handler
+        return handler
+    
+    def comparison_encodings(self, encodings: Optional[List[str]] = None) -> List[str]:
+        """Encodings to compare (default: the locally available ones), loading any new ones in the background."""
+        if encodings is None:
+            available = available_encodings(self.cache_dir)
+            encodings = [name for name in dict.fromkeys(DEFAULT_COMPARISON_ENCODINGS + available)
+                         if name in available or name == self.encoding_name]
+        preload_encoders([name for name in encodings if name != self.encoding_name], self.cache_dir)
+        return encodings
+    
+    def compare_across_encodings(self, word1: str, word2: str,
+                                 encodings: Optional[List[str]] = None) -> Dict[str, List]:
+        """Score a word pair (target word first) under several encodings at once.
+
+        Returns column-oriented lists (one entry per encoding loaded so far -
+        the others are still loading in the background, or unavailable here);
+        ids and distances are None where a word is not a single token.
+        """
+        encodings = self.comparison_encodings(encodings)
+        
+        result = {'encodings': [], 'word1_ids': [], 'word2_ids': [], 'distances': []}
+        for encoding_name in encodings:
+            handler = self._handler_for(encoding_name)
+            if handler is None:
+                continue
+            id1, id2 = handler.get_single_token_id(word1, catalog=True), handler.get_single_token_id(word2)
+            result['encodings'].append(encoding_name)
+            result['word1_ids'].append(id1)
+            result['word2_ids'].append(id2)
+            result['distances'].append(abs(id1 - id2) if id1 is not None and id2 is not None else None)
+        return result
+    
     def get_word_info(self, word: str) -> dict:
         """Get comprehensive token information for a word."""
         token_ids = self.get_token_ids(word)
@@ -110,47 +354,48 @@ class TokenHandler:
     
     def find_words_in_range(self, center_token_id: int, range_size: int = 100) -> List[str]:
         """Find valid words within a token ID range (useful for hints/suggestions)."""
-        words = []
         start_id = max(0, center_token_id - range_size)
         end_id = center_token_id + range_size
         
-        for token_id in range(start_id, end_id + 1):
-            decoded = self._word_from_id(token_id)
-            # Filter for real-looking words
-            if decoded and decoded.isalpha() and len(decoded) > 1:
-                words.append(decoded)
-                
-        return words[:20]  # Limit results
+        # Word-like ids are pre-filtered and sorted, so this is a bisect + slice
+        return [word for word, _ in self.word_index.words_between(start_id, end_id, limit=20)]
     
     def get_token_visualization_data(self, target_id: int, guess_id: int, range_size: int = 50) -> Dict:
         """Get data for visualizing token space around target and guess."""
         distance = abs(target_id - guess_id)
         
-        # Create visualization range centered on target
-        vis_start = max(0, target_id - range_size)
-        vis_end = target_id + range_size
-        
-        # Find words in the visualization range
-        nearby_words = []
-        for token_id in range(vis_start, vis_end + 1, 5):  # Sample every 5th token
-            decoded = self._word_from_id(token_id)
-            if decoded and decoded.isalpha() and len(decoded) > 1:
-                nearby_words.append({
-                    'word': decoded,
-                    'token_id': token_id,
-                    'distance_from_target': abs(token_id - target_id)
-                })
+        # Create visualization range centered on target, zoomed out far enough to show the guess
+        half_width = max(range_size, distance + distance // 10 + 1)
+        vis_start = max(0, target_id - half_width)
+        vis_end = target_id + half_width
+        
+        # Nearest real words plus precomputed word density across the range
+        nearby_words = [
+            {
+                'word': word,
+                'token_id': token_id,
+                'distance_from_target': word_distance
+            }
+            for word, token_id, word_distance, _ in self.word_index.nearest(
+                target_id, 15, max_distance=half_width, exclude_center=False
+            )
+        ]
         
         return {
             'target_id': target_id,
             'guess_id': guess_id,
             'distance': distance,
             'visualization_range': (vis_start, vis_end),
-            'nearby_words': nearby_words[:15],  # Limit for visualization
+            'nearby_words': nearby_words,
+            'density': self.token_space.window(vis_start, vis_end),
             'relative_position': self._get_relative_position(target_id, guess_id),
             'distance_category': self._categorize_distance(distance)
         }
     
+    def get_token_space_tile(self, zoom: int, x: int) -> Dict:
+        """One tile of the token-space pyramid (zoom 0 spans the whole vocabulary)."""
+        return self.token_space.tile(zoom, x)
+    
     def _get_relative_position(self, target_id: int, guess_id: int) -> str:
         """Determine relative position of guess compared to target."""
         if guess_id < target_id:
@@ -175,10 +420,11 @@ class TokenHandler:
         else:
             return "very_far"
     
-    def get_educational_explanation(self, target_word: str, guess_word: str) -> str:
+    def get_educational_explanation(self, target_word: str, guess_word: str, guess_id: Optional[int] = None) -> str:
         """Generate educational explanation for why tokens are close/far."""
-        target_id = self.get_single_token_id(target_word)
-        guess_id = self.get_single_token_id(guess_word)
+        target_id = self.get_single_token_id(target_word, catalog=True)
+        if guess_id is None:
+            guess_id = self.get_single_token_id(guess_word)
         
         if target_id is None or guess_id is None:
             return "One of the words isn't a single token, which affects comparison!"
@@ -216,25 +462,31 @@ class TokenHandler:
     
     def get_advanced_nearby_words(self, target_id: int, num_words: int = 10) -> List[Dict]:
         """Get nearby words with detailed information for advanced hints."""
-        nearby_words = []
-        
-        # Search in expanding ranges
-        for range_size in [25, 50, 100, 200]:
-            words_found = self.find_words_in_range(target_id, range_size)
-            
-            for word in words_found:
-                word_id = self.get_single_token_id(word)
-                if word_id and word_id != target_id:
-                    nearby_words.append({
-                        'word': word,
-                        'token_id': word_id,
-                        'distance': abs(word_id - target_id),
-                        'direction': 'before' if word_id < target_id else 'after'
-                    })
-            
-            if len(nearby_words) >= num_words:
-                break
-        
-        # Sort by distance and return top results
-        nearby_words.sort(key=lambda x: x['distance'])
-        return nearby_words[:num_words] 
\ No newline at end of file
+        # Single outward walk over the id-ordered word index, nearest first
+        return [
+            {
+                'word': word,
+                'token_id': word_id,
+                'distance': distance,
+                'direction': direction
+            }
+            for word, word_id, distance, direction in self.word_index.nearest(target_id, num_words)
+        ]
+
+
+# Process-wide handlers keyed by (encoding, cache directory)
+_handlers: Dict[Tuple[str, str], TokenHandler] = {}
+_handlers_lock = threading.Lock()
+
+
+def get_token_handler(encoding_name: str = "o200k_base", cache_dir: str = "cache") -> TokenHandler:
+    """Get a shared handler (handlers keep no per-game state)."""
+    key = (encoding_name, str(cache_dir))
+    handler = _handlers.get(key)
+    if handler is None:
+        with _handlers_lock:
+            handler = _handlers.get(key)
+            if handler is None:
+                handler = TokenHandler(encoding_name, cache_dir)
+                _handlers[key] = handler
+    return handler
@@ -0,0 +1,166 @@
+"""
+Token Space Module
+Multi-resolution summaries of the vocabulary for zoomable visualizations
+
+The token id axis is cut into buckets at several zoom levels.  The finest
+level uses ``BASE_BUCKET`` ids per bucket and every coarser level is
+``FANOUT`` times wider, up to a single tile covering the whole vocabulary.
+For every bucket the pyramid stores how many word-like tokens it holds and
+a few evenly spaced representative words, so any tile or window of the
+token-space view is served from precomputed arrays.
+"""
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+from cache_registry import get_cache_registry
+from word_index import WordIndex
+
+logger = logging.getLogger(__name__)
+
+BASE_BUCKET = 16      # ids per bucket at the finest zoom level
+FANOUT = 4            # zooming out one level merges this many buckets
+TILE_BUCKETS = 64     # buckets per tile
+REPRESENTATIVES = 3   # sample words kept per bucket
+
+
+class PyramidLevel:
+    """One zoom level: word counts and representative word positions per bucket."""
+
+    def __init__(self, zoom: int, bucket_size: int, counts: array, representatives: array):
+        self.zoom = zoom
+        self.bucket_size = bucket_size
+        self.counts = counts
+        # REPRESENTATIVES positions into the word index per bucket (-1 = none)
+        self.representatives = representatives
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class TokenSpacePyramid:
+    """Precomputed word-density pyramid over the whole token id range."""
+
+    def __init__(self, word_index: WordIndex, n_vocab: int, levels: List[PyramidLevel]):
+        self.word_index = word_index
+        self.n_vocab = n_vocab
+        self.levels = levels  # index 0 = coarsest (one tile spans the vocabulary)
+
+    @classmethod
+    def build(cls, word_index: WordIndex, n_vocab: int) -> "TokenSpacePyramid":
+        """Summarize every bucket of every zoom level with bisect look-ups."""
+        max_zoom = 0
+        while BASE_BUCKET * FANOUT ** max_zoom * TILE_BUCKETS < n_vocab:
+            max_zoom += 1
+
+        levels = []
+        for zoom in range(max_zoom + 1):
+            bucket_size = BASE_BUCKET * FANOUT ** (max_zoom - zoom)
+            n_buckets = -(-n_vocab // bucket_size)
+            counts = array("I")
+            representatives = array("i")
+            for bucket in range(n_buckets):
+                start_id = bucket * bucket_size
+                lo, hi = word_index.bounds(start_id, start_id + bucket_size - 1)
+                count = hi - lo
+                counts.append(count)
+                for slot in range(REPRESENTATIVES):
+                    representatives.append(lo + (2 * slot + 1) * count // (2 * REPRESENTATIVES)
+                                           if slot < count else -1)
+            levels.append(PyramidLevel(zoom, bucket_size, counts, representatives))
+        return cls(word_index, n_vocab, levels)
+
+    @property
+    def max_zoom(self) -> int:
+        return len(self.levels) - 1
+
+    def _bucket_summary(self, level: PyramidLevel, bucket: int) -> Dict:
+        start_id = bucket * level.bucket_size
+        count = level.counts[bucket]
+        words = []
+        for slot in range(REPRESENTATIVES):
+            position = level.representatives[bucket * REPRESENTATIVES + slot]
+            if position >= 0:
+                words.append({
+                    'word': self.word_index.words[position],
+                    'token_id': self.word_index.ids[position]
+                })
+        return {
+            'start_id': start_id,
+            'end_id': min(start_id + level.bucket_size, self.n_vocab) - 1,
+            'word_count': count,
+            'density': count / level.bucket_size,
+            'words': words
+        }
+
+    def tile(self, zoom: int, x: int) -> Dict:
+        """Buckets of tile ``x`` at zoom level ``zoom`` (0 = whole vocabulary)."""
+        if not 0 <= zoom <= self.max_zoom:
+            raise ValueError(f"zoom must be between 0 and {self.max_zoom}")
+        level = self.levels[zoom]
+        tiles_at_zoom = -(-len(level) // TILE_BUCKETS)
+        if not 0 <= x < tiles_at_zoom:
+            raise ValueError(f"x must be between 0 and {tiles_at_zoom - 1} at zoom {zoom}")
+
+        first = x * TILE_BUCKETS
+        last = min(first + TILE_BUCKETS, len(level))
+        return {
+            'zoom': zoom,
+            'x': x,
+            'max_zoom': self.max_zoom,
+            'tiles_at_zoom': tiles_at_zoom,
+            'bucket_size': level.bucket_size,
+            'start_id': first * level.bucket_size,
+            'end_id': min(last * level.bucket_size, self.n_vocab) - 1,
+            'buckets': [self._bucket_summary(level, bucket) for bucket in range(first, last)]
+        }
+
+    def window(self, start_id: int, end_id: int, max_buckets: int = 32) -> List[Dict]:
+        """Bucket summaries covering [start_id, end_id] at the finest zoom that fits."""
+        start_id = max(0, start_id)
+        end_id = min(end_id, self.n_vocab - 1)
+        if end_id < start_id:
+            return []
+
+        level = self.levels[0]
+        for candidate in reversed(self.levels):
+            if (end_id - start_id + 1) / candidate.bucket_size <= max_buckets:
+                level = candidate
+                break
+        return [
+            self._bucket_summary(level, bucket)
+            for bucket in range(start_id // level.bucket_size, end_id // level.bucket_size + 1)
+        ]
+
+
+# Process-wide pyramids keyed by the word index they summarize
+_pyramids: Dict[Tuple[int, int], TokenSpacePyramid] = {}
+_pyramids_lock = threading.Lock()
+
+
+def get_token_space_pyramid(word_index: WordIndex, n_vocab: int) -> TokenSpacePyramid:
+    """Get the shared pyramid for a word index, building it on first use."""
+    key = (id(word_index), n_vocab)
+    pyramid = _pyramids.get(key)
+    if pyramid is not None:
+        return pyramid
+
+    with _pyramids_lock:
+        pyramid = _pyramids.get(key)
+        if pyramid is None:
+            start_time = time.time()
+            pyramid = TokenSpacePyramid.build(word_index, n_vocab)
+            load_time = time.time() - start_time
+            logger.info("Token space pyramid built in %.3f seconds (%d zoom levels)",
+                        load_time, len(pyramid.levels))
+            _pyramids[key] = pyramid
+            get_cache_registry().register(
+                f"token_space:{n_vocab}", lambda: {'entries': sum(len(level) for level in pyramid.levels)},
+                measure=lambda: sum(level.counts.itemsize * len(level.counts) +
+                                    level.representatives.itemsize * len(level.representatives)
+                                    for level in pyramid.levels),
+                load_time=load_time
+            )
+        return pyramid
@@ -0,0 +1,33 @@
+"""
+Token Space API Module
+Flask blueprint serving the token-space pyramid, shared by both web apps
+
+Both ``web_app`` and ``simple_web_app`` register this one blueprint, so tile
+validation and HTTP caching cannot drift apart between them.
+"""
+from flask import Blueprint, jsonify, request
+
+from token_handler import TokenHandler
+
+
+def make_token_space_blueprint(token_handler: TokenHandler) -> Blueprint:
+    """Blueprint with the ``/api/token_space/tile`` endpoint for one handler."""
+    blueprint = Blueprint('token_space', __name__)
+
+    @blueprint.route('/api/token_space/tile')
+    def api_token_space_tile():
+        """Serve one tile of the precomputed token-space pyramid (cacheable)."""
+        try:
+            zoom = int(request.args.get('z', 0))
+            x = int(request.args.get('x', 0))
+            tile = token_handler.get_token_space_tile(zoom, x)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        # Tiles only change with the encoding, so let browsers and proxies keep them
+        response = jsonify({'success': True, 'encoding': token_handler.encoding_name, **tile})
+        response.headers['Cache-Control'] = 'public, max-age=86400'
+        response.add_etag()
+        return response.make_conditional(request)
+
+    return blueprint
@@ -0,0 +1,160 @@
+"""
+Vocabulary Snapshot Module
+Offline, fast-start binary snapshots of tiktoken encodings
+
+``tiktoken.get_encoding`` downloads the BPE file on first use and parses its
+base64 text in every process.  A snapshot stores the same data (merge ranks,
+special tokens and the split pattern) in a flat binary layout:
+
+    header   | magic, version, rank count, special count, name/pattern lengths
+    name     | utf-8 encoding name
+    pattern  | utf-8 regex split pattern
+    ranks    | uint32 rank per mergeable token
+    offsets  | (rank count + 1) uint32 offsets into the token blob
+    specials | per special token: uint32 id, uint16 length, utf-8 text
+    blob     | token bytes, concatenated
+
+Loading one needs no network and no base64 decoding.  The matching decode
+table (see ``vocab_table``) is written next to it.  Both can be built ahead
+of time and shipped with the cache directory, so a fresh host never needs
+tiktoken's download::
+
+    python -m vocab_snapshot build o200k_base cl100k_base --cache-dir cache
+"""
+import logging
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Union
+
+import tiktoken
+
+from vocab_table import get_vocab_table
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TQSN"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIII")  # magic, version, reserved, ranks, specials, name len, pattern len
+_SPECIAL = struct.Struct("<IH")
+
+
+def snapshot_path(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> Path:
+    """Location of the snapshot file for an encoding."""
+    return Path(cache_dir) / f"snapshot_{encoding_name}.bin"
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_uint32(data: memoryview, start: int, count: int) -> array:
+    values = array("I")
+    values.frombytes(data[start:start + 4 * count])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def save_snapshot(encoder: "tiktoken.Encoding", path: Union[str, Path]):
+    """Atomically write an encoder's ranks, specials and pattern to disk."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    ranked = sorted(encoder._mergeable_ranks.items(), key=lambda item: item[1])
+    ranks = array("I", (rank for _, rank in ranked))
+    offsets = array("I", [0])
+    blob = bytearray()
+    for token_bytes, _ in ranked:
+        blob += token_bytes
+        offsets.append(len(blob))
+
+    specials = bytearray()
+    for text, token_id in encoder._special_tokens.items():
+        encoded = text.encode("utf-8")
+        specials += _SPECIAL.pack(token_id, len(encoded)) + encoded
+
+    name = encoder.name.encode("utf-8")
+    pattern = encoder._pat_str.encode("utf-8")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(ranks), len(encoder._special_tokens),
+                          len(name), len(pattern))
+
+    tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        for part in (header, name, pattern, _little_endian(ranks), _little_endian(offsets), specials, blob):
+            f.write(part)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: Union[str, Path]) -> "tiktoken.Encoding":
+    """Build a tiktoken Encoding from a snapshot written by save_snapshot."""
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+
+    magic, version, _, n_ranks, n_specials, name_len, pattern_len = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Not an encoding snapshot (magic={magic!r}, version={version})")
+
+    position = _HEADER.size
+    name = str(data[position:position + name_len], "utf-8")
+    position += name_len
+    pattern = str(data[position:position + pattern_len], "utf-8")
+    position += pattern_len
+
+    ranks = _read_uint32(data, position, n_ranks)
+    position += 4 * n_ranks
+    offsets = _read_uint32(data, position, n_ranks + 1)
+    position += 4 * (n_ranks + 1)
+
+    special_tokens: Dict[str, int] = {}
+    for _ in range(n_specials):
+        token_id, length = _SPECIAL.unpack_from(data, position)
+        position += _SPECIAL.size
+        special_tokens[str(data[position:position + length], "utf-8")] = token_id
+        position += length
+
+    blob = bytes(data[position:])
+    if len(blob) != offsets[-1]:
+        raise ValueError("Truncated encoding snapshot")
+
+    mergeable_ranks = {blob[offsets[i]:offsets[i + 1]]: ranks[i] for i in range(n_ranks)}
+    return tiktoken.Encoding(name=name, pat_str=pattern, mergeable_ranks=mergeable_ranks,
+                             special_tokens=special_tokens)
+
+
+def write_snapshot(encoder: "tiktoken.Encoding", cache_dir: Union[str, Path] = "cache") -> Path:
+    """Write the snapshot and the decode table of a loaded encoder into cache_dir."""
+    path = snapshot_path(encoder.name, cache_dir)
+    save_snapshot(encoder, path)
+    get_vocab_table(encoder, cache_dir)
+    return path
+
+
+def build_snapshot(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> Path:
+    """Load an encoding through tiktoken (downloading it if needed) and snapshot it."""
+    return write_snapshot(tiktoken.get_encoding(encoding_name), cache_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m vocab_snapshot", description="Token Quest encoding snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="write snapshots and decode tables to ship with the cache")
+    build_parser.add_argument("encodings", nargs="*", default=["o200k_base"],
+                              help="encodings to snapshot (default: o200k_base)")
+    build_parser.add_argument("--cache-dir", default="cache")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for name in args.encodings:
+        built = build_snapshot(name, args.cache_dir)
+        start_time = time.perf_counter()
+        load_snapshot(built)
+        print(f"✅ {name}: {built} (loads in {time.perf_counter() - start_time:.3f}s)")
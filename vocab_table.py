@@ -0,0 +1,234 @@
+"""
+Vocabulary Table Module
+Precomputed, memory-mappable id→word decode table for Token Quest
+
+The table is built once per encoding by decoding every token id, then stored
+on disk as a single binary file:
+
+    header  | magic, version, vocabulary size, blob length
+    offsets | (n_vocab + 1) little-endian uint32 offsets into the blob
+    bitmap  | one validity bit per id (0 for special tokens and gaps)
+    blob    | raw token bytes, concatenated in id order
+
+Loading maps the file read-only, so id→word is an O(1) slice and every
+process that maps the same file shares its pages.
+"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from cache_registry import get_cache_registry
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TQVT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")  # magic, version, reserved, n_vocab, blob length
+
+
+class VocabTable:
+    """Read-only id→token table backed by one offsets+bitmap+bytes buffer."""
+
+    def __init__(self, buffer, encoding_name: str, path: Optional[Path] = None):
+        self.encoding_name = encoding_name
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+
+        magic, version, _, n_vocab, blob_size = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a vocab table (magic={magic!r}, version={version})")
+
+        self.n_vocab = n_vocab
+        offsets_start = _HEADER.size
+        bitmap_start = offsets_start + 4 * (n_vocab + 1)
+        blob_start = bitmap_start + (n_vocab + 7) // 8
+        if len(view) < blob_start + blob_size:
+            raise ValueError("Truncated vocab table")
+
+        offsets = view[offsets_start:bitmap_start]
+        if sys.byteorder == "little":
+            self._offsets = offsets.cast("I")
+        else:
+            self._offsets = array("I", offsets.tobytes())
+            self._offsets.byteswap()
+        self._bitmap = view[bitmap_start:blob_start]
+        self._blob = view[blob_start:blob_start + blob_size]
+
+    # ─────────────────────────────────────────────
+    # Building & persistence
+    # ─────────────────────────────────────────────
+
+    @staticmethod
+    def encode_table(tokens: Dict[int, bytes], n_vocab: int) -> bytes:
+        """Serialize an {id: token bytes} mapping into the table format."""
+        offsets = array("I", [0]) * (n_vocab + 1)
+        bitmap = bytearray((n_vocab + 7) // 8)
+        blob = bytearray()
+
+        for token_id in range(n_vocab):
+            token_bytes = tokens.get(token_id)
+            if token_bytes is not None:
+                blob += token_bytes
+                bitmap[token_id >> 3] |= 1 << (token_id & 7)
+            offsets[token_id + 1] = len(blob)
+
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, n_vocab, len(blob))
+        return header + offsets.tobytes() + bytes(bitmap) + bytes(blob)
+
+    @classmethod
+    def build(cls, encoder) -> "VocabTable":
+        """Decode the whole vocabulary of a tiktoken encoder into a table."""
+        special_ids = set(encoder._special_tokens.values())
+        tokens: Dict[int, bytes] = {}
+        for token_id in range(encoder.n_vocab):
+            if token_id in special_ids:
+                continue
+            try:
+                tokens[token_id] = encoder.decode_single_token_bytes(token_id)
+            except KeyError:
+                continue  # gap between regular and special tokens
+        return cls(cls.encode_table(tokens, encoder.n_vocab), encoder.name)
+
+    def save(self, path: Union[str, Path]):
+        """Atomically write the table to disk."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self._buffer)
+        os.replace(tmp_path, path)
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], encoding_name: str) -> "VocabTable":
+        """Memory-map a table previously written with :meth:`save`."""
+        path = Path(path)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, encoding_name, path)
+
+    # ─────────────────────────────────────────────
+    # Look-ups
+    # ─────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self.n_vocab
+
+    def is_valid(self, token_id: int) -> bool:
+        """True if the id is a regular (decodable, non-special) token."""
+        if token_id < 0 or token_id >= self.n_vocab:
+            return False
+        return bool(self._bitmap[token_id >> 3] & (1 << (token_id & 7)))
+
+    def token_bytes(self, token_id: int) -> memoryview:
+        """Zero-copy view of a token's raw bytes (empty for invalid ids)."""
+        if not self.is_valid(token_id):
+            return self._blob[0:0]
+        return self._blob[self._offsets[token_id]:self._offsets[token_id + 1]]
+
+    def word(self, token_id: int) -> str:
+        """Decode a single token id, returning '' for special/out-of-range ids."""
+        if not self.is_valid(token_id):
+            return ""
+        return str(self._blob[self._offsets[token_id]:self._offsets[token_id + 1]], "utf-8", "replace")
+
+
+# Process-wide tables keyed by (encoding name, table path)
+_tables: Dict[Tuple[str, str], VocabTable] = {}
+_tables_lock = threading.Lock()
+
+
+def table_path(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> Path:
+    """Location of the on-disk table for an encoding."""
+    return Path(cache_dir) / f"vocab_{encoding_name}.bin"
+
+
+def _publish(key: Tuple[str, str], table: VocabTable, load_time: float):
+    """Keep a loaded table for the process and report it to the cache registry."""
+    logger.info("Vocab table for %s ready in %.3f seconds (%d ids)",
+                table.encoding_name, load_time, table.n_vocab)
+    _tables[key] = table
+    get_cache_registry().register(
+        f"vocab_table:{table.encoding_name}", lambda: {'entries': table.n_vocab},
+        measure=lambda: len(table._buffer), load_time=load_time
+    )
+
+
+def load_vocab_table(encoding_name: str, cache_dir: Union[str, Path] = "cache") -> Optional[VocabTable]:
+    """Get the shared table for an encoding from disk alone (None if it was never built).
+
+    Unlike :func:`get_vocab_table` this needs no encoder, so decoding can start
+    from a shipped table without loading the BPE ranks.
+    """
+    path = table_path(encoding_name, cache_dir)
+    key = (encoding_name, str(path))
+    table = _tables.get(key)
+    if table is not None or not path.exists():
+        return table
+
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            start_time = time.time()
+            try:
+                table = VocabTable.load(path, encoding_name)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load vocab table %s: %s", path, e)
+                return None
+            _publish(key, table, time.time() - start_time)
+        return table
+
+
+def get_vocab_table(encoder, cache_dir: Union[str, Path] = "cache") -> VocabTable:
+    """Get the shared table for an encoder, loading or building it on first use."""
+    path = table_path(encoder.name, cache_dir)
+    key = (encoder.name, str(path))
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            return table
+
+        start_time = time.time()
+        if path.exists():
+            try:
+                table = VocabTable.load(path, encoder.name)
+                if table.n_vocab != encoder.n_vocab:
+                    logger.info("Vocab table %s is stale, rebuilding", path)
+                    table = None
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load vocab table %s: %s", path, e)
+                table = None
+
+        if table is None:
+            table = VocabTable.build(encoder)
+            try:
+                table.save(path)
+                table = VocabTable.load(path, encoder.name)
+            except OSError as e:
+                logger.warning("Could not persist vocab table %s: %s", path, e)
+
+        _publish(key, table, time.time() - start_time)
+        return table
+
+
+if __name__ == "__main__":
+    import tiktoken
+
+    logging.basicConfig(level=logging.INFO)
+    for name in sys.argv[1:] or ["o200k_base"]:
+        built = get_vocab_table(tiktoken.get_encoding(name))
+        print(f"✅ {name}: {built.n_vocab} ids → {built.path}")
@@ -27,10 +27,12 @@ import os
 from pathlib import Path
 
 from game_logic import GameLogic
-from token_handler import TokenHandler
+from token_handler import get_token_handler
+from token_space_api import make_token_space_blueprint
 from config import get_web_config, get_game_config
 from async_data_collector import AsyncDataCollector
 from token_cache import get_global_cache
+from cache_registry import get_cache_registry
 
 app = Flask(__name__)
 app.secret_key = "token-quest-secret-replace-me"  # TODO: read from env in prod
@@ -140,7 +142,8 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 # Initialize game components
-token_handler = TokenHandler()
+token_handler = get_token_handler()
+app.register_blueprint(make_token_space_blueprint(token_handler))
 data_collector = None
 token_cache = get_global_cache()
 
@@ -412,6 +415,32 @@ def api_end_game():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/caches', methods=['GET', 'POST'])
+def api_caches():
+    """Inspect, resize or clear the in-process caches (local requests only)."""
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({'success': False, 'error': 'Cache administration is only available locally'}), 403
+    
+    registry = get_cache_registry()
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        try:
+            if data.get('action') == 'resize':
+                registry.resize(data['name'], int(data['maxsize']))
+            elif data.get('action') == 'clear':
+                registry.clear(data.get('name'))
+            else:
+                return jsonify({'success': False, 'error': "action must be 'resize' or 'clear'"}), 400
+        except (KeyError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+    
+    caches = registry.report()
+    return jsonify({
+        'success': True,
+        'total_bytes': sum(cache.get('approx_bytes') or 0 for cache in caches.values()),
+        'caches': caches
+    })
+
 @app.route('/api/leaderboard')
 def api_leaderboard():
     """Get leaderboard data."""
@@ -0,0 +1,182 @@
+"""
+Word Catalog Module
+Immutable, process-wide target word lists for Token Quest
+
+The category/difficulty word lists used to be rebuilt and re-tokenized by
+every GameLogic.  A WordCatalog validates them once per encoding: it keeps
+only single-token words, remembers their token ids and precomputes the
+active word list for every (category, difficulty) choice, so a new game just
+picks references out of it.  Word packs found in ``GameConfig.word_packs_dir``
+(see word_packs.py) are merged into the built-in categories.
+"""
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Comprehensive word list organized by categories and difficulty
+WORD_CATEGORIES: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    'emotions': MappingProxyType({
+        'easy': ('happy', 'sad', 'mad', 'glad', 'calm'),
+        'medium': ('angry', 'upset', 'joyful', 'worried', 'excited', 'nervous'),
+        'hard': ('elated', 'dejected', 'serene', 'melancholy', 'euphoric')
+    }),
+    'size': MappingProxyType({
+        'easy': ('big', 'small', 'tiny', 'huge', 'tall'),
+        'medium': ('large', 'petite', 'massive', 'mini', 'giant'),
+        'hard': ('colossal', 'minuscule', 'immense', 'diminutive')
+    }),
+    'speed': MappingProxyType({
+        'easy': ('fast', 'slow', 'quick', 'rapid'),
+        'medium': ('swift', 'sluggish', 'speedy', 'gradual'),
+        'hard': ('brisk', 'leisurely', 'hasty', 'lethargic')
+    }),
+    'quality': MappingProxyType({
+        'easy': ('good', 'bad', 'nice', 'mean', 'kind'),
+        'medium': ('great', 'awful', 'wonderful', 'terrible', 'excellent'),
+        'hard': ('superb', 'atrocious', 'magnificent', 'dreadful')
+    }),
+    'temperature': MappingProxyType({
+        'easy': ('hot', 'cold', 'warm', 'cool'),
+        'medium': ('freezing', 'boiling', 'chilly', 'scorching'),
+        'hard': ('frigid', 'sweltering', 'tepid', 'torrid')
+    }),
+    'brightness': MappingProxyType({
+        'easy': ('light', 'dark', 'bright', 'dim'),
+        'medium': ('brilliant', 'shadowy', 'gleaming', 'murky'),
+        'hard': ('luminous', 'obscure', 'radiant', 'somber')
+    }),
+    'actions': MappingProxyType({
+        'easy': ('run', 'walk', 'jump', 'sit', 'eat', 'drink'),
+        'medium': ('sprint', 'stroll', 'leap', 'devour', 'sip'),
+        'hard': ('dash', 'amble', 'bound', 'consume', 'quaff')
+    }),
+    'difficulty': MappingProxyType({
+        'easy': ('easy', 'hard', 'simple', 'tough'),
+        'medium': ('complex', 'effortless', 'challenging', 'basic'),
+        'hard': ('intricate', 'elementary', 'arduous', 'facile')
+    })
+})
+
+# Flattened, in category order
+TARGET_WORDS: Tuple[str, ...] = tuple(
+    word for difficulties in WORD_CATEGORIES.values() for words in difficulties.values() for word in words
+)
+
+# Synonym/antonym pairs for research
+SYNONYM_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ('happy', 'glad'), ('sad', 'upset'), ('big', 'large'), ('small', 'tiny'),
+    ('fast', 'quick'), ('slow', 'gradual'), ('good', 'great'), ('bad', 'awful'),
+    ('hot', 'warm'), ('cold', 'cool'), ('bright', 'light'), ('dark', 'dim')
+)
+
+ANTONYM_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ('happy', 'sad'), ('big', 'small'), ('fast', 'slow'), ('good', 'bad'),
+    ('hot', 'cold'), ('light', 'dark'), ('easy', 'hard'), ('start', 'end')
+)
+
+
+def merge_categories(*sources: Mapping[str, Mapping[str, Sequence[str]]]) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """Union of several category -> difficulty -> words mappings (first occurrence wins the order)."""
+    merged: Dict[str, Dict[str, Dict[str, None]]] = {}
+    for source in sources:
+        for category, levels in source.items():
+            for difficulty, words in levels.items():
+                merged.setdefault(category, {}).setdefault(difficulty, {}).update(dict.fromkeys(words))
+    return {category: {difficulty: tuple(words) for difficulty, words in levels.items()}
+            for category, levels in merged.items()}
+
+
+class WordCatalog:
+    """Single-token target words of one encoding, grouped for every game setting."""
+
+    __slots__ = ('encoding_name', 'token_ids', 'categories', 'single_token_words', '_tier_lists', '_word_lists')
+
+    def __init__(self, encoding_name: str, token_ids: Mapping[str, int],
+                 categories: Mapping[str, Mapping[str, Sequence[str]]] = WORD_CATEGORIES):
+        self.encoding_name = encoding_name
+        self.token_ids = MappingProxyType(dict(token_ids))
+        # Only single-token words stay in the catalog
+        self.categories: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+            category: MappingProxyType({difficulty: tuple(word for word in words if word in token_ids)
+                                        for difficulty, words in levels.items()})
+            for category, levels in categories.items()
+        })
+        self.single_token_words: Tuple[str, ...] = tuple(dict.fromkeys(
+            word for levels in self.categories.values() for words in levels.values() for word in words
+        ))
+
+        tier_lists: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        word_lists: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        for category in ('all', *self.categories):
+            categories_in = list(self.categories) if category == 'all' else [category]
+            for difficulty in ('mixed', *DIFFICULTIES):
+                difficulties = DIFFICULTIES if difficulty == 'mixed' else (difficulty,)
+                words = tuple(dict.fromkeys(word for name in categories_in for level in difficulties
+                                            for word in self.categories[name].get(level, ())))
+                tier_lists[(category, difficulty)] = words
+                word_lists[(category, difficulty)] = words or self.single_token_words  # fallback to all words
+        self._tier_lists = MappingProxyType(tier_lists)
+        self._word_lists = MappingProxyType(word_lists)
+
+    @classmethod
+    def build(cls, token_handler, packs: Sequence = ()) -> "WordCatalog":
+        """Tokenize every built-in target word once (one batch call) and add already-filtered word packs."""
+        token_ids = token_handler.get_single_token_ids_batch(list(TARGET_WORDS))
+        catalog_ids = {word: token_id for word, token_id in zip(TARGET_WORDS, token_ids) if token_id is not None}
+        for pack in packs:
+            catalog_ids.update(pack.token_ids)
+        return cls(token_handler.encoding_name, catalog_ids,
+                   merge_categories(WORD_CATEGORIES, *(pack.categories for pack in packs)))
+
+    def words_for(self, category: str = 'all', difficulty: str = 'mixed') -> Tuple[str, ...]:
+        """Active word list for a game setting (unknown values mean 'all' / 'mixed')."""
+        if category not in self.categories:
+            category = 'all'
+        if difficulty not in DIFFICULTIES:
+            difficulty = 'mixed'
+        return self._word_lists[(category, difficulty)]
+
+    def tier_words(self, category: str, difficulty: str) -> Tuple[str, ...]:
+        """Exactly the words of one category and difficulty tier (may be empty, no fallback)."""
+        if category not in self.categories:
+            category = 'all'
+        return self._tier_lists.get((category, difficulty), ())
+
+    def token_id(self, word: str) -> Optional[int]:
+        """Token id of a catalog word (None if it is not a single token)."""
+        return self.token_ids.get(word)
+
+    def __len__(self) -> int:
+        return len(self.single_token_words)
+
+
+# Process-wide catalogs keyed by encoding
+_catalogs: Dict[str, WordCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_word_catalog(token_handler) -> WordCatalog:
+    """Get the shared catalog for a handler's encoding, building it on first use."""
+    catalog = _catalogs.get(token_handler.encoding_name)
+    if catalog is not None:
+        return catalog
+
+    with _catalogs_lock:
+        catalog = _catalogs.get(token_handler.encoding_name)
+        if catalog is None:
+            from config import get_game_config
+            from word_packs import load_word_packs
+            start_time = time.time()
+            packs = load_word_packs(get_game_config().word_packs_dir, token_handler.encoder, token_handler.cache_dir)
+            catalog = WordCatalog.build(token_handler, packs)
+            logger.info("Word catalog for %s built in %.3f seconds (%d single-token words, %d from %d word packs)",
+                        token_handler.encoding_name, time.time() - start_time, len(catalog),
+                        sum(len(pack) for pack in packs), len(packs))
+            _catalogs[token_handler.encoding_name] = catalog
+        return catalog
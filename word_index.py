@@ -0,0 +1,188 @@
+"""
+Word Index Module
+Sorted index of word-like tokens for fast token-space range queries
+
+Only ids whose decoded text is alphabetic (and at least ``min_length``
+characters long) are kept, in ascending id order, next to a parallel list of
+their strings.  Range queries then cost O(log n + k) with ``bisect`` instead
+of decoding and filtering every id in the window.
+"""
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from cache_registry import approx_bytes, get_cache_registry
+from vocab_table import VocabTable
+
+logger = logging.getLogger(__name__)
+
+
+class WordIndex:
+    """Ascending ids of word-like tokens plus their decoded strings."""
+
+    def __init__(self, ids: array, words: List[str], min_length: int = 2):
+        self.ids = ids
+        self.words = words
+        self.min_length = min_length
+
+    @classmethod
+    def build(cls, table: VocabTable, min_length: int = 2) -> "WordIndex":
+        """Scan a vocab table once and keep the word-like tokens."""
+        ids = array("I")
+        words: List[str] = []
+        for token_id in range(table.n_vocab):
+            word = table.word(token_id)
+            if word.isalpha() and len(word) >= min_length:
+                ids.append(token_id)
+                words.append(word)
+        return cls(ids, words, min_length)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def bounds(self, start_id: int, end_id: int) -> Tuple[int, int]:
+        """Index positions [lo, hi) covering ids in the inclusive range."""
+        return bisect_left(self.ids, start_id), bisect_right(self.ids, end_id)
+
+    def words_between(self, start_id: int, end_id: int, limit: int = None) -> List[Tuple[str, int]]:
+        """(word, token_id) pairs with start_id <= id <= end_id, in id order."""
+        lo, hi = self.bounds(start_id, end_id)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return list(zip(self.words[lo:hi], self.ids[lo:hi]))
+
+    def nearest(self, center_id: int, k: int = 10, max_distance: int = None,
+                exclude_center: bool = True) -> List[Tuple[str, int, int, str]]:
+        """k nearest word-like tokens as (word, token_id, distance, direction).
+
+        Walks outward from ``center_id`` with two pointers, so results come back
+        ordered by distance (ties favour the lower id) in O(log n + k).
+        """
+        ids, words = self.ids, self.words
+        below = bisect_left(ids, center_id) - 1
+        above = bisect_right(ids, center_id) if exclude_center else bisect_left(ids, center_id)
+        results: List[Tuple[str, int, int, str]] = []
+
+        while len(results) < k:
+            below_distance = center_id - ids[below] if below >= 0 else None
+            above_distance = ids[above] - center_id if above < len(ids) else None
+            if below_distance is None and above_distance is None:
+                break
+
+            if above_distance is None or (below_distance is not None and below_distance <= above_distance):
+                position, distance = below, below_distance
+                below -= 1
+            else:
+                position, distance = above, above_distance
+                above += 1
+
+            if max_distance is not None and distance > max_distance:
+                break
+            token_id = ids[position]
+            if token_id < center_id:
+                direction = 'before'
+            elif token_id > center_id:
+                direction = 'after'
+            else:
+                direction = 'exact'
+            results.append((words[position], token_id, distance, direction))
+
+        return results
+
+
+class VariantIndex:
+    """Normalized word → {variant: token_id} for every single-token spelling.
+
+    "happy" maps to e.g. {'happy': 37, ' happy': 7150, 'Happy': 21, ...}, so a
+    guess resolves to all of its single-token forms with one dict lookup.
+    """
+
+    def __init__(self, variants: Dict[str, Dict[str, int]]):
+        self.variants = variants
+
+    @classmethod
+    def build(cls, table: VocabTable) -> "VariantIndex":
+        """Group every alphabetic token by its stripped, lower-cased form."""
+        variants: Dict[str, Dict[str, int]] = {}
+        for token_id in range(table.n_vocab):
+            variant = table.word(token_id)
+            normalized = variant.strip().lower()
+            if normalized.isalpha():
+                variants.setdefault(normalized, {})[variant] = token_id
+        return cls(variants)
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def lookup(self, word: str) -> Dict[str, int]:
+        """All single-token variants of a word ({} if there are none)."""
+        return self.variants.get(word.strip().lower(), {})
+
+    def preferred(self, word: str) -> Optional[Tuple[str, int]]:
+        """Canonical variant: the bare lower-case form, then ' word', then lowest id."""
+        found = self.lookup(word)
+        if not found:
+            return None
+        normalized = word.strip().lower()
+        for variant in (normalized, " " + normalized):
+            if variant in found:
+                return variant, found[variant]
+        return min(found.items(), key=lambda item: item[1])
+
+
+# Process-wide indexes keyed by (encoding name, table path, min length)
+_indexes: Dict[Tuple[str, str, int], WordIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_word_index(table: VocabTable, min_length: int = 2) -> WordIndex:
+    """Get the shared word index for a vocab table, building it on first use."""
+    key = (table.encoding_name, str(table.path), min_length)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            start_time = time.time()
+            index = WordIndex.build(table, min_length)
+            load_time = time.time() - start_time
+            logger.info("Word index for %s built in %.3f seconds (%d words)",
+                        table.encoding_name, load_time, len(index))
+            _indexes[key] = index
+            get_cache_registry().register(
+                f"word_index:{table.encoding_name}:{min_length}", lambda: {'entries': len(index)},
+                measure=lambda: index.ids.itemsize * len(index.ids) + approx_bytes(index.words),
+                load_time=load_time
+            )
+        return index
+
+
+_variant_indexes: Dict[Tuple[str, str], VariantIndex] = {}
+
+
+def get_variant_index(table: VocabTable) -> VariantIndex:
+    """Get the shared variant index for a vocab table, building it on first use."""
+    key = (table.encoding_name, str(table.path))
+    index = _variant_indexes.get(key)
+    if index is not None:
+        return index
+
+    with _indexes_lock:
+        index = _variant_indexes.get(key)
+        if index is None:
+            start_time = time.time()
+            index = VariantIndex.build(table)
+            load_time = time.time() - start_time
+            logger.info("Variant index for %s built in %.3f seconds (%d words)",
+                        table.encoding_name, load_time, len(index))
+            _variant_indexes[key] = index
+            get_cache_registry().register(
+                f"variant_index:{table.encoding_name}", lambda: {'entries': len(index)},
+                measure=lambda: approx_bytes(index.variants), load_time=load_time
+            )
+        return index
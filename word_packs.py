@@ -0,0 +1,217 @@
+"""
+Word Packs Module
+External, categorized target word lists for Token Quest
+
+A word pack is a text or CSV file of target words:
+
+* ``.txt`` - one word per line, grouped under ``[category]`` or
+  ``[category/difficulty]`` headers; ``#`` starts a comment
+* ``.csv`` - a ``word`` column plus optional ``category`` and ``difficulty``
+
+Words without a category take the file name; words without a difficulty (or
+with one other than easy/medium/hard) are 'medium'.
+
+Packs are read as a stream and tokenized in chunks with the encoder's batch
+API, keeping only single-token words.  The filtered pack is cached under
+``cache/word_packs/``, keyed by the file's SHA-256 and the encoding, so a
+pack of any size is tokenized once and later starts just read the cached
+result.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Tuple, Union
+
+from word_catalog import DIFFICULTIES
+
+logger = logging.getLogger(__name__)
+
+PACK_CACHE_VERSION = 1
+PACK_SUFFIXES = ('.txt', '.csv')
+DEFAULT_DIFFICULTY = 'medium'
+CHUNK_SIZE = 4096
+
+
+class WordPack:
+    """Single-token words of one pack file, by category and difficulty."""
+
+    __slots__ = ('name', 'digest', 'encoding_name', 'categories', 'token_ids', 'total_words')
+
+    def __init__(self, name: str, digest: str, encoding_name: str,
+                 categories: Mapping[str, Mapping[str, Tuple[str, ...]]],
+                 token_ids: Mapping[str, int], total_words: int):
+        self.name = name
+        self.digest = digest
+        self.encoding_name = encoding_name
+        self.categories = MappingProxyType({category: MappingProxyType(dict(levels))
+                                            for category, levels in categories.items()})
+        self.token_ids = MappingProxyType(dict(token_ids))
+        self.total_words = total_words  # before single-token filtering
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': PACK_CACHE_VERSION,
+            'name': self.name,
+            'digest': self.digest,
+            'encoding': self.encoding_name,
+            'total_words': self.total_words,
+            # Parallel word/id lists load much faster than one object per word
+            'categories': {
+                category: {difficulty: [list(words), [self.token_ids[word] for word in words]]
+                           for difficulty, words in levels.items()}
+                for category, levels in self.categories.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WordPack":
+        if data.get('version') != PACK_CACHE_VERSION:
+            raise ValueError(f"Unsupported word pack cache version: {data.get('version')!r}")
+        categories: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        token_ids: Dict[str, int] = {}
+        for category, levels in data['categories'].items():
+            categories[category] = {}
+            for difficulty, (words, ids) in levels.items():
+                categories[category][difficulty] = tuple(words)
+                token_ids.update(zip(words, ids))
+        return cls(data['name'], data['digest'], data['encoding'], categories, token_ids, data['total_words'])
+
+
+# ─────────────────────────────────────────────
+# Reading pack files
+# ─────────────────────────────────────────────
+
+def file_digest(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _difficulty(value: str) -> str:
+    value = value.strip().lower()
+    return value if value in DIFFICULTIES else DEFAULT_DIFFICULTY
+
+
+def iter_pack_words(path: Union[str, Path]) -> Iterator[Tuple[str, str, str]]:
+    """Stream (category, difficulty, word) entries out of a pack file."""
+    path = Path(path)
+    default_category = path.stem.lower()
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            for row in csv.DictReader(f):
+                word = (row.get('word') or '').strip().lower()
+                if word:
+                    yield ((row.get('category') or '').strip().lower() or default_category,
+                           _difficulty(row.get('difficulty') or ''), word)
+            return
+
+        category, difficulty = default_category, DEFAULT_DIFFICULTY
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                section = line[1:-1].strip().lower()
+                category, _, difficulty = section.partition('/')
+                category = category.strip() or default_category
+                difficulty = _difficulty(difficulty)
+                continue
+            yield category, difficulty, line.lower()
+
+
+def tokenize_pack(path: Union[str, Path], encoder, digest: str = "",
+                  chunk_size: int = CHUNK_SIZE, num_threads: int = 8) -> WordPack:
+    """Read a pack and keep its single-token words (chunked batch encoding)."""
+    path = Path(path)
+    categories: Dict[str, Dict[str, List[str]]] = {}
+    token_ids: Dict[str, int] = {}
+    placed = set()  # (category, difficulty, word) already in the pack
+    total_words = 0
+    chunk: List[Tuple[str, str, str]] = []
+
+    def flush():
+        pending = [word for word in dict.fromkeys(word for _, _, word in chunk) if word not in token_ids]
+        for word, encoded in zip(pending, encoder.encode_batch(pending, num_threads=num_threads)):
+            token_ids[word] = encoded[0] if len(encoded) == 1 else None
+        for entry in chunk:
+            category, difficulty, word = entry
+            if token_ids[word] is not None and entry not in placed:
+                placed.add(entry)
+                categories.setdefault(category, {}).setdefault(difficulty, []).append(word)
+        chunk.clear()
+
+    for entry in iter_pack_words(path):
+        total_words += 1
+        chunk.append(entry)
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+
+    return WordPack(path.stem, digest, encoder.name,
+                    {category: {difficulty: tuple(words) for difficulty, words in levels.items()}
+                     for category, levels in categories.items()},
+                    {word: token_id for word, token_id in token_ids.items() if token_id is not None},
+                    total_words)
+
+
+# ─────────────────────────────────────────────
+# Cached loading
+# ─────────────────────────────────────────────
+
+def pack_cache_path(path: Union[str, Path], digest: str, encoding_name: str,
+                    cache_dir: Union[str, Path] = "cache") -> Path:
+    """Filtered-pack cache file, keyed by the pack's content hash and the encoding."""
+    return Path(cache_dir) / "word_packs" / f"{Path(path).stem}_{digest[:16]}_{encoding_name}.json"
+
+
+def load_pack(path: Union[str, Path], encoder, cache_dir: Union[str, Path] = "cache") -> WordPack:
+    """A pack's single-token words, from the cache when the file is unchanged."""
+    digest = file_digest(path)
+    cache_file = pack_cache_path(path, digest, encoder.name, cache_dir)
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return WordPack.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring word pack cache %s: %s", cache_file, e)
+
+    start_time = time.time()
+    pack = tokenize_pack(path, encoder, digest)
+    logger.info("Word pack %s tokenized in %.2f seconds (%d of %d words are single tokens)",
+                pack.name, time.time() - start_time, len(pack), pack.total_words)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pack.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning("Could not save word pack cache: %s", e)
+    return pack
+
+
+def load_word_packs(directory: Union[str, Path], encoder, cache_dir: Union[str, Path] = "cache") -> List[WordPack]:
+    """Every pack file in ``directory`` (sorted by name; none if it does not exist)."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    packs = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in PACK_SUFFIXES:
+            continue
+        try:
+            packs.append(load_pack(path, encoder, cache_dir))
+        except (OSError, ValueError, csv.Error) as e:
+            logger.error("Could not load word pack %s: %s", path, e)
+    return packs